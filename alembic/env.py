@@ -10,6 +10,11 @@ Developers:
 Description:
     Alembic migration environment configuration.
     Handles database initialization and migration execution.
+
+    A tenant schema can be migrated with ``alembic -x schema=<name> ...``;
+    its tables and its alembic_version table then live in that schema.
+    app.db.tenant_migrations uses the same path for every tenant and passes
+    its own connection in config.attributes.
 """
 # Development Team: Muhammad Faizan, Roozbeh Kouchaki, Fatemehalsadat Sabaghjafari, Dipika Bhandari
 
@@ -25,7 +30,7 @@ import app.db.models  # noqa: F401
 
 config = context.config
 
-if config.config_file_name is not None:
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 
@@ -48,20 +53,58 @@ def _get_database_url() -> str:
 target_metadata = Base.metadata
 
 
+def _search_path_sql(schema: str) -> str:
+    return 'SET search_path TO "' + schema.replace('"', '""') + '"'
+
+
+def _get_tenant_schema():
+    return config.attributes.get("tenant_schema") or context.get_x_argument(
+        as_dictionary=True
+    ).get("schema")
+
+
+def _run_on_connection(connection) -> None:
+    schema = _get_tenant_schema()
+    if schema:
+        # Migrations use unqualified names, so the tenant schema alone is on
+        # the search_path; the trigger functions pin it with FROM CURRENT.
+        connection.exec_driver_sql(_search_path_sql(schema))
+        connection.commit()
+        connection.dialect.default_schema_name = schema
+
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        version_table_schema=schema,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_offline() -> None:
     url = _get_database_url()
+    schema = _get_tenant_schema()
     context.configure(
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        version_table_schema=schema,
     )
 
     with context.begin_transaction():
+        if schema:
+            context.execute(_search_path_sql(schema))
         context.run_migrations()
 
 
 def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_on_connection(connection)
+        return
+
     configuration = config.get_section(config.config_ini_section) or {}
     configuration["sqlalchemy.url"] = _get_database_url()
 
@@ -72,13 +115,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        _run_on_connection(connection)
 
 
 if context.is_offline_mode():
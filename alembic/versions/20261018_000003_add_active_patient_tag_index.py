@@ -0,0 +1,61 @@
+"""
+Add unique index on active NFC tag per patient
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration adding a partial unique index so a patient can hold at
+    most one active NFC tag. Concurrent assignments for the same patient are
+    rejected by the database instead of racing past the application check.
+
+    Tenants can already hold patients with several active tags, which would
+    make the index creation fail. Those patients keep their most recently
+    issued tag; the others are deactivated first.
+"""
+
+from alembic import op
+
+
+revision = "20261018_000003"
+down_revision = "20260108_000002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE nfc_tags
+        SET status = 'inactive',
+            deactivated_at = CURRENT_TIMESTAMP
+        WHERE id IN (
+            SELECT id
+            FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY patient_id
+                        ORDER BY issued_at DESC NULLS LAST, tag_id DESC
+                    ) AS position
+                FROM nfc_tags
+                WHERE status = 'active'
+            ) AS ranked
+            WHERE position > 1
+        )
+        """
+    )
+    op.create_index(
+        "uq_nfc_tags_active_patient",
+        "nfc_tags",
+        ["patient_id"],
+        unique=True,
+        postgresql_where="status = 'active'",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_nfc_tags_active_patient", table_name="nfc_tags")
@@ -0,0 +1,31 @@
+"""
+Add index on nfc_tags.issued_at
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration adding an index on issued_at. The tag filter refresh
+    reads the tags issued since its previous run every few seconds, and the
+    warm-up reads the most recently issued tags; both would otherwise scan
+    the whole table.
+"""
+
+from alembic import op
+
+
+revision = "20261019_000004"
+down_revision = "20261018_000003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_nfc_tags_issued_at", "nfc_tags", ["issued_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_nfc_tags_issued_at", table_name="nfc_tags")
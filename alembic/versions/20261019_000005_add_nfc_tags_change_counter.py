@@ -0,0 +1,53 @@
+"""
+Add a change counter for nfc_tags
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration adding the nfc_tags_change_seq sequence and a row
+    trigger that advances it on every insert, update and delete of nfc_tags,
+    whichever code path or replica made the change. The trigger function
+    pins search_path to the schema it was created in.
+"""
+
+from alembic import op
+
+
+revision = "20261019_000005"
+down_revision = "20261019_000004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE nfc_tags_change_seq")
+    op.execute(
+        """
+        CREATE FUNCTION nfc_tags_bump_change_seq() RETURNS trigger
+        LANGUAGE plpgsql
+        SET search_path FROM CURRENT
+        AS $$
+        BEGIN
+            PERFORM nextval('nfc_tags_change_seq');
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER nfc_tags_change_counter
+        AFTER INSERT OR UPDATE OR DELETE ON nfc_tags
+        FOR EACH ROW EXECUTE FUNCTION nfc_tags_bump_change_seq()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER nfc_tags_change_counter ON nfc_tags")
+    op.execute("DROP FUNCTION nfc_tags_bump_change_seq()")
+    op.execute("DROP SEQUENCE nfc_tags_change_seq")
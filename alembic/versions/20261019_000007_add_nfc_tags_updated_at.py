@@ -0,0 +1,50 @@
+"""
+Add updated_at to nfc_tags
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration adding nfc_tags.updated_at, set by every write in
+    NfcRepository. Existing rows get their latest known timestamp
+    (issued_at or deactivated_at; reactivations were never recorded). The
+    change counter trigger is disabled for the backfill so it does not
+    give every row a new change_seq and make all clients re-sync.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_000007"
+down_revision = "20261019_000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "nfc_tags",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+    )
+    op.execute("ALTER TABLE nfc_tags DISABLE TRIGGER nfc_tags_change_counter")
+    op.execute(
+        """
+        UPDATE nfc_tags
+        SET updated_at = GREATEST(issued_at, deactivated_at)
+        WHERE issued_at IS NOT NULL OR deactivated_at IS NOT NULL
+        """
+    )
+    op.execute("ALTER TABLE nfc_tags ENABLE TRIGGER nfc_tags_change_counter")
+
+
+def downgrade() -> None:
+    op.drop_column("nfc_tags", "updated_at")
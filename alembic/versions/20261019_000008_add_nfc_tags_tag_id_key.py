@@ -0,0 +1,64 @@
+"""
+Ensure nfc_tags has a unique tag_id and an id default
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration giving nfc_tags the unique index on tag_id that the
+    assign and replace upserts (ON CONFLICT (tag_id)) rely on, and a default
+    for id, which those inserts do not set. Tenant provisioning has created
+    both outside these migrations so far, so each is only added where it is
+    missing; a schema built from the migrations alone is then complete.
+"""
+
+from alembic import op
+
+
+revision = "20261019_000008"
+down_revision = "20261019_000007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1
+                FROM pg_index AS tag_index
+                JOIN pg_attribute AS tag_column
+                  ON tag_column.attrelid = tag_index.indrelid
+                 AND tag_column.attnum = tag_index.indkey[0]
+                WHERE tag_index.indrelid = 'nfc_tags'::regclass
+                  AND tag_index.indisunique
+                  AND tag_index.indnkeyatts = 1
+                  AND tag_index.indpred IS NULL
+                  AND tag_column.attname = 'tag_id'
+            ) THEN
+                CREATE UNIQUE INDEX uq_nfc_tags_tag_id ON nfc_tags (tag_id);
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1
+                FROM pg_attribute
+                WHERE attrelid = 'nfc_tags'::regclass
+                  AND attname = 'id'
+                  AND atthasdef
+            ) THEN
+                ALTER TABLE nfc_tags ALTER COLUMN id SET DEFAULT gen_random_uuid();
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    # Both may predate this migration, so they are left in place.
+    pass
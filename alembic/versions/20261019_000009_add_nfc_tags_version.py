@@ -0,0 +1,83 @@
+"""
+Add a single-row tag version to nfc_tags
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Database migration adding nfc_tags_version, one row holding the
+    nfc_tags_change_seq value of the tenant's latest tag insert, update or
+    delete. The change_seq trigger writes it under the tenant lock along
+    with the row's change_seq, so it only grows and becomes visible when
+    the write commits. The ETags read it instead of aggregating nfc_tags.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_000009"
+down_revision = "20261019_000008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "nfc_tags_version",
+        sa.Column("id", sa.Boolean(), primary_key=True, server_default=sa.true()),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.CheckConstraint("id", name="ck_nfc_tags_version_single_row"),
+    )
+    op.execute(
+        """
+        INSERT INTO nfc_tags_version (version)
+        SELECT COALESCE(MAX(change_seq), 0) FROM nfc_tags
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION nfc_tags_bump_change_seq() RETURNS trigger
+        LANGUAGE plpgsql
+        SET search_path FROM CURRENT
+        AS $$
+        DECLARE
+            seq BIGINT;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext(TG_TABLE_SCHEMA || '.nfc_tags'));
+            seq := nextval('nfc_tags_change_seq');
+            UPDATE nfc_tags_version SET version = seq;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            NEW.change_seq := seq;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION nfc_tags_bump_change_seq() RETURNS trigger
+        LANGUAGE plpgsql
+        SET search_path FROM CURRENT
+        AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext(TG_TABLE_SCHEMA || '.nfc_tags'));
+            IF TG_OP = 'DELETE' THEN
+                PERFORM nextval('nfc_tags_change_seq');
+                RETURN OLD;
+            END IF;
+            NEW.change_seq := nextval('nfc_tags_change_seq');
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.drop_table("nfc_tags_version")
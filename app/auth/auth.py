@@ -13,7 +13,6 @@ Description:
 """
 
 import os
-import requests
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
 
@@ -31,6 +30,9 @@ _jwks_cache = None
 def get_jwks():
     global _jwks_cache
     if _jwks_cache is None:
+        # Only needed once per process, and the warm-up does it at startup.
+        import requests
+
         response = requests.get(JWKS_URL)
         response.raise_for_status()
         _jwks_cache = response.json()
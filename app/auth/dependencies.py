@@ -17,6 +17,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.auth.auth import decode_jwt
 from app.auth.permissions import get_permissions_for_roles
+from app.observability.phases import request_phase
 
 security = HTTPBearer()
 
@@ -24,7 +25,8 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
-    payload = decode_jwt(credentials.credentials)
+    with request_phase("auth"):
+        payload = decode_jwt(credentials.credentials)
 
     user_id = payload.get("sub")
     organization_id = (
@@ -25,6 +25,14 @@ class Config:
     DB_NAME: str = os.getenv("DB_NAME", "wailsalutem")
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    DB_DRIVER: str = os.getenv("DB_DRIVER", "psycopg2")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PING_IDLE_SECONDS: float = float(os.getenv("DB_POOL_PING_IDLE_SECONDS", "60"))
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "300"))
     
     # RabbitMQ Configuration
     RABBITMQ_HOST: str = os.getenv("RABBITMQ_HOST", "localhost")
@@ -34,6 +42,11 @@ class Config:
     RABBITMQ_CONSUME_EXCHANGE: str = os.getenv("RABBITMQ_CONSUME_EXCHANGE", "wailsalutem.events")
     RABBITMQ_CONSUME_QUEUE: str = os.getenv("RABBITMQ_CONSUME_QUEUE", "nfc-tag-events")
     RABBITMQ_CONSUMER_ENABLED: bool = os.getenv("RABBITMQ_CONSUMER_ENABLED", "true").lower() == "true"
+    RABBITMQ_BREAKER_ENABLED: bool = os.getenv("RABBITMQ_BREAKER_ENABLED", "true").lower() == "true"
+    RABBITMQ_PUBLISH_TIMEOUT_SECONDS: float = float(os.getenv("RABBITMQ_PUBLISH_TIMEOUT_SECONDS", "2"))
+    RABBITMQ_BREAKER_FAILURES: int = int(os.getenv("RABBITMQ_BREAKER_FAILURES", "3"))
+    RABBITMQ_BREAKER_RESET_SECONDS: float = float(os.getenv("RABBITMQ_BREAKER_RESET_SECONDS", "30"))
+    RABBITMQ_SPILL_BUFFER_SIZE: int = int(os.getenv("RABBITMQ_SPILL_BUFFER_SIZE", "10000"))
     
     # OpenTelemetry Configuration
     OTEL_EXPORTER_OTLP_ENDPOINT: str = os.getenv(
@@ -46,9 +59,54 @@ class Config:
         "service.namespace=wailsalutem,deployment.environment=production"
     )
     OTEL_TRACES_SAMPLER: str = os.getenv("OTEL_TRACES_SAMPLER", "parentbased_always_on")
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
     SERVICE_VERSION: str = os.getenv("SERVICE_VERSION", "1.0.0")
     SERVICE_NAMESPACE: str = os.getenv("SERVICE_NAMESPACE", "wailsalutem")
     
+    # Startup Warm-up Configuration
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_POOL_CONNECTIONS: int = int(os.getenv("WARMUP_POOL_CONNECTIONS", "5"))
+    WARMUP_HOT_TAGS: int = int(os.getenv("WARMUP_HOT_TAGS", "0"))
+    
+    # Admission Control Configuration (per organization)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_RATE_PER_SECOND: float = float(os.getenv("ADMISSION_RATE_PER_SECOND", "100"))
+    ADMISSION_BURST: float = float(os.getenv("ADMISSION_BURST", "200"))
+    ADMISSION_MAX_CONCURRENT: int = int(os.getenv("ADMISSION_MAX_CONCURRENT", "20"))
+    
+    # Priority Lane Configuration
+    LANES_ENABLED: bool = os.getenv("LANES_ENABLED", "true").lower() == "true"
+    LANE_RESOLVE_CAPACITY: int = int(os.getenv("LANE_RESOLVE_CAPACITY", "10"))
+    LANE_ADMIN_CAPACITY: int = int(os.getenv("LANE_ADMIN_CAPACITY", "30"))
+    
+    # Load Shedding Configuration
+    SHEDDING_ENABLED: bool = os.getenv("SHEDDING_ENABLED", "true").lower() == "true"
+    SHED_POOL_WAIT_MS: float = float(os.getenv("SHED_POOL_WAIT_MS", "250"))
+    SHED_MAX_IN_FLIGHT: int = int(os.getenv("SHED_MAX_IN_FLIGHT", "80"))
+    SHED_WINDOW_SECONDS: float = float(os.getenv("SHED_WINDOW_SECONDS", "5"))
+    
+    # Request Deadline Configuration
+    DEADLINES_ENABLED: bool = os.getenv("DEADLINES_ENABLED", "true").lower() == "true"
+    DEADLINE_DEFAULT_MS: float = float(os.getenv("DEADLINE_DEFAULT_MS", "5000"))
+    DEADLINE_ROUTES_MS: str = os.getenv(
+        "DEADLINE_ROUTES_MS",
+        "/nfc/resolve=2000,/nfc/=15000,/nfc/stats=15000,/nfc/snapshot=15000"
+    )
+    DEADLINE_LOCK_TIMEOUT_MS: float = float(os.getenv("DEADLINE_LOCK_TIMEOUT_MS", "1000"))
+    DEADLINE_HEADER: str = os.getenv("DEADLINE_HEADER", "X-Request-Timeout-Ms")
+    
+    # Offline Snapshot Configuration
+    SNAPSHOT_SIGNING_KEY: str = os.getenv("SNAPSHOT_SIGNING_KEY", "")
+    
+    # Tenant Migration Configuration
+    TENANT_MIGRATION_WORKERS: int = int(os.getenv("TENANT_MIGRATION_WORKERS", "4"))
+    TENANT_MIGRATION_LOCK_TIMEOUT_MS: int = int(os.getenv("TENANT_MIGRATION_LOCK_TIMEOUT_MS", "5000"))
+    
+    # Negative Lookup Filter Configuration
+    TAG_FILTER_ENABLED: bool = os.getenv("TAG_FILTER_ENABLED", "false").lower() == "true"
+    TAG_FILTER_FPP: float = float(os.getenv("TAG_FILTER_FPP", "0.01"))
+    TAG_FILTER_REFRESH_SECONDS: float = float(os.getenv("TAG_FILTER_REFRESH_SECONDS", "5"))
+    
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
@@ -57,12 +115,15 @@ class Config:
         "ALLOWED_ORIGINS",
         "http://localhost:3000,https://wailsalutem-web-ui.netlify.app,https://wailsalutem-suite.netlify.app"
     )
+    FAST_RESPONSES_ENABLED: bool = os.getenv("FAST_RESPONSES_ENABLED", "true").lower() == "true"
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+    ETAGS_ENABLED: bool = os.getenv("ETAGS_ENABLED", "true").lower() == "true"
     
     @classmethod
     def get_database_url(cls) -> str:
         """Get the database connection URL."""
         return (
-            f"postgresql+psycopg2://{cls.DB_USER}:{cls.DB_PASSWORD}"
+            f"postgresql+{cls.DB_DRIVER}://{cls.DB_USER}:{cls.DB_PASSWORD}"
             f"@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
         )
     
@@ -70,6 +131,16 @@ class Config:
     def get_allowed_origins_list(cls) -> list[str]:
         """Get the list of allowed CORS origins."""
         return [origin.strip() for origin in cls.ALLOWED_ORIGINS.split(",")]
+    
+    @classmethod
+    def get_route_deadlines_ms(cls) -> dict[str, float]:
+        """Get the per-route latency budgets (route path -> milliseconds)."""
+        budgets = {}
+        for entry in cls.DEADLINE_ROUTES_MS.split(","):
+            if "=" in entry:
+                route, budget = entry.rsplit("=", 1)
+                budgets[route.strip()] = float(budget)
+        return budgets
 
 
 # Singleton config instance
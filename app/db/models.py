@@ -12,7 +12,7 @@ Description:
     Defines database schema with timestamps and status tracking.
 """
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import BigInteger, Column, DateTime, String
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -26,3 +26,6 @@ class NFCTag(Base):
     status = Column(String, nullable=False)
     issued_at = Column(DateTime(timezone=True), nullable=True)
     deactivated_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    # Set by the nfc_tags_change_counter trigger on PostgreSQL.
+    change_seq = Column(BigInteger, nullable=True)
@@ -0,0 +1,101 @@
+"""
+Server-Side Prepared Statements
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Runs hot repository statements as PostgreSQL server-side prepared
+    statements so they are parsed and planned once per connection instead of
+    on every request. Prepared statements are cached per connection and per
+    tenant schema: PostgreSQL re-parses a prepared statement whenever
+    search_path differs from the one it was prepared under, so each schema
+    gets its own statement name.
+
+    psycopg 3 prepares repeated statements itself (prepare_threshold), and
+    its server-side parameter binding cannot be combined with EXECUTE, so the
+    explicit PREPARE path is only used with psycopg2.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.db.session import execute_with_reconnect
+
+_CACHE_KEY = "nfc_prepared_statements"
+
+
+class PreparedQuery:
+    """A statement with positional ($1, $2, ...) parameters to PREPARE on demand."""
+
+    __slots__ = ("name", "param_types", "params", "sql", "execute_template")
+
+    def __init__(self, name: str, param_types: tuple, params: tuple, sql: str):
+        self.name = name
+        self.param_types = param_types
+        self.params = params
+        self.sql = sql
+        placeholders = ", ".join(["%s"] * len(params))
+        self.execute_template = f"EXECUTE {{statement_name}} ({placeholders})"
+
+
+def _statement_name(query: PreparedQuery, schema_name: str) -> str:
+    digest = hashlib.sha1(schema_name.encode("utf-8")).hexdigest()[:16]
+    return f"{query.name}_{digest}"
+
+
+def execute_prepared(db: Session, query: PreparedQuery, fallback, params: dict):
+    """
+    Execute ``query`` as a prepared statement, or ``fallback`` when unsupported.
+
+    Prepared execution needs PostgreSQL on psycopg2 and a session whose
+    search_path was set by ``get_db_for_org`` (recorded in
+    ``db.info["schema_name"]``).
+    """
+    schema_name = db.info.get("schema_name")
+    dialect = db.get_bind().dialect
+    if (
+        not config.DB_PREPARED_STATEMENTS
+        or not schema_name
+        or dialect.name != "postgresql"
+        or dialect.driver != "psycopg2"
+    ):
+        return db.execute(fallback, params)
+
+    return execute_with_reconnect(
+        db,
+        lambda: _execute_prepared(db, query, schema_name, params),
+    )
+
+
+def _execute_prepared(db: Session, query: PreparedQuery, schema_name: str, params: dict):
+    connection = db.connection()
+    # The pool keeps this dict for the lifetime of the DBAPI connection and
+    # clears it when the connection is invalidated, matching the lifetime of
+    # the server-side statements.
+    prepared = connection.connection.info.setdefault(_CACHE_KEY, OrderedDict())
+    key = (query.name, schema_name)
+    statement_name = prepared.get(key)
+
+    if statement_name is None:
+        statement_name = _statement_name(query, schema_name)
+        connection.exec_driver_sql(
+            f"PREPARE {statement_name} ({', '.join(query.param_types)}) AS {query.sql}"
+        )
+        prepared[key] = statement_name
+        if len(prepared) > config.DB_PREPARED_STATEMENT_CACHE_SIZE:
+            _evicted_key, evicted_name = prepared.popitem(last=False)
+            connection.exec_driver_sql(f"DEALLOCATE {evicted_name}")
+    else:
+        prepared.move_to_end(key)
+
+    return connection.exec_driver_sql(
+        query.execute_template.format(statement_name=statement_name),
+        tuple(params[name] for name in query.params),
+    )
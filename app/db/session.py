@@ -10,59 +10,327 @@ Developers:
 Description:
     Handles SQLAlchemy session creation and management with multi-tenant schema support.
     Provides per-organization database isolation through PostgreSQL schemas.
+
+    The tenant search_path is not set with a separate statement. It is
+    attached to the first statement of every transaction instead: prepended
+    to it on psycopg2 (client-side parameter binding sends both in one
+    message) and queued with it in pipeline mode on psycopg 3. A read request
+    therefore costs a single network round trip before its rollback. Other
+    setup statements (the tenant write lock) can ride along the same way
+    with send_with_next_statement.
+
+    Connections are not pinged on every checkout. Only a connection that sat
+    idle in the pool longer than DB_POOL_PING_IDLE_SECONDS is pinged; a
+    connection that died anyway is caught when the first statement of a
+    transaction fails, and that statement is retried on a new connection.
 """
 
+import logging
 import os
+import time
+import weakref
 from typing import Optional
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import config
+from app.db.pool import ObservedQueuePool
+from app.observability.database import pool_pings_counter, pool_stale_connections_counter
+from app.traffic.deadlines import current_deadline
+
+logger = logging.getLogger(__name__)
 
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_DRIVER = config.DB_DRIVER
 
 DATABASE_URL = (
-    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}"
+    f"postgresql+{DB_DRIVER}://{DB_USER}:{DB_PASSWORD}"
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
+_PENDING_SEARCH_PATH = "pending_search_path"
+_PENDING_DEADLINE = "pending_deadline"
+_PENDING_STATEMENTS = "pending_statements"
+_LAST_USED = "last_used"
+
+# Engines whose first-statement hooks are installed.
+_hooked_engines = weakref.WeakSet()
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def search_path_sql(schema_name: str) -> str:
+    return f"SET search_path TO {quote_identifier(schema_name)}"
+
+
+def deadline_sql(deadline: float) -> str:
+    """
+    Transaction-scoped timeouts for the time left until ``deadline``.
+
+    One statement, as psycopg 3 pipeline mode sends each with the extended
+    protocol, which refuses several commands in one string.
+    """
+    remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+    lock_timeout_ms = max(1, min(remaining_ms, int(config.DEADLINE_LOCK_TIMEOUT_MS)))
+    return (
+        f"SELECT set_config('statement_timeout', '{remaining_ms}', true), "
+        f"set_config('lock_timeout', '{lock_timeout_ms}', true)"
+    )
+
+
+def send_with_next_statement(db: Session, sql: str):
+    """
+    Send ``sql`` ahead of the next statement ``db`` executes, in its round trip.
+
+    The two still run as separate statements, so under READ COMMITTED the
+    next one takes its snapshot after ``sql`` has finished. Sessions whose
+    engine lacks the hooks execute ``sql`` right away.
+    """
+    if db.get_bind() not in _hooked_engines:
+        db.execute(text(sql))
+    elif db.in_transaction():
+        db.connection().info.setdefault(_PENDING_STATEMENTS, []).append(sql)
+    else:
+        # Moved to the connection when the transaction begins.
+        db.info.setdefault(_PENDING_STATEMENTS, []).append(sql)
+
+
+def execute_with_reconnect(db: Session, execute):
+    """
+    Run ``execute()`` and retry once on a fresh connection after a disconnect.
+
+    Only the first statement of a transaction is retried: nothing has run in
+    that transaction yet, so repeating it is safe for reads and writes alike.
+    This is what replaces a pre-ping round trip on every checkout.
+    """
+    first_statement = not db.in_transaction()
+    pending = db.info.get(_PENDING_STATEMENTS)
+    try:
+        return execute()
+    except DBAPIError as exc:
+        if not (first_statement and exc.connection_invalidated):
+            raise
+        pool_stale_connections_counter.add(1, attributes={"detected_by": "error"})
+        logger.warning("Database connection was dropped; retrying on a new connection")
+        db.rollback()
+        if pending:
+            # Queued for the failed statement; the retry must send them too.
+            db.info[_PENDING_STATEMENTS] = pending
+        return execute()
+
+
+class TenantSession(Session):
+    def execute(self, *args, **kwargs):
+        return execute_with_reconnect(self, lambda: super(TenantSession, self).execute(*args, **kwargs))
+
+
+def install_search_path_hooks(engine, session_factory):
+    """
+    Attach the per-transaction search_path and deadline to the first statement
+    sent, and statements queued by send_with_next_statement to the next one.
+    """
+    _hooked_engines.add(engine)
+
+    @event.listens_for(session_factory, "after_begin")
+    def _mark_search_path(session, transaction, connection):
+        schema_name = session.info.get("schema_name")
+        if schema_name:
+            connection.info[_PENDING_SEARCH_PATH] = schema_name
+        deadline = session.info.get("deadline")
+        if deadline is not None and connection.dialect.name == "postgresql":
+            connection.info[_PENDING_DEADLINE] = deadline
+        pending = session.info.pop(_PENDING_STATEMENTS, None)
+        if pending:
+            connection.info[_PENDING_STATEMENTS] = pending
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _send_search_path(conn, cursor, statement, parameters, context, executemany):
+        statements = []
+        schema_name = conn.info.pop(_PENDING_SEARCH_PATH, None)
+        if schema_name:
+            statements.append(search_path_sql(schema_name))
+        deadline = conn.info.pop(_PENDING_DEADLINE, None)
+        if deadline is not None:
+            statements.append(deadline_sql(deadline))
+        statements.extend(conn.info.pop(_PENDING_STATEMENTS, ()))
+        if not statements:
+            return statement, parameters
+
+        if conn.dialect.driver == "psycopg":
+            pipeline = cursor.connection.pipeline()
+            pipeline.__enter__()
+            context.search_path_pipeline = pipeline
+            for setup in statements:
+                cursor.connection.execute(setup)
+            return statement, parameters
+
+        prefix = "; ".join(statements)
+        if parameters is not None:
+            prefix = prefix.replace("%", "%%")
+        return f"{prefix}; {statement}", parameters
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _sync_search_path(conn, cursor, statement, parameters, context, executemany):
+        pipeline = getattr(context, "search_path_pipeline", None)
+        if pipeline is not None:
+            del context.search_path_pipeline
+            pipeline.__exit__(None, None, None)
+
+    @event.listens_for(engine, "handle_error")
+    def _abort_search_path(exception_context):
+        context = exception_context.execution_context
+        pipeline = getattr(context, "search_path_pipeline", None)
+        if pipeline is not None:
+            del context.search_path_pipeline
+            try:
+                pipeline.__exit__(None, None, None)
+            except Exception:
+                pass
+
+    @event.listens_for(engine.pool, "checkin")
+    def _clear_search_path(dbapi_connection, connection_record):
+        # Connection.info lives on the pooled connection: a transaction that
+        # ended before its first statement must not hand its schema,
+        # deadline or queued statements to the next checkout.
+        connection_record.info.pop(_PENDING_SEARCH_PATH, None)
+        connection_record.info.pop(_PENDING_DEADLINE, None)
+        connection_record.info.pop(_PENDING_STATEMENTS, None)
+
+
+def install_liveness_checks(engine, ping_idle_seconds: float):
+    """
+    Ping pooled connections on checkout only after they sat idle.
+
+    Args:
+        engine: Engine whose pool is checked
+        ping_idle_seconds: Idle time after which a connection is pinged;
+            0 pings on every checkout, a negative value never pings
+    """
+    if ping_idle_seconds < 0:
+        return
+
+    @event.listens_for(engine.pool, "connect")
+    def _mark_new(dbapi_connection, connection_record):
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get(_LAST_USED)
+        if last_used is not None and time.monotonic() - last_used < ping_idle_seconds:
+            return
+
+        pool_pings_counter.add(1)
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except engine.dialect.loaded_dbapi.Error as exc:
+            if not engine.dialect.is_disconnect(exc, dbapi_connection, None):
+                raise
+            pool_stale_connections_counter.add(1, attributes={"detected_by": "ping"})
+            # The pool discards this connection and checks out another one.
+            raise DisconnectionError("Idle connection failed liveness ping") from exc
+        connection_record.info[_LAST_USED] = time.monotonic()
+
+
+# Sync handlers run on AnyIO's threadpool (40 threads by default); the
+# defaults let every one of them hold a connection instead of queueing on
+# SQLAlchemy's default of 5 + 10.
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
+    poolclass=ObservedQueuePool,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_recycle=config.DB_POOL_RECYCLE,
 )
 
+install_liveness_checks(engine, config.DB_POOL_PING_IDLE_SECONDS)
+
 SessionLocal = sessionmaker(
+    class_=TenantSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
 )
 
+install_search_path_hooks(engine, SessionLocal)
+
+
+ORGANIZATION_SCHEMA = text(
+    """
+    SELECT schema_name
+    FROM wailsalutem.organizations
+    WHERE id = :org_id
+    """
+)
+
+ORGANIZATION_SCHEMAS = text(
+    """
+    SELECT id, schema_name
+    FROM wailsalutem.organizations
+    WHERE schema_name IS NOT NULL
+    """
+)
+
+# organization id -> tenant schema, filled at warm-up and on lookup misses.
+# Schema names never change for an organization, so entries do not expire.
+_schema_names: dict[str, str] = {}
+
+
+def load_schema_map() -> dict[str, str]:
+    """Load every organization's schema name into the lookup cache."""
+    db = SessionLocal()
+    try:
+        rows = db.execute(ORGANIZATION_SCHEMAS).fetchall()
+    finally:
+        db.close()
+    _schema_names.update({str(row.id): row.schema_name for row in rows})
+    return dict(_schema_names)
+
+
+def cached_schema_name(organization_id: str) -> Optional[str]:
+    """Schema name of an organization if it is already cached, without a query."""
+    return _schema_names.get(str(organization_id))
+
+
+def cached_schema_names() -> dict[str, str]:
+    return dict(_schema_names)
+
+
 def get_db_for_org(organization_id: str, schema_name: Optional[str] = None):
     db = SessionLocal()
+    deadline = current_deadline()
+    if deadline is not None:
+        db.info["deadline"] = deadline
+    if not schema_name:
+        schema_name = _schema_names.get(str(organization_id))
     if not schema_name:
         schema_name = db.execute(
-            text(
-                """
-                SELECT schema_name
-                FROM wailsalutem.organizations
-                WHERE id = :org_id
-                """
-            ),
+            ORGANIZATION_SCHEMA,
             {"org_id": organization_id},
         ).scalar()
+        if schema_name:
+            _schema_names[str(organization_id)] = schema_name
 
     if not schema_name:
         db.close()
         raise RuntimeError("Schema name not found for organization")
 
-    db.connection().exec_driver_sql(f'SET search_path TO "{schema_name}"')
-    result = db.execute(text("SHOW search_path")).fetchone()
-    print("SEARCH PATH:", result)
+    db.info["schema_name"] = schema_name
+    if db.in_transaction():
+        # The schema lookup already opened the transaction, so after_begin
+        # has fired; queue the search_path for the next statement directly.
+        db.connection().info[_PENDING_SEARCH_PATH] = schema_name
 
     return db
-
-
-
@@ -0,0 +1,284 @@
+"""
+Tenant Schema Migrations
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Upgrades every tenant schema listed in wailsalutem.organizations with
+    Alembic, several schemas at a time. Each schema is migrated on its own
+    connection with only that schema on the search_path and keeps its own
+    alembic_version table, so tenants can sit at different revisions and
+    one failing tenant does not stop the others.
+
+    Schemas run in a pool of --workers processes. Alembic keeps the
+    migration context in module globals, so each process migrates one
+    schema at a time. Every connection sets lock_timeout
+    (TENANT_MIGRATION_LOCK_TIMEOUT_MS): a migration that cannot get its
+    table lock while the service is busy fails for that tenant instead of
+    queueing the tenant's traffic behind it.
+
+    A line is logged as each schema finishes, followed by a summary of the
+    outcomes, the total time and the slowest schemas. The exit status is 1
+    if any schema failed. A schema migrated before it had its own version
+    table must be stamped once:
+    ``alembic -x schema=<name> stamp <revision>``.
+
+Usage:
+    python -m app.db.tenant_migrations --workers 8
+    python -m app.db.tenant_migrations --schema org_acme --revision 20261019_000007
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, pool, text
+
+from app.config import config
+# env.py needs the models; importing them before the pool forks saves
+# every worker from importing them again.
+import app.db.models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+UPGRADED = "upgraded"
+CURRENT = "current"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Schemas listed in the summary as the slowest.
+SLOWEST_SHOWN = 5
+
+TENANT_SCHEMAS = text(
+    """
+    SELECT DISTINCT schema_name
+    FROM wailsalutem.organizations
+    WHERE schema_name IS NOT NULL
+    ORDER BY schema_name
+    """
+)
+
+# One engine per worker process, created on its first schema.
+_engines = {}
+
+
+def _get_engine(database_url: str):
+    if database_url not in _engines:
+        _engines[database_url] = create_engine(database_url, poolclass=pool.NullPool)
+    return _engines[database_url]
+
+
+def list_tenant_schemas(database_url: str) -> list[str]:
+    with _get_engine(database_url).connect() as connection:
+        return list(connection.execute(TENANT_SCHEMAS).scalars())
+
+
+def _current_revision(connection, schema: str) -> Optional[str]:
+    context = MigrationContext.configure(connection, opts={"version_table_schema": schema})
+    revision = context.get_current_revision()
+    connection.rollback()
+    return revision
+
+
+def _alembic_config(connection, schema: str) -> AlembicConfig:
+    alembic_config = AlembicConfig(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    alembic_config.attributes.update(
+        connection=connection,
+        tenant_schema=schema,
+        configure_logger=False,
+    )
+    return alembic_config
+
+
+def _result(schema: str, status: str, error: Optional[str] = None) -> dict:
+    return {
+        "schema": schema,
+        "status": status,
+        "from_revision": None,
+        "to_revision": None,
+        "duration_s": None,
+        "error": error,
+    }
+
+
+def migrate_schema(database_url: str, schema: str, revision: str) -> dict:
+    """
+    Upgrade one tenant schema to ``revision``; never raises.
+
+    Returns:
+        The schema's outcome (upgraded, current or failed), its revision
+        before and after, the duration and the error, if any
+    """
+    started = time.monotonic()
+    result = _result(schema, FAILED)
+    try:
+        with _get_engine(database_url).connect() as connection:
+            connection.exec_driver_sql(
+                f"SET lock_timeout = {int(config.TENANT_MIGRATION_LOCK_TIMEOUT_MS)}"
+            )
+            connection.commit()
+            result["from_revision"] = _current_revision(connection, schema)
+            command.upgrade(_alembic_config(connection, schema), revision)
+            result["to_revision"] = _current_revision(connection, schema)
+        result["status"] = UPGRADED if result["to_revision"] != result["from_revision"] else CURRENT
+    except Exception as exc:
+        # The first line names the failing statement; the rest is the SQL.
+        result["error"] = f"{type(exc).__name__}: {str(exc).splitlines()[0] if str(exc) else ''}"
+    result["duration_s"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def _log_progress(done: int, total: int, result: dict):
+    prefix = f"[{done}/{total}] {result['schema']}"
+    if result["status"] == FAILED:
+        took = f" after {result['duration_s']:.1f}s" if result["duration_s"] is not None else ""
+        logger.error(f"{prefix} failed{took}: {result['error']}")
+    elif result["status"] == UPGRADED:
+        logger.info(
+            f"{prefix} {result['from_revision'] or 'base'} -> {result['to_revision']} "
+            f"in {result['duration_s']:.1f}s"
+        )
+    elif result["status"] == CURRENT:
+        logger.info(f"{prefix} already at {result['to_revision']}")
+
+
+def run(
+    database_url: str,
+    schemas: list[str],
+    revision: str = "head",
+    workers: int = config.TENANT_MIGRATION_WORKERS,
+    fail_fast: bool = False,
+    migrate=migrate_schema,
+    executor_factory=ProcessPoolExecutor,
+) -> dict:
+    """
+    Migrate ``schemas`` with up to ``workers`` running at once.
+
+    With ``fail_fast`` the schemas not yet started when one fails are
+    skipped. Returns the report with one result per schema.
+    """
+    started = time.monotonic()
+    results = []
+
+    with executor_factory(max_workers=max(1, min(workers, len(schemas) or 1))) as executor:
+        futures = {
+            executor.submit(migrate, database_url, schema, revision): schema
+            for schema in schemas
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            schema = futures[future]
+            try:
+                result = future.result()
+            except CancelledError:
+                result = _result(schema, SKIPPED)
+            except Exception as exc:
+                # The worker process itself died (e.g. killed for memory).
+                result = _result(schema, FAILED, f"{type(exc).__name__}: {exc}")
+
+            results.append(result)
+            _log_progress(done, len(schemas), result)
+
+            if fail_fast and result["status"] == FAILED:
+                for pending in futures:
+                    pending.cancel()
+
+    elapsed = time.monotonic() - started
+    counts = {
+        status: sum(1 for result in results if result["status"] == status)
+        for status in (UPGRADED, CURRENT, FAILED, SKIPPED)
+    }
+    return {
+        "revision": revision,
+        "workers": workers,
+        "schemas": len(schemas),
+        "elapsed_s": round(elapsed, 3),
+        **counts,
+        "results": sorted(results, key=lambda result: result["schema"]),
+    }
+
+
+def _log_summary(report: dict):
+    logger.info(
+        f"Migrated {report['schemas']} schemas to {report['revision']} in "
+        f"{report['elapsed_s']:.1f}s with {report['workers']} workers: "
+        f"{report[UPGRADED]} upgraded, {report[CURRENT]} already current, "
+        f"{report[FAILED]} failed, {report[SKIPPED]} skipped"
+    )
+
+    timed = [result for result in report["results"] if result["duration_s"] is not None]
+    slowest = sorted(timed, key=lambda result: result["duration_s"], reverse=True)[:SLOWEST_SHOWN]
+    if slowest:
+        logger.info(
+            "Slowest: "
+            + ", ".join(f"{result['schema']} {result['duration_s']:.1f}s" for result in slowest)
+        )
+
+    for result in report["results"]:
+        if result["status"] == FAILED:
+            logger.error(f"Failed: {result['schema']}: {result['error']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0])
+    parser.add_argument(
+        "--database-url",
+        default=config.get_database_url(),
+        help="Defaults to the DB_* settings",
+    )
+    parser.add_argument("--revision", default="head")
+    parser.add_argument(
+        "--schema",
+        action="append",
+        help="Migrate only this schema (repeatable); by default every organization's schema",
+    )
+    parser.add_argument("--workers", type=int, default=config.TENANT_MIGRATION_WORKERS)
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Skip the schemas not yet started once one fails",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    logging.getLogger("alembic").setLevel(logging.WARNING)
+
+    schemas = args.schema or list_tenant_schemas(args.database_url)
+    if not schemas:
+        logger.warning("No tenant schemas to migrate")
+        return 0
+
+    logger.info(f"Migrating {len(schemas)} schemas to {args.revision} with {args.workers} workers")
+    report = run(
+        args.database_url,
+        schemas,
+        revision=args.revision,
+        workers=args.workers,
+        fail_fast=args.fail_fast,
+    )
+    _log_summary(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+
+    return 1 if report[FAILED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,43 +10,59 @@ Developers:
 Description:
     FastAPI application for NFC tag management with comprehensive OpenTelemetry observability.
     Includes routing, middleware setup, CORS configuration, and telemetry initialization.
+
+    Import groups and init steps are timed into the startup report. Telemetry
+    and the RabbitMQ connection are set up in background threads so the
+    service answers /health as soon as the app is created.
 """
 
 import logging
 import os
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
-
-from app.messaging.consumer import NfcEventConsumer
-from app.nfc.router import router as nfc_router
-
-# OpenTelemetry imports
-from app.observability.telemetry import init_telemetry, shutdown_telemetry
-from app.observability.logging_config import configure_logging
-from app.observability.middleware import TelemetryMiddleware
-from app.observability.database import instrument_database
-from app.db.session import engine
+from app.observability.startup import startup_report
+
+with startup_report.step("import.fastapi"):
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
+    from fastapi.middleware.cors import CORSMiddleware
+    from dotenv import load_dotenv
+
+with startup_report.step("import.nfc"):
+    from app.messaging.consumer import NfcEventConsumer
+    from app.messaging.rabbitmq import event_publisher
+    from app.nfc.router import router as nfc_router
+    from app.traffic import configure_threadpool, deadline_exceeded_handler
+    from sqlalchemy.exc import DBAPIError
+
+# OpenTelemetry imports (the SDK and OTLP exporters load with init_telemetry)
+with startup_report.step("import.observability"):
+    from app.observability.telemetry import shutdown_telemetry
+    from app.observability.logging_config import configure_logging
+    from app.observability.middleware import TelemetryMiddleware
+    from app.observability.database import instrument_database, instrument_pool
+
+with startup_report.step("import.db"):
+    from app.db.session import engine
+    from app.nfc.tag_filter import tag_filters
+    from app.warmup import StartupWarmup
 
 # Load environment variables
 load_dotenv()
 
 # Configure structured logging with trace correlation
-log_level = os.getenv("LOG_LEVEL", "INFO")
-configure_logging(log_level)
+with startup_report.step("init.logging"):
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+    configure_logging(log_level)
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenTelemetry (tracing and metrics)
-telemetry_initialized = init_telemetry()
-if telemetry_initialized:
-    logger.info("OpenTelemetry initialized successfully")
-else:
-    logger.warning("OpenTelemetry initialization failed - service will run without telemetry")
+# OpenTelemetry (tracing and metrics) is initialized by the warm-up thread;
+# tracers and meters created before then switch over once it is done.
 
-# Instrument database with tracing
-instrument_database(engine)
+# Instrument database with tracing and pool metrics
+with startup_report.step("init.db_instrumentation"):
+    instrument_database(engine)
+    instrument_pool(engine)
 
 # Create FastAPI application
 app = FastAPI(
@@ -58,6 +74,9 @@ app = FastAPI(
 # Initialize consumer
 consumer = NfcEventConsumer()
 
+# Initialize startup warm-up
+warmup = StartupWarmup(engine)
+
 # Add custom telemetry middleware (must be added before CORS)
 app.add_middleware(TelemetryMiddleware)
 
@@ -86,15 +105,27 @@ app.add_middleware(
 # Include routers
 app.include_router(nfc_router)
 
+# Database statements cancelled by the request deadline become 503/504
+app.add_exception_handler(DBAPIError, deadline_exceeded_handler)
+
 
 @app.on_event("startup")
 def startup_event():
     """Application startup event handler."""
     logger.info("NFC Service starting up...")
-    consumer.start()
+    with startup_report.step("startup.consumer"):
+        consumer.start()
+    with startup_report.step("startup.warmup"):
+        warmup.start()
     logger.info("NFC Service startup complete")
 
 
+@app.on_event("startup")
+async def configure_lanes():
+    """Size the threadpool for the priority lanes; must run on the event loop."""
+    configure_threadpool()
+
+
 @app.on_event("shutdown")
 def shutdown_event():
     """Application shutdown event handler with telemetry cleanup."""
@@ -103,6 +134,9 @@ def shutdown_event():
     # Stop consumer
     consumer.stop()
     logger.info("Consumer stopped")
+    tag_filters.stop()
+    if event_publisher.pending():
+        logger.warning(f"{event_publisher.pending()} spilled events were not published")
     
     # Flush and shutdown telemetry
     shutdown_telemetry()
@@ -120,3 +154,17 @@ def health():
     """
     return {"status": "ok"}
 
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness check endpoint.
+    
+    Reports ready only once the startup warm-up has finished, so traffic is
+    not routed to a pod that would serve its first requests cold. The probe
+    only needs the status code; the warm-up steps and the startup report
+    are logged instead of being served to unauthenticated callers.
+    """
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
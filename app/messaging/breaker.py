@@ -0,0 +1,85 @@
+"""
+Circuit Breaker
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Closed / open / half-open circuit breaker for calls to a dependency
+    that can be slow or down. While closed every call is allowed;
+    failure_threshold consecutive failures open the breaker, and while open
+    calls are refused without being attempted. After reset_seconds one
+    trial call is allowed (half-open): success closes the breaker, failure
+    opens it again. State changes are logged.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now; a True in half-open is the trial call."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self._set_state(HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+                self._set_state(OPEN, error)
+
+    def _set_state(self, state: str, error: Optional[BaseException] = None):
+        previous, self._state = self._state, state
+        if state == OPEN:
+            logger.warning(
+                f"Circuit breaker {self.name} opened (was {previous}); "
+                f"calls fail fast for {self.reset_seconds}s: {error}"
+            )
+        else:
+            logger.info(f"Circuit breaker {self.name} {state} (was {previous})")
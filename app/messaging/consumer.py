@@ -39,6 +39,7 @@ class NfcEventConsumer:
         self._connection = None
         self._channel = None
         self._thread = None
+        self._stopping = False
 
     def start(self):
         if not CONSUMER_ENABLED:
@@ -46,11 +47,18 @@ class NfcEventConsumer:
         if self._thread and self._thread.is_alive():
             return
 
+        # Connecting blocks until the broker answers or times out, so it is
+        # done on the consumer thread instead of holding up startup.
+        self._stopping = False
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> bool:
         try:
             connection, channel = get_channel()
         except Exception as exc:
             print(f"RabbitMQ consumer disabled: {exc}")
-            return
+            return False
         channel.exchange_declare(
             exchange=CONSUME_EXCHANGE,
             exchange_type="topic",
@@ -74,11 +82,14 @@ class NfcEventConsumer:
 
         self._connection = connection
         self._channel = channel
-
-        self._thread = threading.Thread(target=self._consume, daemon=True)
-        self._thread.start()
+        return True
 
     def _consume(self):
+        if not self._connect():
+            return
+        if self._stopping:
+            self._connection.close()
+            return
         try:
             if self._channel:
                 self._channel.start_consuming()
@@ -90,6 +101,7 @@ class NfcEventConsumer:
                     pass
 
     def stop(self):
+        self._stopping = True
         if self._channel and self._channel.is_open:
             try:
                 self._channel.stop_consuming()
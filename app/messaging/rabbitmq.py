@@ -10,14 +10,34 @@ Developers:
 Description:
     Handles RabbitMQ connection management and event publishing.
     Publishes NFC events to the message broker for async processing.
+
+    Events are published after the database commit, so a slow or
+    unreachable broker must not hold or fail the request. Publishing goes
+    through a circuit breaker: connection attempts give up after
+    RABBITMQ_PUBLISH_TIMEOUT_SECONDS, and after RABBITMQ_BREAKER_FAILURES
+    consecutive failures the breaker opens and events are not attempted at
+    all until a trial publish succeeds. Events that could not be sent are
+    kept in a bounded in-memory spill buffer (the oldest are dropped when it
+    is full) and replayed by a background thread once publishing works
+    again. Replayed events keep their original timestamp but may arrive
+    after newer ones; spilled events are lost if the pod stops first.
 """
 
 import json
+import logging
 import os
+import threading
+from collections import deque
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-import pika
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from app.config import config
+from app.messaging.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.observability.telemetry import get_meter
+
+logger = logging.getLogger(__name__)
 
 RABBITMQ_HOST = os.getenv("RABBITMQ_HOST")
 RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", 5672))
@@ -27,18 +47,45 @@ RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD")
 EXCHANGE_NAME = "nfc.events"
 EXCHANGE_TYPE = "topic"
 
-def get_channel():
+# Spilled events replayed per broker connection.
+REPLAY_BATCH_SIZE = 100
+
+BREAKER_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+meter = get_meter("nfc-service.messaging")
+
+publish_counter = meter.create_counter(
+    name="nfc_event_publish_total",
+    description="NFC events handed to the publisher, by outcome",
+    unit="1",
+)
+
+
+def get_channel(timeout_s=None):
+    # pika is imported on first use so it stays off the startup import path.
+    import pika
+
     credentials = pika.PlainCredentials(
         RABBITMQ_USER,
         RABBITMQ_PASSWORD,
     )
 
+    timeouts = {}
+    if timeout_s is not None:
+        timeouts = {
+            "connection_attempts": 1,
+            "socket_timeout": timeout_s,
+            "stack_timeout": timeout_s,
+            "blocked_connection_timeout": timeout_s,
+        }
+
     connection = pika.BlockingConnection(
         pika.ConnectionParameters(
             host=RABBITMQ_HOST,
             port=RABBITMQ_PORT,
             credentials=credentials,
             heartbeat=600,
+            **timeouts,
         )
     )
 
@@ -52,9 +99,129 @@ def get_channel():
     return connection, channel
 
 
-def publish_event(routing_key: str, payload: dict):
-    connection, channel = get_channel()
+def _send(events):
+    """Publish (routing_key, body) pairs on one short-lived connection."""
+    import pika
+
+    connection, channel = get_channel(config.RABBITMQ_PUBLISH_TIMEOUT_SECONDS)
+    try:
+        for routing_key, body in events:
+            channel.basic_publish(
+                exchange=EXCHANGE_NAME,
+                routing_key=routing_key,
+                body=body,
+                properties=pika.BasicProperties(
+                    content_type="application/json",
+                    delivery_mode=2,  # persistent
+                ),
+            )
+    finally:
+        if connection.is_open:
+            connection.close()
+
+
+class EventPublisher:
+    def __init__(self, send=_send):
+        self._send = send
+        self._lock = threading.Lock()
+        self._spilled = deque()
+        self._replaying = False
+        self.breaker = CircuitBreaker(
+            "rabbitmq-publisher",
+            failure_threshold=config.RABBITMQ_BREAKER_FAILURES,
+            reset_seconds=config.RABBITMQ_BREAKER_RESET_SECONDS,
+        )
+
+    def pending(self) -> int:
+        return len(self._spilled)
+
+    def publish(self, routing_key: str, body: str):
+        if not config.RABBITMQ_BREAKER_ENABLED:
+            self._send([(routing_key, body)])
+            publish_counter.add(1, attributes={"outcome": "published"})
+            return
 
+        if not self.breaker.allow():
+            self._spill([(routing_key, body)])
+            return
+
+        try:
+            self._send([(routing_key, body)])
+        except Exception as exc:
+            self.breaker.record_failure(exc)
+            logger.warning(f"Publishing {routing_key} failed; event kept for replay: {exc}")
+            self._spill([(routing_key, body)])
+            return
+
+        self.breaker.record_success()
+        publish_counter.add(1, attributes={"outcome": "published"})
+        if self._spilled:
+            self._start_replay()
+
+    def _spill(self, events):
+        with self._lock:
+            for event in events:
+                if len(self._spilled) >= config.RABBITMQ_SPILL_BUFFER_SIZE:
+                    self._spilled.popleft()
+                    publish_counter.add(1, attributes={"outcome": "dropped"})
+                self._spilled.append(event)
+        publish_counter.add(len(events), attributes={"outcome": "spilled"})
+
+    def _start_replay(self):
+        with self._lock:
+            if self._replaying:
+                return
+            self._replaying = True
+        threading.Thread(target=self._replay, name="event-replay", daemon=True).start()
+
+    def _replay(self):
+        try:
+            while self.breaker.allow():
+                with self._lock:
+                    batch = [
+                        self._spilled.popleft()
+                        for _ in range(min(REPLAY_BATCH_SIZE, len(self._spilled)))
+                    ]
+                if not batch:
+                    return
+                try:
+                    self._send(batch)
+                except Exception as exc:
+                    self.breaker.record_failure(exc)
+                    with self._lock:
+                        self._spilled.extendleft(reversed(batch))
+                    return
+                self.breaker.record_success()
+                publish_counter.add(len(batch), attributes={"outcome": "replayed"})
+        finally:
+            with self._lock:
+                self._replaying = False
+
+    def _observe_breaker(self, options: CallbackOptions):
+        return [Observation(BREAKER_STATE_VALUES[self.breaker.state])]
+
+    def _observe_pending(self, options: CallbackOptions):
+        return [Observation(len(self._spilled))]
+
+
+event_publisher = EventPublisher()
+
+meter.create_observable_gauge(
+    name="nfc_event_publisher_breaker_state",
+    callbacks=[event_publisher._observe_breaker],
+    description="Publisher circuit breaker state (0 closed, 1 half-open, 2 open)",
+    unit="1",
+)
+
+meter.create_observable_gauge(
+    name="nfc_event_publisher_spilled",
+    callbacks=[event_publisher._observe_pending],
+    description="Events waiting in the spill buffer for replay",
+    unit="1",
+)
+
+
+def publish_event(routing_key: str, payload: dict):
     tz_name = os.getenv("APP_TIMEZONE") or os.getenv("TZ") or "Europe/Amsterdam"
     try:
         tz = ZoneInfo(tz_name)
@@ -62,14 +229,4 @@ def publish_event(routing_key: str, payload: dict):
     except ZoneInfoNotFoundError:
         payload["timestamp"] = datetime.now(timezone.utc).isoformat()
 
-    channel.basic_publish(
-        exchange=EXCHANGE_NAME,
-        routing_key=routing_key,
-        body=json.dumps(payload),
-        properties=pika.BasicProperties(
-            content_type="application/json",
-            delivery_mode=2,  # persistent
-        ),
-    )
-
-    connection.close()
+    event_publisher.publish(routing_key, json.dumps(payload))
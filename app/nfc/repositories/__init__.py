@@ -12,7 +12,8 @@ Description:
 """
 # Development Team: Muhammad Faizan, Roozbeh Kouchaki, Fatemehalsadat Sabaghjafari, Dipika Bhandari
 
-from app.nfc.repositories.nfc_repository import NfcRepository
+from app.nfc.repositories.nfc_repository import ActiveTagConflictError, NfcRepository
+from app.nfc.repositories.tag_record import TagRecord
 
-__all__ = ["NfcRepository"]
+__all__ = ["ActiveTagConflictError", "NfcRepository", "TagRecord"]
 
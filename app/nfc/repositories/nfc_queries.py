@@ -0,0 +1,404 @@
+"""
+NFC Repository SQL Statements
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    SQL used by the NFC repository, built once at import time so every call
+    reuses the same SQLAlchemy constructs (and their cached compilation)
+    instead of creating a new text() object per request. The hot reads also
+    have PreparedQuery variants executed as server-side prepared statements
+    on PostgreSQL. Writes are not prepared: they are infrequent admin
+    actions.
+"""
+
+from sqlalchemy import text
+
+from app.db.prepared import PreparedQuery
+
+
+TAG_COLUMNS = "tag_id, patient_id, status, issued_at, deactivated_at"
+
+
+GET_TAG = text(
+    f'''
+    SELECT {TAG_COLUMNS}
+    FROM "nfc_tags"
+    WHERE tag_id = :tag_id
+    '''
+)
+
+GET_TAG_PREPARED = PreparedQuery(
+    name="nfc_get_tag",
+    param_types=("text",),
+    params=("tag_id",),
+    sql=f'''
+    SELECT {TAG_COLUMNS}
+    FROM "nfc_tags"
+    WHERE tag_id = $1
+    ''',
+)
+
+# Read from the request's snapshot, unlike the sequence's last_value, which
+# already counts writes that have not committed. The change_seq trigger
+# updates the row on every tag insert, update and delete (20261019_000009).
+GET_CHANGE_VERSION = text(
+    '''
+    SELECT version
+    FROM "nfc_tags_version"
+    '''
+)
+
+# The version is computed in the same statement as the rows so both come
+# from one snapshot; the LEFT JOIN still returns it when no tag is active.
+GET_ACTIVE_TAG_SNAPSHOT = text(
+    '''
+    WITH version AS (
+        SELECT COALESCE(MAX(change_seq), 0) AS version
+        FROM "nfc_tags"
+    )
+    SELECT version.version, tags.tag_id, tags.patient_id
+    FROM version
+    LEFT JOIN "nfc_tags" AS tags ON tags.status = 'active'
+    '''
+)
+
+GET_TAG_CHANGES_SINCE = text(
+    f'''
+    SELECT {TAG_COLUMNS}, updated_at, change_seq
+    FROM "nfc_tags"
+    WHERE change_seq > :since
+    ORDER BY change_seq ASC
+    LIMIT :limit
+    '''
+)
+
+GET_ALL_TAGS = text(
+    f'''
+    SELECT {TAG_COLUMNS}
+    FROM "nfc_tags"
+    WHERE (:cursor IS NULL OR tag_id > :cursor)
+      AND (:status IS NULL OR status = :status)
+      AND (
+        :search IS NULL
+        OR tag_id ILIKE :search_pattern
+        OR CAST(patient_id AS text) ILIKE :search_pattern
+      )
+    ORDER BY tag_id ASC
+    LIMIT :limit
+    '''
+)
+
+GET_RECENT_ACTIVE_TAG_IDS = text(
+    '''
+    SELECT tag_id
+    FROM "nfc_tags"
+    WHERE status = 'active'
+    ORDER BY issued_at DESC
+    LIMIT :limit
+    '''
+)
+
+COUNT_TAGS = text(
+    '''
+    SELECT COUNT(*)
+    FROM "nfc_tags"
+    '''
+)
+
+GET_ALL_TAG_IDS = text(
+    '''
+    SELECT tag_id
+    FROM "nfc_tags"
+    '''
+)
+
+GET_TAG_IDS_CHANGED_SINCE = text(
+    '''
+    SELECT tag_id, change_seq
+    FROM "nfc_tags"
+    WHERE change_seq > :since
+    '''
+)
+
+GET_STATS = text(
+    '''
+    SELECT
+        COUNT(*) AS total,
+        SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active,
+        SUM(CASE WHEN status = 'inactive' THEN 1 ELSE 0 END) AS inactive
+    FROM "nfc_tags"
+    '''
+)
+
+GET_PATIENT = text(
+    '''
+    SELECT id
+    FROM "patients"
+    WHERE id = :patient_id
+    '''
+)
+
+GET_ACTIVE_TAG_FOR_PATIENT = text(
+    '''
+    SELECT tag_id
+    FROM "nfc_tags"
+    WHERE patient_id = :patient_id
+      AND status = 'active'
+    '''
+)
+
+GET_TAG_FOR_PATIENT = text(
+    f'''
+    SELECT {TAG_COLUMNS}
+    FROM "nfc_tags"
+    WHERE patient_id = :patient_id
+      AND status = 'active'
+    '''
+)
+
+GET_TAG_FOR_PATIENT_PREPARED = PreparedQuery(
+    name="nfc_get_tag_for_patient",
+    param_types=("uuid",),
+    params=("patient_id",),
+    sql=f'''
+    SELECT {TAG_COLUMNS}
+    FROM "nfc_tags"
+    WHERE patient_id = $1
+      AND status = 'active'
+    ''',
+)
+
+# The tenant lock the change_seq trigger takes (20261019_000006). Writers take
+# it before their first row lock, so no writer waits for it while holding a
+# row another writer needs. Plain SQL: it is sent ahead of the write itself
+# (app.db.session.send_with_next_statement), not executed on its own.
+LOCK_TAG_WRITES = "SELECT pg_advisory_xact_lock(hashtext(current_schema() || '.nfc_tags'))"
+
+# Only used where the assign/replace CTEs cannot run (the SQLite stand-in).
+UPSERT_TAG = text(
+    '''
+    INSERT INTO "nfc_tags" (tag_id, patient_id, status, issued_at, deactivated_at, updated_at)
+    VALUES (:tag_id, :patient_id, 'active', CURRENT_TIMESTAMP, NULL, CURRENT_TIMESTAMP)
+    ON CONFLICT (tag_id)
+    DO UPDATE SET
+        patient_id = EXCLUDED.patient_id,
+        status = 'active',
+        issued_at = CURRENT_TIMESTAMP,
+        deactivated_at = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    '''
+)
+
+ASSIGN_TAG = text(
+    '''
+    WITH patient AS (
+        SELECT id
+        FROM "patients"
+        WHERE id = :patient_id
+    ),
+    conflicting AS (
+        SELECT tag_id
+        FROM "nfc_tags"
+        WHERE patient_id = :patient_id
+          AND status = 'active'
+          AND tag_id <> :tag_id
+    ),
+    upserted AS (
+        INSERT INTO "nfc_tags" (tag_id, patient_id, status, issued_at, deactivated_at, updated_at)
+        SELECT :tag_id, patient.id, 'active', CURRENT_TIMESTAMP, NULL, CURRENT_TIMESTAMP
+        FROM patient
+        WHERE NOT EXISTS (SELECT 1 FROM conflicting)
+        ON CONFLICT (tag_id)
+        DO UPDATE SET
+            patient_id = EXCLUDED.patient_id,
+            status = 'active',
+            issued_at = CURRENT_TIMESTAMP,
+            deactivated_at = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING tag_id
+    )
+    SELECT CASE
+        WHEN NOT EXISTS (SELECT 1 FROM patient) THEN 'patient_not_found'
+        WHEN EXISTS (SELECT 1 FROM conflicting) THEN 'conflict'
+        ELSE 'assigned'
+    END AS outcome
+    '''
+)
+
+# Tags that are already inactive are left alone, so a redelivered event
+# does not rewrite them and push them through the change feed again.
+DEACTIVATE_TAGS_FOR_PATIENT = text(
+    '''
+    UPDATE "nfc_tags"
+    SET status = 'inactive',
+        deactivated_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE patient_id = :patient_id
+      AND status <> 'inactive'
+    '''
+)
+
+DEACTIVATE_ALL_TAGS = text(
+    '''
+    UPDATE "nfc_tags"
+    SET status = 'inactive',
+        deactivated_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE status <> 'inactive'
+    '''
+)
+
+
+def _transition_cte(set_clause: str):
+    # Lock, conditionally update and report the outcome in a single round
+    # trip instead of SELECT followed by UPDATE.
+    return text(
+        f'''
+        WITH target AS (
+            SELECT {TAG_COLUMNS}
+            FROM "nfc_tags"
+            WHERE tag_id = :tag_id
+            FOR UPDATE
+        ),
+        updated AS (
+            UPDATE "nfc_tags"
+            SET {set_clause}
+            WHERE tag_id IN (
+                SELECT tag_id FROM target WHERE status <> :target_status
+            )
+            RETURNING {TAG_COLUMNS}
+        )
+        SELECT {TAG_COLUMNS}, TRUE AS changed
+        FROM updated
+        UNION ALL
+        SELECT {TAG_COLUMNS}, FALSE AS changed
+        FROM target
+        WHERE NOT EXISTS (SELECT 1 FROM updated)
+        '''
+    )
+
+
+def _conditional_update(set_clause: str):
+    return text(
+        f'''
+        UPDATE "nfc_tags"
+        SET {set_clause}
+        WHERE tag_id = :tag_id
+          AND status <> :target_status
+        RETURNING {TAG_COLUMNS}, 1 AS changed
+        '''
+    )
+
+
+_DEACTIVATE_SET = (
+    "status = 'inactive', deactivated_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP"
+)
+_REACTIVATE_SET = "status = 'active', deactivated_at = NULL, updated_at = CURRENT_TIMESTAMP"
+
+DEACTIVATE_TAG_CTE = _transition_cte(_DEACTIVATE_SET)
+REACTIVATE_TAG_CTE = _transition_cte(_REACTIVATE_SET)
+
+# Other dialects (the SQLite stand-in used by the e2e tests) cannot run
+# data-modifying CTEs; they use a conditional UPDATE and read the tag back
+# only when nothing changed.
+DEACTIVATE_TAG_IF_ACTIVE = _conditional_update(_DEACTIVATE_SET)
+REACTIVATE_TAG_IF_INACTIVE = _conditional_update(_REACTIVATE_SET)
+
+GET_TAG_UNCHANGED = text(
+    f'''
+    SELECT {TAG_COLUMNS}, 0 AS changed
+    FROM "nfc_tags"
+    WHERE tag_id = :tag_id
+    '''
+)
+
+# Both tags are locked up front so a concurrent assign/replace cannot slip in
+# between the conflict check and the writes. The old tag must be deactivated
+# before the upsert so the active-tag index never sees two active tags for
+# the patient, but the sub-statements of a WITH run in no guaranteed order.
+# The always-true "(SELECT COUNT(*) FROM deactivated) >= 0" filter forces
+# it: PostgreSQL evaluates that uncorrelated subquery once, before the
+# INSERT produces its first row, which runs the UPDATE to completion first.
+# Do not drop it as redundant.
+REPLACE_TAG_CTE = text(
+    '''
+    WITH old_tag AS (
+        SELECT tag_id, patient_id, status
+        FROM "nfc_tags"
+        WHERE tag_id = :old_tag_id
+        FOR UPDATE
+    ),
+    new_tag AS (
+        SELECT tag_id, patient_id
+        FROM "nfc_tags"
+        WHERE tag_id = :new_tag_id
+        FOR UPDATE
+    ),
+    allowed AS (
+        SELECT old_tag.patient_id
+        FROM old_tag
+        WHERE NOT EXISTS (
+            SELECT 1 FROM new_tag
+            WHERE new_tag.patient_id <> old_tag.patient_id
+        )
+    ),
+    deactivated AS (
+        UPDATE "nfc_tags"
+        SET status = 'inactive',
+            deactivated_at = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE tag_id = :old_tag_id
+          AND status <> 'inactive'
+          AND EXISTS (SELECT 1 FROM allowed)
+        RETURNING tag_id
+    ),
+    upserted AS (
+        INSERT INTO "nfc_tags" (tag_id, patient_id, status, issued_at, deactivated_at, updated_at)
+        SELECT :new_tag_id, allowed.patient_id, 'active', CURRENT_TIMESTAMP, NULL, CURRENT_TIMESTAMP
+        FROM allowed
+        WHERE (SELECT COUNT(*) FROM deactivated) >= 0
+        ON CONFLICT (tag_id)
+        DO UPDATE SET
+            patient_id = EXCLUDED.patient_id,
+            status = 'active',
+            issued_at = CURRENT_TIMESTAMP,
+            deactivated_at = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING tag_id
+    )
+    SELECT
+        old_tag.patient_id,
+        NOT EXISTS (SELECT 1 FROM allowed) AS conflict
+    FROM old_tag
+    '''
+)
+
+REPLACE_TAG_CHECK = text(
+    '''
+    SELECT
+        old_tag.patient_id,
+        EXISTS (
+            SELECT 1 FROM "nfc_tags" new_tag
+            WHERE new_tag.tag_id = :new_tag_id
+              AND new_tag.patient_id <> old_tag.patient_id
+        ) AS conflict
+    FROM "nfc_tags" old_tag
+    WHERE old_tag.tag_id = :old_tag_id
+    '''
+)
+
+DEACTIVATE_REPLACED_TAG = text(
+    '''
+    UPDATE "nfc_tags"
+    SET status = 'inactive',
+        deactivated_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE tag_id = :old_tag_id
+      AND status <> 'inactive'
+    '''
+)
@@ -12,27 +12,79 @@ Description:
     and transactions using SQLAlchemy ORM.
 """
 
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
-from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.db.prepared import execute_prepared
+from app.db.session import send_with_next_statement
+from app.nfc.repositories import nfc_queries as queries
+from app.nfc.repositories.tag_record import TagRecord
+from app.nfc.tag_filter import tag_filters
+
+
+ACTIVE_PATIENT_TAG_INDEX = "uq_nfc_tags_active_patient"
+
+
+class ActiveTagConflictError(Exception):
+    """Raised when a write would give a patient a second active NFC tag."""
+
 
 class NfcRepository:
     def __init__(self, db: Session):
         self._db = db
 
-    def get_tag(self, tag_id: str):
+    @property
+    def schema_name(self) -> Optional[str]:
+        """Tenant schema the session is bound to, set by get_db_for_org."""
+        return self._db.info.get("schema_name")
+
+    def get_tag(self, tag_id: str) -> Optional[TagRecord]:
+        return TagRecord.from_row(
+            execute_prepared(
+                self._db,
+                queries.GET_TAG_PREPARED,
+                queries.GET_TAG,
+                {"tag_id": tag_id},
+            ).fetchone()
+        )
+
+    def get_change_version(self) -> Optional[int]:
+        """
+        Tenant tag version as seen by this transaction.
+
+        Returns:
+            The change_seq of the latest committed tag write; None where
+            change_seq does not exist (outside PostgreSQL).
+        """
+        if not self._is_postgresql():
+            return None
+        return self._db.execute(queries.GET_CHANGE_VERSION).scalar_one()
+
+    def get_active_tag_snapshot(self) -> tuple[int, list[tuple]]:
+        """
+        Map every active tag to its patient, as of one consistent version.
+
+        Returns:
+            The highest change_seq in the table and (tag_id, patient_id)
+            pairs of the active tags
+        """
+        rows = self._db.execute(queries.GET_ACTIVE_TAG_SNAPSHOT).all()
+        version = rows[0].version if rows else 0
+        return version or 0, [(row.tag_id, row.patient_id) for row in rows if row.tag_id is not None]
+
+    def get_tag_changes_since(self, since: int, limit: int):
+        """
+        Tags written after change_seq ``since``, oldest change first.
+
+        Rows hold the TAG_COLUMNS followed by updated_at and change_seq.
+        """
         return self._db.execute(
-            text(
-                '''
-                SELECT tag_id, patient_id, status, issued_at, deactivated_at
-                FROM "nfc_tags"
-                WHERE tag_id = :tag_id
-                '''
-            ),
-            {"tag_id": tag_id},
-        ).fetchone()
+            queries.GET_TAG_CHANGES_SINCE,
+            {"since": since, "limit": limit},
+        ).fetchall()
 
     def get_all_tags(
         self,
@@ -40,24 +92,10 @@ class NfcRepository:
         cursor: Optional[str],
         status: Optional[str],
         search: Optional[str],
-    ):
+    ) -> list[TagRecord]:
         search_pattern = f"%{search}%" if search else None
-        return self._db.execute(
-            text(
-                '''
-                SELECT tag_id, patient_id, status, issued_at, deactivated_at
-                FROM "nfc_tags"
-                WHERE (:cursor IS NULL OR tag_id > :cursor)
-                  AND (:status IS NULL OR status = :status)
-                  AND (
-                    :search IS NULL
-                    OR tag_id ILIKE :search_pattern
-                    OR CAST(patient_id AS text) ILIKE :search_pattern
-                  )
-                ORDER BY tag_id ASC
-                LIMIT :limit
-                '''
-            ),
+        result = self._db.execute(
+            queries.GET_ALL_TAGS,
             {
                 "limit": limit,
                 "cursor": cursor,
@@ -65,128 +103,196 @@ class NfcRepository:
                 "search": search,
                 "search_pattern": search_pattern,
             },
-        ).fetchall()
+        )
+        return [TagRecord(*row) for row in result.tuples()]
 
     def get_stats(self):
+        return self._db.execute(queries.GET_STATS).fetchone()
+
+    def get_recent_tag_ids(self, limit: int) -> list[str]:
+        return list(
+            self._db.execute(queries.GET_RECENT_ACTIVE_TAG_IDS, {"limit": limit}).scalars()
+        )
+
+    def count_tags(self) -> int:
+        return self._db.execute(queries.COUNT_TAGS).scalar() or 0
+
+    def iter_tag_ids(self, batch_size: int = 10_000) -> Iterator[str]:
         return self._db.execute(
-            text(
-                '''
-                SELECT
-                    COUNT(*) AS total,
-                    SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active,
-                    SUM(CASE WHEN status = 'inactive' THEN 1 ELSE 0 END) AS inactive
-                FROM "nfc_tags"
-                '''
-            )
-        ).fetchone()
+            queries.GET_ALL_TAG_IDS,
+            execution_options={"yield_per": batch_size},
+        ).scalars()
+
+    def get_tag_ids_changed_since(self, since: int) -> list[tuple[str, int]]:
+        """(tag_id, change_seq) of the tags written after change_seq ``since``."""
+        return self._db.execute(queries.GET_TAG_IDS_CHANGED_SINCE, {"since": since}).all()
 
     def get_patient(self, patient_id):
         return self._db.execute(
-            text(
-                '''
-                SELECT id
-                FROM "patients"
-                WHERE id = :patient_id
-                '''
-            ),
+            queries.GET_PATIENT,
             {"patient_id": patient_id},
         ).fetchone()
 
     def get_active_tag_for_patient(self, patient_id):
         return self._db.execute(
-            text(
-                '''
-                SELECT tag_id
-                FROM "nfc_tags"
-                WHERE patient_id = :patient_id
-                  AND status = 'active'
-                '''
-            ),
+            queries.GET_ACTIVE_TAG_FOR_PATIENT,
             {"patient_id": patient_id},
         ).fetchone()
 
-    def get_tag_for_patient(self, patient_id):
-        return self._db.execute(
-            text(
-                '''
-                SELECT tag_id, patient_id, status, issued_at, deactivated_at
-                FROM "nfc_tags"
-                WHERE patient_id = :patient_id
-                  AND status = 'active'
-                '''
-            ),
-            {"patient_id": patient_id},
-        ).fetchone()
+    def get_tag_for_patient(self, patient_id) -> Optional[TagRecord]:
+        return TagRecord.from_row(
+            execute_prepared(
+                self._db,
+                queries.GET_TAG_FOR_PATIENT_PREPARED,
+                queries.GET_TAG_FOR_PATIENT,
+                {"patient_id": patient_id},
+            ).fetchone()
+        )
 
     def upsert_tag(self, tag_id: str, patient_id):
         self._db.execute(
-            text(
-                '''
-                INSERT INTO "nfc_tags" (tag_id, patient_id, status, issued_at, deactivated_at)
-                VALUES (:tag_id, :patient_id, 'active', CURRENT_TIMESTAMP, NULL)
-                ON CONFLICT (tag_id)
-                DO UPDATE SET
-                    patient_id = EXCLUDED.patient_id,
-                    status = 'active',
-                    issued_at = CURRENT_TIMESTAMP,
-                    deactivated_at = NULL
-                '''
-            ),
+            queries.UPSERT_TAG,
             {
                 "tag_id": tag_id,
                 "patient_id": patient_id,
             },
         )
+        tag_filters.add(self.schema_name, tag_id)
 
-    def deactivate_tag(self, tag_id: str):
-        return self._db.execute(
-            text(
-                '''
-                UPDATE "nfc_tags"
-                SET status = 'inactive',
-                    deactivated_at = CURRENT_TIMESTAMP
-                WHERE tag_id = :tag_id
-                '''
-            ),
-            {"tag_id": tag_id},
-        ).rowcount
+    def assign_tag(self, tag_id: str, patient_id) -> str:
+        """
+        Validate the patient and upsert the tag as active in one statement.
+
+        Returns ``"assigned"``, ``"patient_not_found"`` or ``"conflict"`` when
+        the patient already has a different active tag. A concurrent assign
+        that wins the race surfaces as ``ActiveTagConflictError``.
+        """
+        params = {"tag_id": tag_id, "patient_id": patient_id}
+
+        if self._is_postgresql():
+            self._lock_tag_writes()
+            with self._active_tag_guard():
+                outcome = self._db.execute(queries.ASSIGN_TAG, params).scalar()
+            if outcome == "assigned":
+                tag_filters.add(self.schema_name, tag_id)
+            return outcome
+
+        if not self.get_patient(patient_id):
+            return "patient_not_found"
+
+        existing_tag = self.get_active_tag_for_patient(patient_id)
+        if existing_tag and existing_tag.tag_id != tag_id:
+            return "conflict"
+
+        self.upsert_tag(tag_id, patient_id)
+        return "assigned"
 
     def deactivate_tags_for_patient(self, patient_id):
+        self._lock_tag_writes()
         return self._db.execute(
-            text(
-                '''
-                UPDATE "nfc_tags"
-                SET status = 'inactive',
-                    deactivated_at = CURRENT_TIMESTAMP
-                WHERE patient_id = :patient_id
-                '''
-            ),
+            queries.DEACTIVATE_TAGS_FOR_PATIENT,
             {"patient_id": patient_id},
         ).rowcount
 
     def deactivate_all_tags(self):
-        return self._db.execute(
-            text(
-                '''
-                UPDATE "nfc_tags"
-                SET status = 'inactive',
-                    deactivated_at = CURRENT_TIMESTAMP
-                '''
-            )
-        ).rowcount
+        self._lock_tag_writes()
+        return self._db.execute(queries.DEACTIVATE_ALL_TAGS).rowcount
 
-    def reactivate_tag(self, tag_id: str):
-        return self._db.execute(
-            text(
-                '''
-                UPDATE "nfc_tags"
-                SET status = 'active',
-                    deactivated_at = NULL
-                WHERE tag_id = :tag_id
-                '''
-            ),
-            {"tag_id": tag_id},
-        ).rowcount
+    def transition_tag_to_inactive(self, tag_id: str):
+        """
+        Deactivate a tag unless it is already inactive.
+
+        Returns None when the tag does not exist, otherwise the tag row with
+        a ``changed`` flag telling whether this call performed the transition.
+        """
+        return self._transition_tag(
+            tag_id,
+            target_status="inactive",
+            cte=queries.DEACTIVATE_TAG_CTE,
+            conditional_update=queries.DEACTIVATE_TAG_IF_ACTIVE,
+        )
+
+    def transition_tag_to_active(self, tag_id: str):
+        """
+        Reactivate a tag unless it is already active.
+
+        Returns None when the tag does not exist, otherwise the tag row with
+        a ``changed`` flag telling whether this call performed the transition.
+        """
+        return self._transition_tag(
+            tag_id,
+            target_status="active",
+            cte=queries.REACTIVATE_TAG_CTE,
+            conditional_update=queries.REACTIVATE_TAG_IF_INACTIVE,
+        )
+
+    def replace_tag(self, old_tag_id: str, new_tag_id: str):
+        """
+        Move the old tag's patient onto the new tag and deactivate the old tag.
+
+        Returns None when the old tag does not exist, otherwise a row with the
+        old tag's ``patient_id`` and a ``conflict`` flag that is true when the
+        new tag belongs to a different patient (nothing is written then).
+        """
+        params = {"old_tag_id": old_tag_id, "new_tag_id": new_tag_id}
+
+        if self._is_postgresql():
+            self._lock_tag_writes()
+            with self._active_tag_guard():
+                result = self._db.execute(queries.REPLACE_TAG_CTE, params).fetchone()
+            if result and not result.conflict:
+                tag_filters.add(self.schema_name, new_tag_id)
+            return result
+
+        result = self._db.execute(queries.REPLACE_TAG_CHECK, params).fetchone()
+
+        if result and not result.conflict:
+            self._db.execute(queries.DEACTIVATE_REPLACED_TAG, params)
+            self.upsert_tag(new_tag_id, result.patient_id)
+
+        return result
+
+    def _transition_tag(self, tag_id: str, target_status: str, cte, conditional_update):
+        params = {"tag_id": tag_id, "target_status": target_status}
+
+        if self._is_postgresql():
+            self._lock_tag_writes()
+            with self._active_tag_guard():
+                return self._db.execute(cte, params).fetchone()
+
+        result = self._db.execute(conditional_update, params).fetchone()
+        if result is not None:
+            return result
+
+        return self._db.execute(queries.GET_TAG_UNCHANGED, {"tag_id": tag_id}).fetchone()
+
+    def _lock_tag_writes(self):
+        """
+        Take the tenant's tag write lock ahead of any row lock.
+
+        The change_seq trigger takes the same lock per row, but only after
+        the statement has locked the row (FOR UPDATE, ON CONFLICT, UPDATE),
+        and two writers doing that in opposite order deadlock. Taken first,
+        the trigger's lock is a re-entry. The lock is sent with the write
+        statement that follows, so it costs no round trip of its own.
+        Outside PostgreSQL there is no trigger and nothing to lock.
+        """
+        if self._is_postgresql():
+            send_with_next_statement(self._db, queries.LOCK_TAG_WRITES)
+
+    @contextmanager
+    def _active_tag_guard(self):
+        try:
+            yield
+        except IntegrityError as exc:
+            if ACTIVE_PATIENT_TAG_INDEX not in str(exc.orig):
+                raise
+            raise ActiveTagConflictError(
+                "Patient already has an active NFC tag"
+            ) from exc
+
+    def _is_postgresql(self) -> bool:
+        return self._db.get_bind().dialect.name == "postgresql"
 
     def commit(self):
         self._db.commit()
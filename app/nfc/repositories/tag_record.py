@@ -0,0 +1,72 @@
+"""
+NFC Tag Record
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Compact representation of an nfc_tags row returned by the repository
+    reads. Uses __slots__, so a record is five attribute slots with no
+    per-instance dict, and is built positionally from the TAG_COLUMNS
+    order. to_wire() is the single conversion to the API shape shared by
+    the get, get-by-patient and list endpoints; to_change() extends it for
+    the change feed.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+
+def _timestamp(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # SQLite hands timestamps back as strings already.
+    return str(value)
+
+
+class TagRecord:
+    __slots__ = ("tag_id", "patient_id", "status", "issued_at", "deactivated_at")
+
+    def __init__(self, tag_id, patient_id, status, issued_at=None, deactivated_at=None):
+        self.tag_id = tag_id
+        self.patient_id = patient_id
+        self.status = status
+        self.issued_at = issued_at
+        self.deactivated_at = deactivated_at
+
+    @classmethod
+    def from_row(cls, row) -> Optional["TagRecord"]:
+        """Build a record from a row selected with TAG_COLUMNS, or None."""
+        if row is None:
+            return None
+        return cls(*row)
+
+    def to_wire(self, organization_id: str) -> dict:
+        return {
+            "tag_id": self.tag_id,
+            "patient_id": str(self.patient_id),
+            "organization_id": organization_id,
+            "status": self.status,
+            "issued_at": _timestamp(self.issued_at),
+            "deactivated_at": _timestamp(self.deactivated_at),
+        }
+
+    def to_change(self, organization_id: str, updated_at, change_seq: int) -> dict:
+        return {
+            **self.to_wire(organization_id),
+            "updated_at": _timestamp(updated_at),
+            "change_seq": change_seq,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, TagRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"TagRecord(tag_id={self.tag_id!r}, patient_id={self.patient_id!r}, status={self.status!r})"
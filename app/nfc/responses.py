@@ -0,0 +1,110 @@
+"""
+NFC Response Rendering
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Fast response path for the NFC endpoints. NfcService already returns
+    payloads in the shape of the response schemas, so building the Pydantic
+    response model and letting FastAPI validate it again against
+    response_model only repeats work (100 nested models per list page). With
+    FAST_RESPONSES_ENABLED the service dict is encoded directly with orjson
+    and returned as a Response, which FastAPI passes through untouched. The
+    response models stay declared on the routes for the OpenAPI schema.
+
+    The GET endpoints also carry an ETag derived from the tenant's tag
+    version (see NfcRepository.get_change_version), so a client revalidating
+    with If-None-Match gets 304 Not Modified before any tag row is fetched.
+    The version is read in the request's transaction before the body, so
+    the body is never older than its ETag; a write committing in between
+    only costs the client one extra full response. The tenant schema is
+    hashed into the tag so equal versions of different tenants never share
+    an ETag. ETags are weak: they identify the tenant's data, not the bytes
+    of one response. The fast path produces the same bytes as the validated
+    one for payloads that match the response models.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.config import config
+
+
+class TrustedJSONResponse(Response):
+    """JSON response for service output that already matches its schema."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # orjson encodes UUID values in their canonical form, as Pydantic does.
+        return orjson.dumps(content)
+
+
+def build_response(
+    model: type[BaseModel],
+    result: dict,
+    status_code: int = 200,
+    headers: Optional[dict] = None,
+):
+    """
+    Return the service result as the route's response.
+
+    Args:
+        model: Response model declared on the route
+        result: Payload returned by NfcService
+        status_code: Status code of the route; only used on the fast path
+            or with headers, otherwise FastAPI applies the route's status_code
+        headers: Extra response headers, e.g. from cache_headers()
+    """
+    if config.FAST_RESPONSES_ENABLED:
+        return TrustedJSONResponse(result, status_code=status_code, headers=headers)
+    validated = model(**result)
+    if headers:
+        return JSONResponse(
+            validated.model_dump(mode="json"),
+            status_code=status_code,
+            headers=headers,
+        )
+    return validated
+
+
+def make_etag(schema_name: Optional[str], version: int) -> str:
+    digest = hashlib.blake2b(
+        f"{schema_name}:{version}".encode("utf-8"),
+        digest_size=8,
+    )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header covers ``etag`` (weak comparison)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: Optional[str]) -> Optional[dict]:
+    """ETag headers for a tenant read; clients must revalidate before reuse."""
+    if etag is None:
+        return None
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    """304 for ``etag``, with any ``headers`` the full response would carry (e.g. Vary)."""
+    return Response(status_code=304, headers={**cache_headers(etag), **(headers or {})})
@@ -14,15 +14,17 @@ Description:
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
 from app.auth.dependencies import require_permission_any
-from app.db.session import get_db_for_org
+from app.db.session import cached_schema_name, get_db_for_org
 from app.messaging.rabbitmq import publish_event
 from app.nfc.repositories import NfcRepository
+from app.nfc.responses import build_response, cache_headers, etag_matches, not_modified
 from app.nfc.schemas import (
     NFCAssignRequest,
     NFCAssignResponse,
+    NFCChangesResponse,
     NFCDeactivateRequest,
     NFCDeactivateResponse,
     NFCGetResponse,
@@ -33,17 +35,38 @@ from app.nfc.schemas import (
     NFCReplaceResponse,
     NFCResolveRequest,
     NFCResolveResponse,
+    NFCSnapshotChangesResponse,
+    NFCSnapshotKeyResponse,
+    NFCSnapshotResponse,
     NFCStatsResponse,
 )
-from app.nfc.services import NfcService
+from app.nfc.services import NfcService, reject_unknown_tag
+from app.nfc.snapshots import VARY_HEADERS, get_signer, public_key_info, signed_response
+from app.observability.phases import request_phase
+from app.traffic import (
+    admin_lane,
+    admit_organization,
+    apply_deadline,
+    resolve_lane,
+    shed_load,
+)
 
 
-router = APIRouter(prefix="/nfc", tags=["NFC"])
+router = APIRouter(
+    prefix="/nfc",
+    tags=["NFC"],
+    dependencies=[
+        Depends(admit_organization),
+        Depends(shed_load),
+        Depends(apply_deadline),
+    ],
+)
 
 
 @router.post(
     "/resolve",
     response_model=NFCResolveResponse,
+    dependencies=[Depends(resolve_lane)],
 )
 def resolve_nfc_tag(
     payload: NFCResolveRequest,
@@ -56,7 +79,13 @@ def resolve_nfc_tag(
     ),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    reject_unknown_tag(
+        user.get("schema_name") or cached_schema_name(org_id),
+        payload.tag_id,
+    )
+
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
@@ -67,7 +96,8 @@ def resolve_nfc_tag(
             tag_id=payload.tag_id,
         )
 
-        return NFCResolveResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCResolveResponse, result)
 
     finally:
         db.close()
@@ -76,24 +106,32 @@ def resolve_nfc_tag(
 @router.get(
     "/patient/{patient_id}",
     response_model=NFCGetResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def get_nfc_tag_by_patient(
+    request: Request,
     patient_id: str,
     user=Depends(require_permission_any(["nfc:read"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
         service = NfcService(repository, publish_event)
 
+        etag = service.get_etag()
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+
         result = service.get_tag_by_patient(
             organization_id=org_id,
             patient_id=patient_id,
         )
 
-        return NFCGetResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCGetResponse, result, headers=cache_headers(etag))
 
     finally:
         db.close()
@@ -102,8 +140,10 @@ def get_nfc_tag_by_patient(
 @router.get(
     "/",
     response_model=NFCListResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def get_all_nfc_tags(
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
@@ -111,12 +151,17 @@ def get_all_nfc_tags(
     user=Depends(require_permission_any(["nfc:read"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
         service = NfcService(repository, publish_event)
 
+        etag = service.get_etag()
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+
         result = service.get_all_tags(
             organization_id=org_id,
             limit=limit,
@@ -125,7 +170,8 @@ def get_all_nfc_tags(
             search=search,
         )
 
-        return NFCListResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCListResponse, result, headers=cache_headers(etag))
 
     finally:
         db.close()
@@ -134,46 +180,172 @@ def get_all_nfc_tags(
 @router.get(
     "/stats",
     response_model=NFCStatsResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def get_nfc_stats(
+    request: Request,
     user=Depends(require_permission_any(["nfc:read"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
         service = NfcService(repository, publish_event)
 
+        etag = service.get_etag()
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+
         result = service.get_stats()
 
-        return NFCStatsResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCStatsResponse, result, headers=cache_headers(etag))
 
     finally:
         db.close()
 
 
+@router.get(
+    "/changes",
+    response_model=NFCChangesResponse,
+    dependencies=[Depends(admin_lane)],
+)
+def get_nfc_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    user=Depends(require_permission_any(["nfc:read"])),
+):
+    org_id = user["organization_id"]
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
+
+    try:
+        repository = NfcRepository(db)
+        service = NfcService(repository, publish_event)
+
+        result = service.get_changes(
+            organization_id=org_id,
+            since=since,
+            limit=limit,
+        )
+
+        with request_phase("serialization"):
+            return build_response(NFCChangesResponse, result)
+
+    finally:
+        db.close()
+
+
+@router.get(
+    "/snapshot",
+    response_model=NFCSnapshotResponse,
+    dependencies=[Depends(admin_lane)],
+)
+def get_nfc_snapshot(
+    request: Request,
+    user=Depends(require_permission_any(["nfc:resolve"])),
+):
+    get_signer()
+    org_id = user["organization_id"]
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
+
+    try:
+        repository = NfcRepository(db)
+        service = NfcService(repository, publish_event)
+
+        etag = service.get_etag()
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag, headers=VARY_HEADERS)
+
+        result = service.get_snapshot(organization_id=org_id)
+
+        with request_phase("serialization"):
+            return signed_response(
+                result,
+                request.headers.get("Accept-Encoding"),
+                headers=cache_headers(etag),
+            )
+
+    finally:
+        db.close()
+
+
+@router.get(
+    "/snapshot/changes",
+    response_model=NFCSnapshotChangesResponse,
+    dependencies=[Depends(admin_lane)],
+)
+def get_nfc_snapshot_changes(
+    request: Request,
+    since: int = Query(..., ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    user=Depends(require_permission_any(["nfc:resolve"])),
+):
+    get_signer()
+    org_id = user["organization_id"]
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
+
+    try:
+        repository = NfcRepository(db)
+        service = NfcService(repository, publish_event)
+
+        result = service.get_snapshot_changes(
+            organization_id=org_id,
+            since=since,
+            limit=limit,
+        )
+
+        with request_phase("serialization"):
+            return signed_response(result, request.headers.get("Accept-Encoding"))
+
+    finally:
+        db.close()
+
+
+@router.get(
+    "/snapshot/key",
+    response_model=NFCSnapshotKeyResponse,
+    dependencies=[Depends(admin_lane)],
+)
+def get_nfc_snapshot_key(
+    user=Depends(require_permission_any(["nfc:resolve"])),
+):
+    return public_key_info()
+
+
 @router.get(
     "/{tag_id}",
     response_model=NFCGetResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def get_nfc_tag(
+    request: Request,
     tag_id: str,
     user=Depends(require_permission_any(["nfc:read"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
         service = NfcService(repository, publish_event)
 
+        etag = service.get_etag()
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+
         result = service.get_tag(
             organization_id=org_id,
             tag_id=tag_id,
         )
 
-        return NFCGetResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCGetResponse, result, headers=cache_headers(etag))
 
     finally:
         db.close()
@@ -183,13 +355,15 @@ def get_nfc_tag(
     "/assign",
     response_model=NFCAssignResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admin_lane)],
 )
 def assign_nfc_tag(
     payload: NFCAssignRequest,
     user=Depends(require_permission_any(["nfc:assign"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
@@ -202,7 +376,12 @@ def assign_nfc_tag(
             patient_id=payload.patient_id,
         )
 
-        return NFCAssignResponse(**result)
+        with request_phase("serialization"):
+            return build_response(
+                NFCAssignResponse,
+                result,
+                status_code=status.HTTP_201_CREATED,
+            )
 
     finally:
         db.close()
@@ -211,13 +390,15 @@ def assign_nfc_tag(
 @router.post(
     "/deactivate",
     response_model=NFCDeactivateResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def deactivate_nfc_tag(
     payload: NFCDeactivateRequest,
     user=Depends(require_permission_any(["nfc:update"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
@@ -228,7 +409,8 @@ def deactivate_nfc_tag(
             tag_id=payload.tag_id,
         )
 
-        return NFCDeactivateResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCDeactivateResponse, result)
 
     finally:
         db.close()
@@ -237,13 +419,15 @@ def deactivate_nfc_tag(
 @router.post(
     "/reactivate",
     response_model=NFCReactivateResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def reactivate_nfc_tag(
     payload: NFCReactivateRequest,
     user=Depends(require_permission_any(["nfc:update"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
@@ -254,7 +438,8 @@ def reactivate_nfc_tag(
             tag_id=payload.tag_id,
         )
 
-        return NFCReactivateResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCReactivateResponse, result)
 
     finally:
         db.close()
@@ -263,13 +448,15 @@ def reactivate_nfc_tag(
 @router.post(
     "/replace",
     response_model=NFCReplaceResponse,
+    dependencies=[Depends(admin_lane)],
 )
 def replace_nfc_tag(
     payload: NFCReplaceRequest,
     user=Depends(require_permission_any(["nfc:update"])),
 ):
     org_id = user["organization_id"]
-    db = get_db_for_org(org_id, user.get("schema_name"))
+    with request_phase("session"):
+        db = get_db_for_org(org_id, user.get("schema_name"))
 
     try:
         repository = NfcRepository(db)
@@ -281,7 +468,8 @@ def replace_nfc_tag(
             new_tag_id=payload.new_tag_id,
         )
 
-        return NFCReplaceResponse(**result)
+        with request_phase("serialization"):
+            return build_response(NFCReplaceResponse, result)
 
     finally:
         db.close()
@@ -12,7 +12,7 @@ Description:
     Provides data validation and OpenAPI documentation generation.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 from uuid import UUID
@@ -86,7 +86,40 @@ class NFCListResponse(BaseModel):
     next_cursor: Optional[str]
 
 
+class NFCChangeResponse(NFCGetResponse):
+    updated_at: Optional[str] = None
+    change_seq: int
+
+
+class NFCChangesResponse(BaseModel):
+    items: List[NFCChangeResponse]
+    next_since: int
+    has_more: bool
+
+
 class NFCStatsResponse(BaseModel):
     total: int
     active: int
     inactive: int
+
+
+class NFCSnapshotResponse(BaseModel):
+    organization_id: str
+    version: int
+    generated_at: str
+    tags: Dict[str, str]
+
+
+class NFCSnapshotChangesResponse(BaseModel):
+    organization_id: str
+    since: int
+    version: int
+    has_more: bool
+    upserts: Dict[str, str]
+    removals: List[str]
+
+
+class NFCSnapshotKeyResponse(BaseModel):
+    key_id: str
+    algorithm: str
+    public_key: str
@@ -12,6 +12,6 @@ Description:
 """
 # Development Team: Muhammad Faizan, Roozbeh Kouchaki, Fatemehalsadat Sabaghjafari, Dipika Bhandari
 
-from app.nfc.services.nfc_service import NfcService
+from app.nfc.services.nfc_service import NfcService, reject_unknown_tag
 
-__all__ = ["NfcService"]
+__all__ = ["NfcService", "reject_unknown_tag"]
@@ -10,47 +10,69 @@ Developers:
 Description:
     Core business logic for NFC tag operations including assignment, deactivation,
     reactivation, replacement, and retrieval. Integrates with metrics collection.
+    Tag and stats reads go through single-flight coalescing, so concurrent
+    identical reads in the same tenant share one query. Once get_etag has
+    read the tenant's tag version, reads only coalesce with reads that saw
+    the same version, so a response never pairs an ETag with an older body.
 """
 
+from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import HTTPException
 
-from app.nfc.repositories import NfcRepository
+from app.config import config
+from app.nfc.repositories import ActiveTagConflictError, NfcRepository, TagRecord
+from app.nfc.responses import make_etag
+from app.nfc.services.singleflight import tag_reads
+from app.nfc.tag_filter import tag_filters
 from app.observability.metrics import nfc_metrics
+from app.observability.phases import request_phase
+
+
+def reject_unknown_tag(schema_name: Optional[str], tag_id: str):
+    """Answer 404 before any database work when the tag filter rules the tag out."""
+    if not tag_filters.might_contain(schema_name, tag_id):
+        raise HTTPException(404, "NFC tag not found")
 
 
 class NfcService:
     def __init__(self, repository: NfcRepository, event_publisher):
         self._repository = repository
         self._publish_event = event_publisher
-
-    def _serialize_timestamp(self, value):
-        if value is None:
-            return None
-        if hasattr(value, "isoformat"):
-            return value.isoformat()
-        return str(value)
+        # Tag version behind this request's ETag, part of the single-flight keys.
+        self._version = None
+
+    def _get_tag(self, tag_id: str):
+        # resolve and get share the query, so they share in-flight reads too.
+        return tag_reads.do(
+            "get_tag",
+            (self._repository.schema_name, tag_id, self._version),
+            lambda: self._repository.get_tag(tag_id),
+        )
 
     def resolve_tag(self, organization_id: str, tag_id: str) -> dict:
         with nfc_metrics.track_operation("resolve"):
-            result = self._repository.get_tag(tag_id)
+            with request_phase("repository"):
+                result = self._get_tag(tag_id)
 
             if not result:
+                tag_filters.record_false_positive(self._repository.schema_name)
                 raise HTTPException(404, "NFC tag not found")
 
             if result.status != "active":
                 raise HTTPException(403, "NFC tag is not active")
 
-            self._publish_event(
-                routing_key="nfc.resolved",
-                payload={
-                    "event": "nfc.resolved",
-                    "tag_id": tag_id,
-                    "patient_id": str(result.patient_id),
-                    "organization_id": organization_id,
-                },
-            )
+            with request_phase("publish"):
+                self._publish_event(
+                    routing_key="nfc.resolved",
+                    payload={
+                        "event": "nfc.resolved",
+                        "tag_id": tag_id,
+                        "patient_id": str(result.patient_id),
+                        "organization_id": organization_id,
+                    },
+                )
 
             return {
                 "patient_id": str(result.patient_id),
@@ -65,29 +87,32 @@ class NfcService:
         patient_id,
     ) -> dict:
         with nfc_metrics.track_operation("assign"):
-            patient = self._repository.get_patient(patient_id)
+            try:
+                with request_phase("repository"):
+                    outcome = self._repository.assign_tag(tag_id, patient_id)
+            except ActiveTagConflictError:
+                outcome = "conflict"
 
-            if not patient:
+            if outcome == "patient_not_found":
                 raise HTTPException(404, "Patient not found")
 
-            existing_tag = self._repository.get_active_tag_for_patient(patient_id)
-
-            if existing_tag and existing_tag.tag_id != tag_id:
+            if outcome == "conflict":
                 raise HTTPException(409, "Patient already has an active NFC tag")
 
-            self._repository.upsert_tag(tag_id, patient_id)
-            self._repository.commit()
-
-            self._publish_event(
-                routing_key="nfc.assigned",
-                payload={
-                    "event": "nfc.assigned",
-                    "tag_id": tag_id,
-                    "patient_id": str(patient_id),
-                    "organization_id": organization_id,
-                    "assigned_by": user_id,
-                },
-            )
+            with request_phase("repository"):
+                self._repository.commit()
+
+            with request_phase("publish"):
+                self._publish_event(
+                    routing_key="nfc.assigned",
+                    payload={
+                        "event": "nfc.assigned",
+                        "tag_id": tag_id,
+                        "patient_id": str(patient_id),
+                        "organization_id": organization_id,
+                        "assigned_by": user_id,
+                    },
+                )
 
             return {
                 "tag_id": tag_id,
@@ -98,14 +123,15 @@ class NfcService:
 
     def deactivate_tag(self, organization_id: str, tag_id: str) -> dict:
         with nfc_metrics.track_operation("deactivate"):
-            result = self._repository.get_tag(tag_id)
+            with request_phase("repository"):
+                result = self._repository.transition_tag_to_inactive(tag_id)
 
             if not result:
                 raise HTTPException(404, "NFC tag not found")
 
-            if result.status != "inactive":
-                self._repository.deactivate_tag(tag_id)
-                self._repository.commit()
+            if result.changed:
+                with request_phase("repository"):
+                    self._repository.commit()
 
             return {
                 "tag_id": tag_id,
@@ -115,14 +141,18 @@ class NfcService:
 
     def reactivate_tag(self, organization_id: str, tag_id: str) -> dict:
         with nfc_metrics.track_operation("reactivate"):
-            result = self._repository.get_tag(tag_id)
+            try:
+                with request_phase("repository"):
+                    result = self._repository.transition_tag_to_active(tag_id)
+            except ActiveTagConflictError:
+                raise HTTPException(409, "Patient already has an active NFC tag")
 
             if not result:
                 raise HTTPException(404, "NFC tag not found")
 
-            if result.status != "active":
-                self._repository.reactivate_tag(tag_id)
-                self._repository.commit()
+            if result.changed:
+                with request_phase("repository"):
+                    self._repository.commit()
 
             return {
                 "tag_id": tag_id,
@@ -140,59 +170,62 @@ class NfcService:
             if old_tag_id == new_tag_id:
                 raise HTTPException(400, "Old and new tag IDs must differ")
 
-            old_tag = self._repository.get_tag(old_tag_id)
+            try:
+                with request_phase("repository"):
+                    result = self._repository.replace_tag(old_tag_id, new_tag_id)
+            except ActiveTagConflictError:
+                raise HTTPException(409, "Patient already has an active NFC tag")
 
-            if not old_tag:
+            if not result:
                 raise HTTPException(404, "NFC tag not found")
 
-            new_tag = self._repository.get_tag(new_tag_id)
-
-            if new_tag and str(new_tag.patient_id) != str(old_tag.patient_id):
+            if result.conflict:
                 raise HTTPException(409, "New tag is assigned to a different patient")
 
-            self._repository.upsert_tag(new_tag_id, old_tag.patient_id)
-            if old_tag.status != "inactive":
-                self._repository.deactivate_tag(old_tag_id)
-            self._repository.commit()
+            with request_phase("repository"):
+                self._repository.commit()
 
             return {
                 "old_tag_id": old_tag_id,
                 "new_tag_id": new_tag_id,
-                "patient_id": old_tag.patient_id,
+                "patient_id": result.patient_id,
                 "organization_id": organization_id,
                 "status": "active",
             }
 
+    def get_etag(self) -> Optional[str]:
+        """ETag shared by the tenant's tag reads, or None when unavailable."""
+        if not config.ETAGS_ENABLED:
+            return None
+        with request_phase("repository"):
+            version = self._repository.get_change_version()
+        if version is None:
+            return None
+        self._version = version
+        return make_etag(self._repository.schema_name, version)
+
     def get_tag(self, organization_id: str, tag_id: str) -> dict:
         with nfc_metrics.track_operation("read"):
-            result = self._repository.get_tag(tag_id)
+            with request_phase("repository"):
+                result = self._get_tag(tag_id)
 
             if not result:
                 raise HTTPException(404, "NFC tag not found")
 
-            return {
-                "tag_id": result.tag_id,
-                "patient_id": str(result.patient_id),
-                "organization_id": organization_id,
-                "status": result.status,
-                "issued_at": self._serialize_timestamp(result.issued_at),
-                "deactivated_at": self._serialize_timestamp(result.deactivated_at),
-            }
+            return result.to_wire(organization_id)
 
     def get_tag_by_patient(self, organization_id: str, patient_id) -> dict:
-        result = self._repository.get_tag_for_patient(patient_id)
+        with request_phase("repository"):
+            result = tag_reads.do(
+                "get_tag_for_patient",
+                (self._repository.schema_name, str(patient_id), self._version),
+                lambda: self._repository.get_tag_for_patient(patient_id),
+            )
 
         if not result:
             raise HTTPException(404, "NFC tag not found")
 
-        return {
-            "tag_id": result.tag_id,
-            "patient_id": str(result.patient_id),
-            "organization_id": organization_id,
-            "status": result.status,
-            "issued_at": self._serialize_timestamp(result.issued_at),
-            "deactivated_at": self._serialize_timestamp(result.deactivated_at),
-        }
+        return result.to_wire(organization_id)
 
     def get_all_tags(
         self,
@@ -210,26 +243,17 @@ class NfcService:
             normalized_search = None
 
         fetch_limit = limit + 1
-        results = self._repository.get_all_tags(
-            limit=fetch_limit,
-            cursor=cursor,
-            status=status,
-            search=normalized_search,
-        )
+        with request_phase("repository"):
+            results = self._repository.get_all_tags(
+                limit=fetch_limit,
+                cursor=cursor,
+                status=status,
+                search=normalized_search,
+            )
 
         has_more = len(results) > limit
         trimmed = results[:limit]
-        items = [
-            {
-                "tag_id": row.tag_id,
-                "patient_id": str(row.patient_id),
-                "organization_id": organization_id,
-                "status": row.status,
-                "issued_at": self._serialize_timestamp(row.issued_at),
-                "deactivated_at": self._serialize_timestamp(row.deactivated_at),
-            }
-            for row in trimmed
-        ]
+        items = [record.to_wire(organization_id) for record in trimmed]
         next_cursor = trimmed[-1].tag_id if has_more and trimmed else None
 
         return {
@@ -237,8 +261,78 @@ class NfcService:
             "next_cursor": next_cursor,
         }
 
+    def get_changes(self, organization_id: str, since: int, limit: int) -> dict:
+        """
+        Tags changed after change sequence ``since``, oldest change first.
+
+        Each tag appears once, in its current state. ``next_since`` is the
+        keyset cursor for the following page; a consumer stores it and
+        resumes from it on the next poll.
+        """
+        with request_phase("repository"):
+            rows = self._repository.get_tag_changes_since(since, limit + 1)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        items = [
+            TagRecord(*row[:5]).to_change(organization_id, row.updated_at, row.change_seq)
+            for row in rows
+        ]
+
+        return {
+            "items": items,
+            "next_since": rows[-1].change_seq if rows else since,
+            "has_more": has_more,
+        }
+
+    def get_snapshot(self, organization_id: str) -> dict:
+        with request_phase("repository"):
+            version, tags = self._repository.get_active_tag_snapshot()
+
+        return {
+            "organization_id": organization_id,
+            "version": version,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "tags": {tag_id: str(patient_id) for tag_id, patient_id in tags},
+        }
+
+    def get_snapshot_changes(self, organization_id: str, since: int, limit: int) -> dict:
+        """
+        Changes a device holding snapshot version ``since`` must apply.
+
+        Active tags are returned as upserts and inactive ones as removals.
+        Every tag appears at most once, with its latest state; the returned
+        version is where the next call should resume.
+        """
+        with request_phase("repository"):
+            rows = self._repository.get_tag_changes_since(since, limit + 1)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        upserts = {}
+        removals = []
+        for row in rows:
+            if row.status == "active":
+                upserts[row.tag_id] = str(row.patient_id)
+            else:
+                removals.append(row.tag_id)
+
+        return {
+            "organization_id": organization_id,
+            "since": since,
+            "version": rows[-1].change_seq if rows else since,
+            "has_more": has_more,
+            "upserts": upserts,
+            "removals": removals,
+        }
+
     def get_stats(self) -> dict:
-        stats = self._repository.get_stats()
+        with request_phase("repository"):
+            stats = tag_reads.do(
+                "get_stats",
+                (self._repository.schema_name, self._version),
+                self._repository.get_stats,
+            )
         return {
             "total": int(stats.total or 0),
             "active": int(stats.active or 0),
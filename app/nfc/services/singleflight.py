@@ -0,0 +1,94 @@
+"""
+Single-Flight Read Coalescing
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Lets concurrent identical reads share one database query. The first
+    request for a key (operation, tenant schema, lookup value) runs the
+    query; requests for the same key that arrive while it is in flight wait
+    for it and receive the same result, or the same exception. Nothing is
+    cached: once the query returns the key is released and the next request
+    queries again. A waiter may therefore see a result whose query started
+    shortly before its own request, the usual trade-off of coalescing;
+    callers that pair the result with a version put it in the key.
+
+    A statement or lock timeout is not shared: it ran out of the leader's
+    deadline, and a waiter may have a longer one, so each waiter then runs
+    its own load. Other errors reach every waiter.
+    Handlers run on the threadpool, so waiters block on a threading.Event.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+from app.config import config
+from app.observability.metrics import singleflight_reads_counter
+from app.traffic.deadlines import is_deadline_error
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, operation: str, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Run ``load()`` once for all concurrent callers with the same key.
+
+        Args:
+            operation: Operation name, part of the key and the metric label
+            key: Identifies the read within the operation, including the
+                tenant schema
+            load: Performs the read; only called by the first caller
+        """
+        if not config.SINGLEFLIGHT_ENABLED:
+            return load()
+
+        flight_key = (operation, key)
+        with self._lock:
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+
+        singleflight_reads_counter.add(
+            1,
+            attributes={"operation": operation, "coalesced": str(not leader).lower()},
+        )
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                if is_deadline_error(call.error):
+                    return load()
+                raise call.error
+            return call.result
+
+        try:
+            call.result = load()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+
+
+# Shared by the per-request NfcService instances.
+tag_reads = SingleFlight()
@@ -0,0 +1,115 @@
+"""
+Signed Resolution Snapshots
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Renders the offline resolution snapshot and its delta pages for
+    caregiver devices. A body is compact JSON signed with Ed25519 over the
+    exact uncompressed bytes; the base64 signature and the signing key id
+    travel in the X-Snapshot-Signature and X-Snapshot-Key-Id headers, so
+    devices can keep the body and verify it again before resolving offline.
+    The body is gzip-compressed (Content-Encoding: gzip) when the client
+    accepts it; HTTP clients undo that transparently, leaving the signed
+    bytes.
+
+    SNAPSHOT_SIGNING_KEY holds the base64 32-byte Ed25519 private key. All
+    replicas must share it; devices get the public key from
+    /nfc/snapshot/key or out of band. Without a key the snapshot endpoints
+    answer 503.
+"""
+
+import base64
+import gzip
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+import orjson
+from fastapi import HTTPException, Response, status
+
+from app.config import config
+
+SIGNATURE_ALGORITHM = "Ed25519"
+
+# Level 6 is gzip's default; higher levels shrink tag maps very little more.
+COMPRESSION_LEVEL = 6
+# The body depends on Accept-Encoding, so 304s for it must say so as well.
+VARY_HEADERS = {"Vary": "Accept-Encoding"}
+
+
+class SnapshotSigner:
+    def __init__(self, private_key_b64: str):
+        # Imported here: only the snapshot endpoints need it.
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+        self._private_key = Ed25519PrivateKey.from_private_bytes(base64.b64decode(private_key_b64))
+        self.public_key = self._private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+        self.key_id = hashlib.sha256(self.public_key).hexdigest()[:16]
+
+    def sign(self, body: bytes) -> str:
+        return base64.b64encode(self._private_key.sign(body)).decode("ascii")
+
+
+@lru_cache(maxsize=4)
+def _signer_for(private_key_b64: str) -> SnapshotSigner:
+    return SnapshotSigner(private_key_b64)
+
+
+def get_signer() -> SnapshotSigner:
+    if not config.SNAPSHOT_SIGNING_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Snapshot signing is not configured",
+        )
+    return _signer_for(config.SNAPSHOT_SIGNING_KEY)
+
+
+def public_key_info() -> dict:
+    signer = get_signer()
+    return {
+        "key_id": signer.key_id,
+        "algorithm": SIGNATURE_ALGORITHM,
+        "public_key": base64.b64encode(signer.public_key).decode("ascii"),
+    }
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def signed_response(
+    payload: dict,
+    accept_encoding: Optional[str],
+    headers: Optional[dict] = None,
+) -> Response:
+    """
+    Sign ``payload`` and return it, compressed if the client accepts gzip.
+
+    Args:
+        payload: Snapshot or delta page from NfcService
+        accept_encoding: The request's Accept-Encoding header
+        headers: Extra response headers, e.g. from cache_headers()
+    """
+    signer = get_signer()
+    body = orjson.dumps(payload)
+    response_headers = {
+        "X-Snapshot-Signature": signer.sign(body),
+        "X-Snapshot-Key-Id": signer.key_id,
+        "X-Snapshot-Version": str(payload["version"]),
+        **VARY_HEADERS,
+        **(headers or {}),
+    }
+    if _accepts_gzip(accept_encoding):
+        body = gzip.compress(body, compresslevel=COMPRESSION_LEVEL, mtime=0)
+        response_headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=response_headers)
@@ -0,0 +1,230 @@
+"""
+Negative Lookup Filter for Tag IDs
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Per-tenant Bloom filter of every tag ID in nfc_tags, used by /nfc/resolve
+    to answer 404 for tag IDs that certainly do not exist without opening a
+    session or querying PostgreSQL. A Bloom filter can only say "definitely
+    absent" or "maybe present"; maybe-present IDs go to the database as
+    before. Tags are deactivated rather than deleted, so the filter never
+    needs deletes and a cuckoo filter would buy nothing.
+
+    The warm-up loads a filter for each tenant. Writes made by this process
+    add their tag IDs right away (NfcRepository calls add()); tags written by
+    other replicas are picked up by a background refresh that reads the tags
+    with a change_seq above the last one it saw, so for up to
+    TAG_FILTER_REFRESH_SECONDS another replica's new tag can be rejected
+    here. Tag writes commit in change_seq order, so none is skipped. Outside
+    PostgreSQL there is no change_seq and each refresh rebuilds the filter.
+    A filter that has grown past its capacity is rebuilt too. Tenants
+    without a filter are never rejected.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+from typing import Optional
+
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from app.config import config
+from app.db import session
+from app.observability.telemetry import get_meter
+
+logger = logging.getLogger(__name__)
+
+meter = get_meter("nfc-service.tag-filter")
+
+tag_filter_rejections_counter = meter.create_counter(
+    name="nfc_tag_filter_rejections_total",
+    description="Resolve requests rejected by the tag filter without a database query",
+    unit="1",
+)
+
+tag_filter_false_positives_counter = meter.create_counter(
+    name="nfc_tag_filter_false_positives_total",
+    description="Tag IDs the filter let through that the database did not know",
+    unit="1",
+)
+
+# Smallest filter built for a tenant, so small tenants can grow in place.
+MIN_CAPACITY = 10_000
+
+
+class BloomFilter:
+    __slots__ = ("capacity", "size", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, fpp: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-self.capacity * math.log(fpp) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        # Re-adding a known key sets no new bit, so count approximates the
+        # number of distinct keys (refreshes re-add updated tags).
+        if added:
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def estimated_fpp(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class _TenantFilter:
+    __slots__ = ("bloom", "synced_seq")
+
+    def __init__(self, bloom: BloomFilter, synced_seq: Optional[int]):
+        self.bloom = bloom
+        self.synced_seq = synced_seq
+
+
+class TenantTagFilters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filters: dict[str, _TenantFilter] = {}
+        self._building: dict[str, BloomFilter] = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def might_contain(self, schema_name: Optional[str], tag_id: str) -> bool:
+        tenant = self._filters.get(schema_name) if config.TAG_FILTER_ENABLED else None
+        if tenant is None:
+            return True
+        if tag_id in tenant.bloom:
+            return True
+        tag_filter_rejections_counter.add(1)
+        return False
+
+    def record_false_positive(self, schema_name: Optional[str]):
+        """Count a tag the filter let through but the database did not find."""
+        if schema_name in self._filters:
+            tag_filter_false_positives_counter.add(1)
+
+    def add(self, schema_name: Optional[str], tag_id: str):
+        with self._lock:
+            tenant = self._filters.get(schema_name)
+            if tenant is not None:
+                tenant.bloom.add(tag_id)
+            building = self._building.get(schema_name)
+            if building is not None:
+                building.add(tag_id)
+
+    def load(self, schema_name: str, repository):
+        """Build the tenant's filter from all of its tag IDs."""
+        # Read first: tags written after it are left to the next refresh.
+        synced_seq = repository.get_change_version()
+        tag_count = repository.count_tags()
+        bloom = BloomFilter(max(MIN_CAPACITY, 2 * tag_count), config.TAG_FILTER_FPP)
+        with self._lock:
+            self._building[schema_name] = bloom
+        try:
+            for tag_id in repository.iter_tag_ids():
+                # add() writes to the same bloom under the lock; its bit
+                # updates are not atomic, so neither are ours without it.
+                with self._lock:
+                    bloom.add(tag_id)
+            with self._lock:
+                self._filters[schema_name] = _TenantFilter(bloom, synced_seq)
+        finally:
+            with self._lock:
+                self._building.pop(schema_name, None)
+
+    def refresh(self, schema_name: str, repository):
+        """Add tags written since the last refresh; rebuild a full filter."""
+        tenant = self._filters.get(schema_name)
+        if (
+            tenant is None
+            or tenant.synced_seq is None
+            or tenant.bloom.count > tenant.bloom.capacity
+        ):
+            self.load(schema_name, repository)
+            return
+
+        synced_seq = tenant.synced_seq
+        for tag_id, change_seq in repository.get_tag_ids_changed_since(synced_seq):
+            with self._lock:
+                tenant.bloom.add(tag_id)
+            synced_seq = max(synced_seq, change_seq)
+        tenant.synced_seq = synced_seq
+
+    def load_all(self, schema_names: dict[str, str]):
+        """
+        Load a filter for every tenant.
+
+        Args:
+            schema_names: Organization id -> schema name
+        """
+        self._for_each_tenant(schema_names, self.load)
+
+    def start_refresh(self):
+        """Refresh the filters in the background, loading tenants seen later."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop,
+            name="tag-filter-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(config.TAG_FILTER_REFRESH_SECONDS):
+            self._for_each_tenant(session.cached_schema_names(), self.refresh)
+
+    def _for_each_tenant(self, schema_names: dict[str, str], update):
+        # Imported here: the repository imports this module to record writes.
+        from app.nfc.repositories import NfcRepository
+
+        for organization_id, schema_name in schema_names.items():
+            db = session.get_db_for_org(organization_id, schema_name)
+            try:
+                update(schema_name, NfcRepository(db))
+            except Exception as exc:
+                # Leave the tenant's previous filter (or none) in place.
+                logger.warning(f"Tag filter update for {schema_name} failed: {exc}")
+            finally:
+                db.close()
+
+    def _observe_fpp(self, options: CallbackOptions):
+        return [
+            Observation(tenant.bloom.estimated_fpp(), {"schema": schema_name})
+            for schema_name, tenant in list(self._filters.items())
+        ]
+
+
+tag_filters = TenantTagFilters()
+
+meter.create_observable_gauge(
+    name="nfc_tag_filter_estimated_fpp",
+    callbacks=[tag_filters._observe_fpp],
+    description="Estimated false-positive rate of each tenant's tag filter",
+    unit="1",
+)
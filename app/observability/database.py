@@ -9,17 +9,48 @@ Developers:
 
 Description:
     Database instrumentation for OpenTelemetry tracing.
-    Provides automatic tracing for SQLAlchemy database operations.
+    Provides automatic tracing for SQLAlchemy database operations and
+    connection pool metrics (usage gauges, checkout wait, exhaustion).
 """
 
 import logging
 from sqlalchemy import Engine, event
 from sqlalchemy.engine import Connection
 from opentelemetry import trace
+from opentelemetry.metrics import CallbackOptions, Observation
 from opentelemetry.trace import Status, StatusCode
 
+from app.observability.telemetry import get_meter
+
 logger = logging.getLogger(__name__)
 
+# Create meter for database metrics
+meter = get_meter("nfc-service.db")
+
+pool_checkout_wait_histogram = meter.create_histogram(
+    name="nfc_db_pool_checkout_wait_ms",
+    description="Time spent waiting for a pooled database connection in milliseconds",
+    unit="ms",
+)
+
+pool_pings_counter = meter.create_counter(
+    name="nfc_db_pool_pings_total",
+    description="Liveness pings issued for connections idle past the threshold",
+    unit="1",
+)
+
+pool_stale_connections_counter = meter.create_counter(
+    name="nfc_db_pool_stale_connections_total",
+    description="Dead connections detected by a liveness ping or on the error path",
+    unit="1",
+)
+
+pool_exhausted_counter = meter.create_counter(
+    name="nfc_db_pool_exhausted_total",
+    description="Connection checkouts that found the pool exhausted and had to wait",
+    unit="1",
+)
+
 
 def instrument_database(engine: Engine):
     """
@@ -35,6 +66,10 @@ def instrument_database(engine: Engine):
     @event.listens_for(engine, "before_cursor_execute")
     def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         """Start span before query execution."""
+        # app.db.session may have prepended the tenant search_path and
+        # deadline to the statement sent; describe the query itself.
+        statement = getattr(context, "statement", None) or statement
+        
         # Store span in context
         span = tracer.start_span(
             name="db.query",
@@ -78,6 +113,45 @@ def instrument_database(engine: Engine):
     logger.info("Database instrumentation configured successfully")
 
 
+def instrument_pool(engine: Engine):
+    """
+    Export connection pool usage of an engine as observable gauges.
+    
+    Args:
+        engine: SQLAlchemy engine whose pool is observed
+    """
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        logger.info("Connection pool %s does not report usage", type(pool).__name__)
+        return
+    
+    def _observe(value):
+        def callback(_options: CallbackOptions):
+            return [Observation(value())]
+        return callback
+    
+    meter.create_observable_gauge(
+        name="nfc_db_pool_checked_out",
+        callbacks=[_observe(pool.checkedout)],
+        description="Database connections currently checked out of the pool",
+        unit="1",
+    )
+    meter.create_observable_gauge(
+        name="nfc_db_pool_overflow",
+        callbacks=[_observe(lambda: max(0, pool.overflow()))],
+        description="Database connections open beyond the configured pool size",
+        unit="1",
+    )
+    meter.create_observable_gauge(
+        name="nfc_db_pool_idle",
+        callbacks=[_observe(pool.checkedin)],
+        description="Idle database connections held by the pool",
+        unit="1",
+    )
+    
+    logger.info("Connection pool instrumentation configured successfully")
+
+
 def _extract_operation(statement: str) -> str:
     """
     Extract SQL operation type from statement.
@@ -50,6 +50,14 @@ nfc_active_connections = meter.create_up_down_counter(
     unit="1",
 )
 
+# Reads served through the single-flight layer; coalesced="true" marks
+# requests that shared another request's in-flight query.
+singleflight_reads_counter = meter.create_counter(
+    name="nfc_singleflight_reads_total",
+    description="Reads routed through single-flight coalescing",
+    unit="1",
+)
+
 
 class NFCMetrics:
     """
@@ -23,6 +23,8 @@ from starlette.routing import Match
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
+from app.config import config
+from app.observability.phases import begin_request_phases, end_request_phases
 from app.observability.telemetry import get_meter
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,8 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
     Captures:
     - Request spans with detailed attributes
     - HTTP metrics (request count, duration)
+    - Per-phase durations (see app.observability.phases), optionally
+      returned as a Server-Timing header
     - Error tracking and status codes
     """
     
@@ -65,8 +69,8 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
         Returns:
             HTTP response
         """
-        # Skip telemetry for health checks to reduce noise
-        if request.url.path == "/health":
+        # Skip telemetry for health and readiness checks to reduce noise
+        if request.url.path in ("/health", "/ready"):
             return await call_next(request)
         
         # Extract route pattern for metrics
@@ -79,6 +83,9 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
         # Create span for request
         tracer = trace.get_tracer(__name__)
         
+        # Collect phase timings from the request path
+        phases, phases_token = begin_request_phases()
+        
         with tracer.start_as_current_span(
             f"{http_method} {http_route}",
             kind=trace.SpanKind.SERVER,
@@ -127,6 +134,10 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
                 # Record duration histogram
                 http_duration_histogram.record(duration_ms, attributes=metric_labels)
                 
+                phases.record(http_route)
+                if config.SERVER_TIMING_ENABLED:
+                    response.headers["Server-Timing"] = phases.server_timing(duration_ms)
+                
                 return response
                 
             except Exception as e:
@@ -148,6 +159,7 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
                 
                 http_requests_counter.add(1, attributes=metric_labels)
                 http_duration_histogram.record(duration_ms, attributes=metric_labels)
+                phases.record(http_route)
                 
                 logger.error(
                     f"Error processing request {http_method} {http_route}: {e}",
@@ -156,6 +168,9 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
                 
                 # Re-raise the exception
                 raise
+            
+            finally:
+                end_request_phases(phases_token)
     
     def _get_route_pattern(self, request: Request) -> str:
         """
@@ -0,0 +1,104 @@
+"""
+Request Phase Timing
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Breaks a request down into named phases (auth, session, repository,
+    publish, serialization). The telemetry middleware opens a collector per
+    request; code along the request path wraps its work in request_phase(),
+    which adds a span event to the active span and accumulates the duration.
+    When the request finishes the per-phase totals are recorded on the
+    nfc_request_phase_duration_ms histogram and can be returned to the
+    client as a Server-Timing header. Outside a request (e.g. in the event
+    consumer) request_phase() does nothing. The tenant search_path is sent
+    with the first query, so pool checkout and search_path cost are part of
+    the first repository phase rather than the session phase.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from opentelemetry import trace
+
+from app.observability.telemetry import get_meter
+
+meter = get_meter("nfc-service.http")
+
+request_phase_duration_histogram = meter.create_histogram(
+    name="nfc_request_phase_duration_ms",
+    description="Duration of request phases in milliseconds",
+    unit="ms",
+)
+
+
+class RequestPhases:
+    """Accumulated phase durations for one request, in first-seen order."""
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+
+    def add(self, name: str, duration_ms: float):
+        self.durations[name] = self.durations.get(name, 0.0) + duration_ms
+
+    def record(self, http_route: str):
+        for name, duration_ms in self.durations.items():
+            request_phase_duration_histogram.record(
+                duration_ms,
+                attributes={"phase": name, "http_route": http_route},
+            )
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        entries = [f"{name};dur={duration_ms:.2f}" for name, duration_ms in self.durations.items()]
+        if total_ms is not None:
+            entries.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(entries)
+
+
+_current_phases: ContextVar[Optional[RequestPhases]] = ContextVar(
+    "nfc_request_phases",
+    default=None,
+)
+
+
+def begin_request_phases() -> tuple[RequestPhases, Token]:
+    phases = RequestPhases()
+    return phases, _current_phases.set(phases)
+
+
+def end_request_phases(token: Token):
+    _current_phases.reset(token)
+
+
+@contextmanager
+def request_phase(name: str):
+    """
+    Time a phase of the current request.
+
+    Args:
+        name: Phase name used for the span event, metric label and
+            Server-Timing entry
+    """
+    phases = _current_phases.get()
+    if phases is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        phases.add(name, duration_ms)
+        trace.get_current_span().add_event(
+            f"phase.{name}",
+            attributes={"phase": name, "duration_ms": duration_ms},
+        )
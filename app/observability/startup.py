@@ -0,0 +1,57 @@
+"""
+Startup Report
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Times the steps of a pod's cold start: the import groups of app.main,
+    the synchronous init steps and the background warm-up steps. The report
+    is logged as one structured "Startup report" line just before the
+    service reports ready. Uses only the standard
+    library so importing it does not itself add to startup time.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Step durations in milliseconds, in the order the steps ran."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.steps_ms: dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        Time a startup step.
+
+        Args:
+            name: Step name, prefixed by kind (import., init., startup., warmup.)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def as_dict(self) -> dict:
+        return {
+            "steps_ms": dict(self.steps_ms),
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 1),
+        }
+
+    def emit(self):
+        logger.info("Startup report", extra={"startup": self.as_dict()})
+
+
+# Created when app.main starts importing, so elapsed_ms covers the imports.
+startup_report = StartupReport()
@@ -3,35 +3,46 @@ OpenTelemetry telemetry initialization for the NFC service.
 
 This module sets up distributed tracing, metrics collection, and structured logging
 with automatic export to the observability stack via OTLP.
+
+The SDK and the OTLP gRPC exporters are imported inside init_telemetry()
+rather than at module import: they are the heaviest part of the import
+graph and the service initializes them in the background after startup.
+Tracers and meters obtained earlier are API proxies that switch over to
+the SDK providers once they are set.
 """
 
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from opentelemetry import trace, metrics
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.sdk.resources import Resource, SERVICE_NAME, SERVICE_VERSION, SERVICE_NAMESPACE
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
 
 logger = logging.getLogger(__name__)
 
 # Global telemetry providers
-_tracer_provider: Optional[TracerProvider] = None
-_meter_provider: Optional[MeterProvider] = None
+_tracer_provider: Optional["TracerProvider"] = None
+_meter_provider: Optional["MeterProvider"] = None
 
 
-def get_resource() -> Resource:
+def get_resource() -> "Resource":
     """
     Create OpenTelemetry resource with service identification attributes.
     
     Returns:
         Resource object with service metadata
     """
+    from opentelemetry.sdk.resources import (
+        SERVICE_NAME,
+        SERVICE_NAMESPACE,
+        SERVICE_VERSION,
+        Resource,
+    )
+    
     service_name = os.getenv("OTEL_SERVICE_NAME", "nfc-service")
     service_version = os.getenv("SERVICE_VERSION", "1.0.0")
     service_namespace = os.getenv("SERVICE_NAMESPACE", "wailsalutem")
@@ -70,6 +81,13 @@ def init_telemetry() -> bool:
     global _tracer_provider, _meter_provider
     
     try:
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        
         # Get OTLP endpoint from environment
         otlp_endpoint = os.getenv(
             "OTEL_EXPORTER_OTLP_ENDPOINT",
@@ -0,0 +1,32 @@
+"""
+Traffic Control Module
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Decides which /nfc requests are admitted, so one tenant or one kind of
+    traffic cannot exhaust the threadpool and database pool shared by all.
+"""
+
+from app.traffic.admission import OrganizationAdmission, admit_organization
+from app.traffic.deadlines import apply_deadline, current_deadline, deadline_exceeded_handler
+from app.traffic.lanes import PriorityLanes, admin_lane, configure_threadpool, resolve_lane
+from app.traffic.shedding import LoadShedder, shed_load
+
+__all__ = [
+    "OrganizationAdmission",
+    "admit_organization",
+    "apply_deadline",
+    "current_deadline",
+    "deadline_exceeded_handler",
+    "PriorityLanes",
+    "admin_lane",
+    "configure_threadpool",
+    "resolve_lane",
+    "LoadShedder",
+    "shed_load",
+]
@@ -0,0 +1,129 @@
+"""
+Per-Organization Admission Control
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Router dependency that limits each organization (the JWT organization_id)
+    to a sustained request rate, through a token bucket with a burst
+    allowance, and to a number of requests in flight at once. A request over
+    either limit is answered with 429 and a Retry-After header. The
+    dependency is async, so it runs on the event loop: a throttled request
+    never occupies a threadpool thread or a database connection, and the
+    bookkeeping needs no lock.
+"""
+
+import math
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+
+from app.auth.dependencies import get_current_user
+from app.config import config
+from app.observability.telemetry import get_meter
+
+meter = get_meter("nfc-service.admission")
+
+admission_decisions_counter = meter.create_counter(
+    name="nfc_admission_decisions_total",
+    description="Admission decisions for /nfc requests per organization",
+    unit="1",
+)
+
+admission_in_flight = meter.create_up_down_counter(
+    name="nfc_admission_in_flight",
+    description="Admitted /nfc requests in flight per organization",
+    unit="1",
+)
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """Take a token; return 0 on success, else seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class OrganizationAdmission:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def try_admit(self, organization_id: str) -> Optional[tuple[str, float]]:
+        """
+        Admit a request or say why not.
+
+        Returns:
+            None when admitted (release() must follow), otherwise the
+            rejection reason and the seconds to wait before retrying
+        """
+        if self._in_flight.get(organization_id, 0) >= config.ADMISSION_MAX_CONCURRENT:
+            return "concurrency_limited", 1.0
+
+        now = self._clock()
+        bucket = self._buckets.get(organization_id)
+        if bucket is None:
+            bucket = self._buckets[organization_id] = TokenBucket(
+                config.ADMISSION_RATE_PER_SECOND,
+                config.ADMISSION_BURST,
+                now,
+            )
+        wait = bucket.take(now)
+        if wait:
+            return "rate_limited", wait
+
+        self._in_flight[organization_id] = self._in_flight.get(organization_id, 0) + 1
+        return None
+
+    def release(self, organization_id: str):
+        self._in_flight[organization_id] -= 1
+
+    def in_flight(self, organization_id: str) -> int:
+        return self._in_flight.get(organization_id, 0)
+
+
+admission = OrganizationAdmission()
+
+
+async def admit_organization(user=Depends(get_current_user)):
+    if not config.ADMISSION_ENABLED:
+        yield
+        return
+
+    organization_id = user["organization_id"]
+    attributes = {"organization_id": organization_id}
+    rejection = admission.try_admit(organization_id)
+    if rejection is not None:
+        reason, retry_after = rejection
+        admission_decisions_counter.add(1, attributes={**attributes, "outcome": reason})
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests for this organization",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    admission_decisions_counter.add(1, attributes={**attributes, "outcome": "admitted"})
+    admission_in_flight.add(1, attributes=attributes)
+    try:
+        yield
+    finally:
+        admission.release(organization_id)
+        admission_in_flight.add(-1, attributes=attributes)
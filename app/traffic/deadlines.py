@@ -0,0 +1,123 @@
+"""
+Request Deadlines
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Gives every /nfc request a latency budget and enforces it in
+    PostgreSQL. The budget comes from DEADLINE_ROUTES_MS for the route (or
+    DEADLINE_DEFAULT_MS) and can be shortened, never extended, by the client
+    with the DEADLINE_HEADER header. The resulting deadline is kept in a
+    context variable; get_db_for_org stores it on the session and the
+    remaining time is set as the transaction's statement_timeout and
+    lock_timeout with the first statement of each transaction, so a query stuck behind a
+    lock (e.g. a bulk deactivate_all_tags) is cancelled by the server
+    instead of holding a worker thread indefinitely.
+
+    A cancelled statement surfaces as a DBAPIError. The exception handler
+    answers a lock timeout with 503 (contention, worth retrying) and a
+    statement timeout with 504, and counts both per route. Other database
+    errors are re-raised unchanged.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+
+from app.config import config
+from app.observability.telemetry import get_meter
+
+# PostgreSQL SQLSTATEs raised when statement_timeout / lock_timeout fire.
+QUERY_CANCELED = "57014"
+LOCK_NOT_AVAILABLE = "55P03"
+
+meter = get_meter("nfc-service.deadlines")
+
+deadline_exceeded_counter = meter.create_counter(
+    name="nfc_deadline_exceeded_total",
+    description="/nfc requests whose database work ran past the request deadline",
+    unit="1",
+)
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar(
+    "nfc_request_deadline",
+    default=None,
+)
+
+
+def current_deadline() -> Optional[float]:
+    """time.monotonic() deadline of the current request, if it has one."""
+    return _current_deadline.get()
+
+
+def budget_ms(route_path: str, requested_ms: Optional[str]) -> float:
+    """Latency budget for a route, shortened by a valid client-supplied budget."""
+    budget = config.get_route_deadlines_ms().get(route_path, config.DEADLINE_DEFAULT_MS)
+    if requested_ms:
+        try:
+            requested = float(requested_ms)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid {config.DEADLINE_HEADER} header",
+            )
+        if requested > 0:
+            budget = min(budget, requested)
+    return budget
+
+
+def _route_path(request: Request) -> str:
+    route = request.scope.get("route")
+    return route.path if route is not None else request.url.path
+
+
+async def apply_deadline(request: Request):
+    if not config.DEADLINES_ENABLED:
+        yield
+        return
+
+    budget = budget_ms(_route_path(request), request.headers.get(config.DEADLINE_HEADER))
+    token = _current_deadline.set(time.monotonic() + budget / 1000)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def _sqlstate(exc: DBAPIError) -> Optional[str]:
+    # psycopg2 calls it pgcode, psycopg 3 sqlstate.
+    return getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+
+
+def is_deadline_error(exc: BaseException) -> bool:
+    """Whether ``exc`` is a statement or lock timeout, i.e. ran out of budget."""
+    return isinstance(exc, DBAPIError) and _sqlstate(exc) in (QUERY_CANCELED, LOCK_NOT_AVAILABLE)
+
+
+async def deadline_exceeded_handler(request: Request, exc: DBAPIError):
+    sqlstate = _sqlstate(exc)
+    if sqlstate == LOCK_NOT_AVAILABLE:
+        kind, status_code, detail = (
+            "lock_timeout",
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Timed out waiting for a database lock, retry shortly",
+        )
+    elif sqlstate == QUERY_CANCELED:
+        kind, status_code, detail = (
+            "statement_timeout",
+            status.HTTP_504_GATEWAY_TIMEOUT,
+            "Request deadline exceeded",
+        )
+    else:
+        raise exc
+
+    deadline_exceeded_counter.add(1, attributes={"http_route": _route_path(request), "kind": kind})
+    return JSONResponse(status_code=status_code, content={"detail": detail})
@@ -0,0 +1,174 @@
+"""
+Priority Lanes
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Splits /nfc handlers into two execution lanes so bulk admin traffic
+    (lists, searches, stats, tag management) cannot hold every worker
+    thread and database connection while caregivers scan tags:
+
+    - resolve: POST /nfc/resolve, with LANE_RESOLVE_CAPACITY slots reserved
+      for it. When those are all busy it may borrow an idle admin slot, but
+      admin requests never borrow resolve slots.
+    - admin: every other /nfc route, capped at LANE_ADMIN_CAPACITY.
+
+    A slot is an AnyIO CapacityLimiter token taken by an async route
+    dependency before the sync handler is sent to the threadpool, so
+    requests queue on the event loop rather than inside the threadpool or
+    the connection pool. Each handler holds one session, so a lane's slots
+    are also its partition of the connection pool: keeping the two
+    capacities within DB_POOL_SIZE + DB_MAX_OVERFLOW means neither lane
+    waits on the pool because of the other. configure_threadpool() sizes
+    AnyIO's threadpool to fit both lanes plus the sync auth dependencies
+    that run before a slot is taken.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import anyio
+import anyio.to_thread
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from app.config import config
+from app.observability.telemetry import get_meter
+
+logger = logging.getLogger(__name__)
+
+RESOLVE = "resolve"
+ADMIN = "admin"
+
+# Threads kept beyond the lane capacities for sync dependencies (JWT
+# verification) that run before a request takes its lane slot.
+DEPENDENCY_THREADS = 8
+
+meter = get_meter("nfc-service.lanes")
+
+lane_acquisitions_counter = meter.create_counter(
+    name="nfc_lane_acquisitions_total",
+    description="Lane slots taken by /nfc requests",
+    unit="1",
+)
+
+lane_wait_histogram = meter.create_histogram(
+    name="nfc_lane_wait_ms",
+    description="Time /nfc requests waited for a lane slot",
+    unit="ms",
+)
+
+lane_in_use = meter.create_up_down_counter(
+    name="nfc_lane_in_use",
+    description="Lane slots currently held",
+    unit="1",
+)
+
+
+class PriorityLanes:
+    def __init__(self):
+        self._limiters: dict[str, anyio.CapacityLimiter] = {}
+
+    def limiter(self, lane: str) -> anyio.CapacityLimiter:
+        limiter = self._limiters.get(lane)
+        if limiter is None:
+            capacity = config.LANE_RESOLVE_CAPACITY if lane == RESOLVE else config.LANE_ADMIN_CAPACITY
+            limiter = self._limiters[lane] = anyio.CapacityLimiter(capacity)
+        return limiter
+
+    async def acquire(self, lane: str, borrower: object) -> tuple[str, str]:
+        """
+        Take a slot for ``borrower``, waiting on the event loop if needed.
+
+        Returns:
+            The lane whose slot was taken (pass it to release()) and how:
+            "immediate", "borrowed" (resolve used an idle admin slot) or
+            "queued"
+        """
+        own = self.limiter(lane)
+        try:
+            own.acquire_on_behalf_of_nowait(borrower)
+            return lane, "immediate"
+        except anyio.WouldBlock:
+            pass
+
+        if lane == RESOLVE:
+            try:
+                self.limiter(ADMIN).acquire_on_behalf_of_nowait(borrower)
+                return ADMIN, "borrowed"
+            except anyio.WouldBlock:
+                pass
+
+        await own.acquire_on_behalf_of(borrower)
+        return lane, "queued"
+
+    def release(self, lane: str, borrower: object):
+        self.limiter(lane).release_on_behalf_of(borrower)
+
+    def _observe_saturation(self, options: CallbackOptions):
+        return [
+            Observation(limiter.borrowed_tokens / limiter.total_tokens, {"lane": lane})
+            for lane, limiter in list(self._limiters.items())
+            if limiter.total_tokens
+        ]
+
+
+lanes = PriorityLanes()
+
+meter.create_observable_gauge(
+    name="nfc_lane_saturation",
+    callbacks=[lanes._observe_saturation],
+    description="Fraction of each lane's slots in use",
+    unit="1",
+)
+
+
+def configure_threadpool():
+    """Grow AnyIO's default threadpool to fit both lanes; call from the event loop."""
+    if not config.LANES_ENABLED:
+        return
+
+    lane_capacity = config.LANE_RESOLVE_CAPACITY + config.LANE_ADMIN_CAPACITY
+    pool_capacity = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+    if lane_capacity > pool_capacity:
+        logger.warning(
+            f"Lane capacity {lane_capacity} exceeds the database pool "
+            f"({pool_capacity}); lanes will wait on each other for connections"
+        )
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, lane_capacity + DEPENDENCY_THREADS)
+
+
+@asynccontextmanager
+async def _run_in_lane(lane: str):
+    if not config.LANES_ENABLED:
+        yield
+        return
+
+    borrower = object()
+    started = time.perf_counter()
+    held_lane, outcome = await lanes.acquire(lane, borrower)
+    attributes = {"lane": lane}
+    lane_wait_histogram.record((time.perf_counter() - started) * 1000, attributes=attributes)
+    lane_acquisitions_counter.add(1, attributes={**attributes, "outcome": outcome})
+    lane_in_use.add(1, attributes={"lane": held_lane})
+    try:
+        yield
+    finally:
+        lanes.release(held_lane, borrower)
+        lane_in_use.add(-1, attributes={"lane": held_lane})
+
+
+async def resolve_lane():
+    async with _run_in_lane(RESOLVE):
+        yield
+
+
+async def admin_lane():
+    async with _run_in_lane(ADMIN):
+        yield
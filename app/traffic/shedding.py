@@ -0,0 +1,140 @@
+"""
+Adaptive Load Shedding
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Rejects /nfc requests with 503 while the service is overloaded, instead
+    of letting them pile up in the threadpool until the liveness probe times
+    out and the pod is restarted. Pressure is the larger of two ratios:
+
+    - mean database pool checkout time over the last SHED_WINDOW_SECONDS
+      against SHED_POOL_WAIT_MS, and
+    - /nfc requests in flight (including those queued for a lane slot)
+      against SHED_MAX_IN_FLIGHT.
+
+    Routes are shed by priority. Bulk reads (list, search, stats, change feed,
+    snapshot) go first, at pressure 1; single-tag reads, delta syncs and writes follow
+    at pressure 1.5. /nfc/resolve is never shed, since its lane already
+    reserves capacity for it. Shedding stops by itself: once requests are rejected
+    the in-flight count falls, and checkout times older than the window stop
+    counting.
+"""
+
+import logging
+
+from fastapi import HTTPException, Request, status
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from app.config import config
+from app.observability.telemetry import get_meter
+
+logger = logging.getLogger(__name__)
+
+LOW = "low"
+NORMAL = "normal"
+CRITICAL = "critical"
+
+# Pressure at which each priority is shed; critical routes are never shed.
+SHED_AT = {LOW: 1.0, NORMAL: 1.5}
+
+ROUTE_PRIORITIES = {
+    "/nfc/resolve": CRITICAL,
+    "/nfc/": LOW,
+    "/nfc/stats": LOW,
+    "/nfc/changes": LOW,
+    "/nfc/snapshot": LOW,
+}
+
+meter = get_meter("nfc-service.shedding")
+
+load_shed_counter = meter.create_counter(
+    name="nfc_load_shed_total",
+    description="/nfc requests rejected with 503 by the load shedder",
+    unit="1",
+)
+
+
+def _pool_checkout_wait_ms(window_seconds: float) -> float:
+    from app.db.session import engine
+
+    return engine.pool.recent_checkout_wait_ms(window_seconds)
+
+
+class LoadShedder:
+    def __init__(self, checkout_wait_ms=_pool_checkout_wait_ms):
+        self._checkout_wait_ms = checkout_wait_ms
+        self._in_flight = 0
+        self._shedding = False
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def pressure(self) -> float:
+        wait_ms = self._checkout_wait_ms(config.SHED_WINDOW_SECONDS)
+        return max(
+            wait_ms / config.SHED_POOL_WAIT_MS,
+            self._in_flight / config.SHED_MAX_IN_FLIGHT,
+        )
+
+    def should_shed(self, priority: str) -> bool:
+        threshold = SHED_AT.get(priority)
+        if threshold is None:
+            return False
+
+        pressure = self.pressure()
+        shedding = pressure >= SHED_AT[LOW]
+        if shedding != self._shedding:
+            self._shedding = shedding
+            if shedding:
+                logger.warning(f"Shedding low-priority requests (pressure {pressure:.2f})")
+            else:
+                logger.info(f"Load shedding stopped (pressure {pressure:.2f})")
+        return pressure >= threshold
+
+    def enter(self):
+        self._in_flight += 1
+
+    def leave(self):
+        self._in_flight -= 1
+
+    def _observe_pressure(self, options: CallbackOptions):
+        return [Observation(self.pressure())]
+
+
+shedder = LoadShedder()
+
+meter.create_observable_gauge(
+    name="nfc_load_shed_pressure",
+    callbacks=[shedder._observe_pressure],
+    description="Load shedding pressure; low-priority routes are shed from 1",
+    unit="1",
+)
+
+
+async def shed_load(request: Request):
+    if not config.SHEDDING_ENABLED:
+        yield
+        return
+
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else request.url.path
+    priority = ROUTE_PRIORITIES.get(route_path, NORMAL)
+    if shedder.should_shed(priority):
+        load_shed_counter.add(1, attributes={"priority": priority, "http_route": route_path})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is overloaded, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    shedder.enter()
+    try:
+        yield
+    finally:
+        shedder.leave()
@@ -0,0 +1,124 @@
+"""
+Startup Warm-up
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Pays the first-request costs of a new pod before it is marked ready:
+    initializes OpenTelemetry (importing the SDK and OTLP exporters), opens
+    pool connections, prefetches the Keycloak JWKS, loads the organization
+    -> schema map, builds the per-tenant tag filters (when enabled) and
+    optionally reads each tenant's most recently issued tags (warming the
+    prepared statements and PostgreSQL's buffer cache). Runs in a
+    background thread from the startup event so /health keeps answering; /ready reports ready once it has finished. WARMUP_ENABLED
+    only turns off the warming steps, telemetry is always initialized.
+"""
+
+import logging
+import threading
+import time
+
+from app.auth import auth
+from app.config import config
+from app.db import session
+from app.nfc.repositories import NfcRepository
+from app.nfc.tag_filter import tag_filters
+from app.observability import telemetry
+from app.observability.startup import startup_report
+
+logger = logging.getLogger(__name__)
+
+
+class StartupWarmup:
+    def __init__(self, engine):
+        self._engine = engine
+        self._thread = None
+        self._ready = threading.Event()
+        self.steps: dict[str, str] = {}
+        self.duration_ms = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self.run, name="startup-warmup", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        self._step("telemetry", self._init_telemetry)
+        if config.WARMUP_ENABLED:
+            self._step("pool", self._warm_pool)
+            self._step("jwks", self._warm_jwks)
+            schema_names = self._step("schema_map", session.load_schema_map) or {}
+            self._step("tag_filter", lambda: self._load_tag_filters(schema_names))
+            self._step("hot_tags", lambda: self._warm_hot_tags(schema_names))
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"Startup warm-up finished in {self.duration_ms} ms: {self.steps}")
+        startup_report.emit()
+        # After the report is logged, so a ready pod always has it in its log.
+        self._ready.set()
+
+    def _step(self, name: str, warm):
+        try:
+            with startup_report.step(f"warmup.{name}"):
+                result = warm()
+        except Exception as exc:
+            # A failed step only means the first requests stay cold; it must
+            # not keep the pod out of rotation.
+            self.steps[name] = f"failed: {exc.__class__.__name__}"
+            logger.warning(f"Warm-up step {name} failed: {exc}")
+            return None
+        self.steps.setdefault(name, "ok")
+        return result
+
+    def _init_telemetry(self):
+        if not telemetry.init_telemetry():
+            raise RuntimeError("OpenTelemetry initialization failed")
+
+    def _warm_pool(self):
+        count = min(config.WARMUP_POOL_CONNECTIONS, self._engine.pool.size())
+        connections = []
+        try:
+            # Hold them all at once so the pool has to open distinct ones.
+            for _ in range(count):
+                connections.append(self._engine.connect())
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def _warm_jwks(self):
+        if not auth.KEYCLOAK_URL:
+            self.steps["jwks"] = "skipped"
+            return
+        auth.get_jwks()
+
+    def _load_tag_filters(self, schema_names: dict[str, str]):
+        if not config.TAG_FILTER_ENABLED:
+            self.steps["tag_filter"] = "skipped"
+            return
+        tag_filters.load_all(schema_names)
+        tag_filters.start_refresh()
+
+    def _warm_hot_tags(self, schema_names: dict[str, str]):
+        limit = config.WARMUP_HOT_TAGS
+        if limit <= 0:
+            self.steps["hot_tags"] = "skipped"
+            return
+
+        for organization_id, schema_name in schema_names.items():
+            db = session.get_db_for_org(organization_id, schema_name)
+            try:
+                repository = NfcRepository(db)
+                for tag_id in repository.get_recent_tag_ids(limit):
+                    repository.get_tag(tag_id)
+            finally:
+                db.close()
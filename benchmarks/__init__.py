@@ -0,0 +1,14 @@
+"""
+Performance Benchmarks
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Reproducible benchmarks for the NFC service hot paths. Benchmarks are
+    run as modules (python -m benchmarks.<name>) and are not collected by
+    pytest.
+"""
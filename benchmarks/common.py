@@ -0,0 +1,67 @@
+"""
+Shared Benchmark Helpers
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Latency summaries and JSON report handling shared by the benchmark
+    modules, so every benchmark emits results in the same comparable shape.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms: list[float], elapsed_s: Optional[float] = None) -> dict:
+    """Summarize latency samples (milliseconds) and optional wall-clock time."""
+    ordered = sorted(samples_ms)
+    summary = {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 4),
+        "p95_ms": round(percentile(ordered, 95), 4),
+        "p99_ms": round(percentile(ordered, 99), 4),
+        "max_ms": round(ordered[-1], 4) if ordered else 0.0,
+    }
+    if elapsed_s is not None:
+        summary["throughput_rps"] = round(len(ordered) / elapsed_s, 2) if elapsed_s else 0.0
+    return summary
+
+
+def build_report(benchmark: str, parameters: dict, results: dict) -> dict:
+    return {
+        "benchmark": benchmark,
+        "run_id": str(uuid.uuid4()),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def write_report(report: dict, output: Optional[str]) -> None:
+    rendered = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(rendered + "\n")
+    print(rendered)
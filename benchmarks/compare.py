@@ -0,0 +1,92 @@
+"""
+Benchmark Report Comparison
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Compares two JSON reports written by the benchmark modules and prints
+    the relative change of every latency and throughput figure, flagging
+    latency increases above the given threshold as regressions.
+
+Usage:
+    python -m benchmarks.compare base.json candidate.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_KEY = "throughput_rps"
+
+
+def _flatten(results: dict, prefix: tuple = ()) -> dict:
+    """Map ("mode", "endpoint") paths to their summary dicts."""
+    flat = {}
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if "p50_ms" in value:
+            flat[prefix + (key,)] = value
+        else:
+            flat.update(_flatten(value, prefix + (key,)))
+    return flat
+
+
+def _change(base: float, candidate: float) -> float:
+    if not base:
+        return 0.0
+    return (candidate - base) / base * 100
+
+
+def compare(base: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    lines = []
+    regressions = []
+    base_results = _flatten(base["results"])
+    candidate_results = _flatten(candidate["results"])
+
+    for path in sorted(base_results.keys() & candidate_results.keys()):
+        name = "/".join(path)
+        before = base_results[path]
+        after = candidate_results[path]
+        for key in LATENCY_KEYS + (THROUGHPUT_KEY,):
+            if key not in before or key not in after:
+                continue
+            change = _change(before[key], after[key])
+            line = f"{name:40} {key:15} {before[key]:>10} -> {after[key]:>10} ({change:+.1f}%)"
+            if key in LATENCY_KEYS and change > threshold:
+                regressions.append(line)
+                line += "  REGRESSION"
+            lines.append(line)
+
+    return lines, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0])
+    parser.add_argument("base")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Latency increase in percent reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    lines, regressions = compare(base, candidate, args.threshold)
+    print("\n".join(lines))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
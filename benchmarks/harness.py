@@ -0,0 +1,365 @@
+"""
+In-Process Benchmark Harness
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Builds a self-contained copy of the NFC service for benchmarking:
+    app.main.app driven in-process through Starlette's TestClient, backed by
+    either the SQLite stand-in used by the e2e tests or a seeded PostgreSQL
+    tenant schema built by the migrations, with a fake event publisher and
+    a fake JWT verifier so no broker or Keycloak is needed. Telemetry can be
+    switched between "off" (no middleware, no SDK providers) and "on"
+    (middleware plus SDK providers that process spans and metrics but
+    export nowhere).
+"""
+
+import os
+import sqlite3
+import tempfile
+import uuid
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+ORGANIZATION_ID = "bench-org"
+SCHEMA_NAME = "bench_nfc"
+
+TOKENS = {
+    "admin": {
+        "sub": "bench-admin",
+        "organisationId": ORGANIZATION_ID,
+        "schema": SCHEMA_NAME,
+        "realm_access": {"roles": ["ORG_ADMIN"]},
+    },
+    "caregiver": {
+        "sub": "bench-caregiver",
+        "organisationId": ORGANIZATION_ID,
+        "schema": SCHEMA_NAME,
+        "realm_access": {"roles": ["CAREGIVER"]},
+    },
+}
+
+
+def auth_headers(
+    role: str,
+    organization_id: Optional[str] = None,
+    schema_name: Optional[str] = None,
+) -> dict:
+    """Bearer token for a role, optionally in another tenant than the default."""
+    token = role if organization_id is None else f"{role}:{organization_id}:{schema_name}"
+    return {"Authorization": f"Bearer {token}"}
+
+
+def fake_decode_jwt(token: str) -> dict:
+    """
+    Stand-in for app.auth.auth.decode_jwt.
+
+    The bearer token is a role name, or ``role:organization_id:schema`` for
+    a tenant other than the default one.
+    """
+    role, _, tenant = token.partition(":")
+    claims = dict(TOKENS[role])
+    if tenant:
+        claims["organisationId"], claims["schema"] = tenant.split(":", 1)
+    return claims
+
+
+class FakePublisher:
+    """Records how many events were published instead of talking to RabbitMQ."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, routing_key: str, payload: dict, **_kwargs):
+        self.count += 1
+
+
+def patient_ids(count: int) -> list[str]:
+    return [str(uuid.UUID(int=i + 1)) for i in range(count)]
+
+
+def tag_ids(count: int) -> list[str]:
+    return [f"bench-tag-{i:07d}" for i in range(count)]
+
+
+class SqliteDatabase:
+    """The SQLite stand-in from the e2e tests, seeded with one tenant."""
+
+    name = "sqlite"
+    # The list query uses ILIKE, which SQLite does not understand.
+    unsupported_endpoints = ("list",)
+
+    def __init__(self, tag_count: int, patient_count: int):
+        sqlite3.register_adapter(UUID, str)
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="nfc-bench-")
+        self.engine = create_engine(
+            f"sqlite+pysqlite:///{os.path.join(self._tmpdir.name, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        self._session_factory = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.tag_ids = tag_ids(tag_count)
+        self.patient_ids = patient_ids(patient_count)
+
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE patients (id TEXT PRIMARY KEY)"))
+            conn.execute(
+                text(
+                    """
+                    CREATE TABLE nfc_tags (
+                        tag_id TEXT PRIMARY KEY,
+                        patient_id TEXT,
+                        status TEXT,
+                        issued_at TEXT,
+                        deactivated_at TEXT,
+                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                )
+            )
+            conn.execute(
+                text("INSERT INTO patients (id) VALUES (:id)"),
+                [{"id": patient_id} for patient_id in self.patient_ids],
+            )
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO nfc_tags (tag_id, patient_id, status, issued_at)
+                    VALUES (:tag_id, :patient_id, 'active', CURRENT_TIMESTAMP)
+                    """
+                ),
+                [
+                    {"tag_id": tag_id, "patient_id": patient_id}
+                    for tag_id, patient_id in zip(self.tag_ids, self.patient_ids)
+                ],
+            )
+
+    def get_db_for_org(self, _organization_id: str, _schema_name: Optional[str] = None):
+        return self._session_factory()
+
+    def close(self):
+        self.engine.dispose()
+        self._tmpdir.cleanup()
+
+
+def create_tenant_schema(engine, schema: str) -> dict:
+    """
+    (Re)create an empty tenant schema the way production tenants get theirs.
+
+    patients belongs to the patient service, so it is created here; the
+    rest of the schema comes from the Alembic migrations, run through
+    app.db.tenant_migrations.
+
+    Returns:
+        The migration outcome, see tenant_migrations.migrate_schema()
+    """
+    from app.db.tenant_migrations import FAILED, migrate_schema
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+        conn.exec_driver_sql(f'CREATE SCHEMA "{schema}"')
+        conn.exec_driver_sql(f'CREATE TABLE "{schema}".patients (id UUID PRIMARY KEY)')
+    result = migrate_schema(engine.url.render_as_string(hide_password=False), schema, "head")
+    if result["status"] == FAILED:
+        raise RuntimeError(f"Migrating {schema} failed: {result['error']}")
+    return result
+
+
+def _tenant_session_factory(engine):
+    from app.db.session import TenantSession, install_search_path_hooks
+
+    session_factory = sessionmaker(
+        class_=TenantSession,
+        bind=engine,
+        autocommit=False,
+        autoflush=False,
+    )
+    install_search_path_hooks(engine, session_factory)
+    return session_factory
+
+
+class PostgresDatabase:
+    """A throwaway tenant schema on a real PostgreSQL server."""
+
+    name = "postgresql"
+    unsupported_endpoints = ()
+
+    def __init__(self, database_url: str, tag_count: int, patient_count: int):
+        self.engine = create_engine(database_url)
+        self._session_factory = _tenant_session_factory(self.engine)
+        self.tag_ids = tag_ids(tag_count)
+        self.patient_ids = patient_ids(patient_count)
+
+        create_tenant_schema(self.engine, SCHEMA_NAME)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f'SET LOCAL search_path TO "{SCHEMA_NAME}"')
+            conn.exec_driver_sql(
+                """
+                INSERT INTO patients (id)
+                SELECT ('00000000-0000-0000-0000-' || lpad(to_hex(n), 12, '0'))::uuid
+                FROM generate_series(1, %(patients)s) AS n
+                """,
+                {"patients": patient_count},
+            )
+            conn.exec_driver_sql(
+                """
+                INSERT INTO nfc_tags (tag_id, patient_id, status)
+                SELECT 'bench-tag-' || lpad((n - 1)::text, 7, '0'),
+                       ('00000000-0000-0000-0000-' || lpad(to_hex(n), 12, '0'))::uuid,
+                       'active'
+                FROM generate_series(1, %(tags)s) AS n
+                """,
+                {"tags": tag_count},
+            )
+            conn.exec_driver_sql("ANALYZE patients")
+            conn.exec_driver_sql("ANALYZE nfc_tags")
+
+    def get_db_for_org(self, _organization_id: str, schema_name: Optional[str] = None):
+        db = self._session_factory()
+        db.info["schema_name"] = schema_name or SCHEMA_NAME
+        return db
+
+    def close(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP SCHEMA IF EXISTS "{SCHEMA_NAME}" CASCADE')
+        self.engine.dispose()
+
+
+class ProvisionedDatabase:
+    """Tenant schemas that already exist, e.g. made by benchmarks.synthetic_data."""
+
+    name = "postgresql"
+    unsupported_endpoints = ()
+
+    def __init__(self, database_url: str):
+        self.engine = create_engine(database_url)
+        self._session_factory = _tenant_session_factory(self.engine)
+
+    def get_db_for_org(self, _organization_id: str, schema_name: Optional[str] = None):
+        db = self._session_factory()
+        db.info["schema_name"] = schema_name
+        return db
+
+    def close(self):
+        self.engine.dispose()
+
+
+def open_database(database_url: Optional[str], tag_count: int, patient_count: int):
+    if database_url:
+        return PostgresDatabase(database_url, tag_count, patient_count)
+    return SqliteDatabase(tag_count, patient_count)
+
+
+def load_app():
+    """
+    Import app.main without exporting telemetry to a collector.
+
+    app.main initializes telemetry from the warm-up thread, which is not
+    started here; telemetry is enabled later, on demand, through
+    set_telemetry().
+    """
+    os.environ.setdefault("RABBITMQ_CONSUMER_ENABLED", "false")
+
+    import app.main as main
+
+    main.consumer.start = lambda: None
+    main.consumer.stop = lambda: None
+    main.warmup.start = lambda: None
+    return main
+
+
+class Harness:
+    """Wires a database, publisher and fake JWT verifier into app.main.app."""
+
+    def __init__(self, main, database):
+        import app.auth.dependencies as auth_dependencies
+        import app.nfc.router as nfc_router
+
+        self.main = main
+        self.app = main.app
+        self.database = database
+        self.publisher = FakePublisher()
+        self._sdk_installed = False
+        self._instrumented = False
+
+        from app.observability.middleware import TelemetryMiddleware
+
+        self._telemetry_middleware = next(
+            middleware
+            for middleware in self.app.user_middleware
+            if middleware.cls is TelemetryMiddleware
+        )
+
+        nfc_router.get_db_for_org = database.get_db_for_org
+        nfc_router.publish_event = self.publisher
+        auth_dependencies.decode_jwt = fake_decode_jwt
+
+        # Every benchmark request comes from one organization; per-tenant
+        # rate limits (and shedding under deliberate overload) would measure
+        # the limiters instead of the endpoints.
+        from app.config import config
+
+        self._config = config
+        self._admission_enabled = config.ADMISSION_ENABLED
+        self._shedding_enabled = config.SHEDDING_ENABLED
+        config.ADMISSION_ENABLED = False
+        config.SHEDDING_ENABLED = False
+
+    def set_telemetry(self, enabled: bool):
+        middleware = self.app.user_middleware
+        if enabled:
+            if self._telemetry_middleware not in middleware:
+                middleware.insert(0, self._telemetry_middleware)
+            self._install_sdk_providers()
+            if not self._instrumented:
+                from app.observability.database import instrument_database
+
+                instrument_database(self.database.engine)
+                self._instrumented = True
+        elif self._telemetry_middleware in middleware:
+            middleware.remove(self._telemetry_middleware)
+        # Starlette builds the middleware stack lazily on the next request.
+        self.app.middleware_stack = None
+
+    def _install_sdk_providers(self):
+        if self._sdk_installed:
+            return
+
+        from opentelemetry import metrics, trace
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            SpanExporter,
+            SpanExportResult,
+        )
+
+        class _DiscardingSpanExporter(SpanExporter):
+            def export(self, spans):
+                return SpanExportResult.SUCCESS
+
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(BatchSpanProcessor(_DiscardingSpanExporter()))
+        trace.set_tracer_provider(tracer_provider)
+        metrics.set_meter_provider(MeterProvider(metric_readers=[InMemoryMetricReader()]))
+        self._sdk_installed = True
+
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        return TestClient(self.app)
+
+    def close(self):
+        self._config.ADMISSION_ENABLED = self._admission_enabled
+        self._config.SHEDDING_ENABLED = self._shedding_enabled
+        if self._telemetry_middleware not in self.app.user_middleware:
+            self.app.user_middleware.insert(0, self._telemetry_middleware)
+            self.app.middleware_stack = None
+        self.database.close()
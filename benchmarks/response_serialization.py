@@ -0,0 +1,130 @@
+"""
+Response Serialization Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Measures the CPU time FastAPI spends turning one GET /nfc/ page into a
+    response, with and without the fast response path. A minimal app serves
+    the same pre-built page from two routes declared like the real list
+    route: one builds NFCListResponse and lets FastAPI validate and serialize
+    it against response_model, the other returns build_response() with
+    FAST_RESPONSES_ENABLED. Requests go through the in-process TestClient,
+    so the numbers include routing and the threadpool hop FastAPI uses to
+    validate sync endpoint results. No database is involved.
+
+Usage:
+    python -m benchmarks.response_serialization --iterations 2000
+    python -m benchmarks.response_serialization --page-sizes 20 100 --output serialization.json
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import config
+from app.nfc.responses import build_response
+from app.nfc.schemas import NFCListResponse
+from benchmarks.common import build_report, summarize, write_report
+
+PAGE_SIZES = (20, 100)
+
+
+def build_page(size: int) -> dict:
+    issued_at = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+    items = [
+        {
+            "tag_id": f"tag-{i:06d}",
+            "patient_id": str(uuid4()),
+            "organization_id": "bench-org",
+            "status": "active",
+            "issued_at": issued_at,
+            "deactivated_at": None,
+        }
+        for i in range(size)
+    ]
+    return {"items": items, "next_cursor": items[-1]["tag_id"]}
+
+
+def build_app(page: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model", response_model=NFCListResponse)
+    def model_page():
+        return NFCListResponse(**page)
+
+    @app.get("/fast", response_model=NFCListResponse)
+    def fast_page():
+        return build_response(NFCListResponse, page)
+
+    return app
+
+
+def _measure(client: TestClient, path: str, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        client.get(path)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.process_time()
+        response = client.get(path)
+        samples.append((time.process_time() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+    return summarize(samples)
+
+
+def run(iterations: int, warmup: int, page_sizes=PAGE_SIZES) -> dict:
+    fast_responses_enabled = config.FAST_RESPONSES_ENABLED
+    config.FAST_RESPONSES_ENABLED = True
+    results = {}
+    try:
+        for size in page_sizes:
+            page = build_page(size)
+            with TestClient(build_app(page)) as client:
+                if client.get("/model").json() != client.get("/fast").json():
+                    raise RuntimeError("Fast and model responses differ")
+                model = _measure(client, "/model", iterations, warmup)
+                fast = _measure(client, "/fast", iterations, warmup)
+
+            saved_ms = model["mean_ms"] - fast["mean_ms"]
+            results[f"page_{size}"] = {
+                "response_model": model,
+                "fast_response": fast,
+                "cpu_saved_per_page_ms": round(saved_ms, 4),
+                "cpu_saved_pct": round(100 * saved_ms / model["mean_ms"], 1) if model["mean_ms"] else 0.0,
+            }
+    finally:
+        config.FAST_RESPONSES_ENABLED = fast_responses_enabled
+
+    return build_report(
+        "response_serialization",
+        {"iterations": iterations, "warmup": warmup, "page_sizes": list(page_sizes)},
+        results,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=list(PAGE_SIZES))
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.warmup, tuple(args.page_sizes))
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
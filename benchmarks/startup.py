@@ -0,0 +1,153 @@
+"""
+Cold Start Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Starts the service with uvicorn in a fresh interpreter, the way a new pod
+    does, and measures the time from process spawn to the first successful
+    /health response (time-to-first-request) and to /ready. Each run uses a
+    new process so nothing is served from an already warm import cache. The
+    startup report of the last run, read from the service's log, is included
+    to show where the time went.
+    The RabbitMQ consumer and the warm-up steps are disabled so the result
+    does not depend on a broker or database being reachable; telemetry is
+    still initialized.
+
+Usage:
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Optional
+
+from benchmarks.common import build_report, summarize, write_report
+
+POLL_INTERVAL_S = 0.005
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> Optional[dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError):
+        return None
+
+
+def _wait_for(url: str, deadline: float, process: subprocess.Popen) -> dict:
+    while time.monotonic() < deadline:
+        body = _get(url)
+        if body is not None:
+            return body
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with code {process.returncode} before {url} answered")
+        time.sleep(POLL_INTERVAL_S)
+    raise TimeoutError(f"{url} did not answer in time")
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env.setdefault("RABBITMQ_CONSUMER_ENABLED", "false")
+    env.setdefault("WARMUP_ENABLED", "false")
+    # The startup report is an INFO line.
+    env.setdefault("LOG_LEVEL", "INFO")
+    return env
+
+
+def _startup_report(log) -> dict:
+    """The "Startup report" entry of the service's JSON log, if it was written."""
+    log.seek(0)
+    for line in log:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and entry.get("message") == "Startup report":
+            return entry.get("startup", {})
+    return {}
+
+
+def measure_once(timeout_s: float) -> tuple[float, float, dict]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]
+
+    with tempfile.TemporaryFile(mode="w+") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            command,
+            env=_environment(),
+            stdout=log,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + timeout_s
+            _wait_for(f"{base_url}/health", deadline, process)
+            first_request_ms = (time.perf_counter() - start) * 1000
+            _wait_for(f"{base_url}/ready", deadline, process)
+            ready_ms = (time.perf_counter() - start) * 1000
+        finally:
+            # Graceful shutdown would flush telemetry to a collector that is
+            # usually not running here; it is not part of what is measured.
+            process.kill()
+            process.wait()
+
+        return first_request_ms, ready_ms, _startup_report(log)
+
+
+def run(runs: int, timeout_s: float = 30.0) -> dict:
+    first_request, ready = [], []
+    startup = {}
+    for _ in range(runs):
+        first_request_ms, ready_ms, startup = measure_once(timeout_s)
+        first_request.append(first_request_ms)
+        ready.append(ready_ms)
+
+    return build_report(
+        "startup",
+        {"runs": runs},
+        {
+            "time_to_first_request": summarize(first_request),
+            "time_to_ready": summarize(ready),
+            "last_startup_report": startup,
+        },
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait per run")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs, args.timeout)
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Smoke Tests for the Consumer Throughput Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Runs the consumer benchmark for a few messages on the SQLite stand-in and
+    checks that every message is acked and counted.
+"""
+
+import app.messaging.consumer as consumer_module
+from benchmarks import consumer_throughput
+
+
+def test_consumer_throughput_acks_every_message():
+    original_get_db_for_org = consumer_module.get_db_for_org
+
+    report = consumer_throughput.run(None, message_count=50, tag_count=20)
+
+    overall = report["results"]["overall"]
+    assert overall["acked"] == 50
+    assert overall["nacked"] == 0
+    assert overall["count"] == 50
+    assert overall["statements_per_message"] > 0
+    assert sum(summary["count"] for summary in report["results"]["by_event_type"].values()) == 50
+    assert consumer_module.get_db_for_org is original_get_db_for_org
@@ -0,0 +1,47 @@
+"""
+Smoke Tests for the Endpoint Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Runs the in-process endpoint benchmark for a handful of iterations on the
+    SQLite stand-in and checks the report shape and the compare helper.
+"""
+
+import app.auth.dependencies as auth_dependencies
+import app.nfc.router as nfc_router
+from app.main import consumer, warmup
+from benchmarks import http_endpoints
+from benchmarks.compare import compare
+
+
+def test_http_endpoints_benchmark_reports_each_endpoint(monkeypatch):
+    # The harness rewires these module globals; let monkeypatch restore them.
+    monkeypatch.setattr(nfc_router, "get_db_for_org", nfc_router.get_db_for_org)
+    monkeypatch.setattr(nfc_router, "publish_event", nfc_router.publish_event)
+    monkeypatch.setattr(auth_dependencies, "decode_jwt", auth_dependencies.decode_jwt)
+    monkeypatch.setattr(consumer, "start", consumer.start)
+    monkeypatch.setattr(consumer, "stop", consumer.stop)
+    monkeypatch.setattr(warmup, "start", warmup.start)
+
+    report = http_endpoints.run(
+        None,
+        iterations=5,
+        warmup=1,
+        tag_count=10,
+        telemetry_modes=(("telemetry_off", False),),
+    )
+
+    assert report["parameters"]["database"] == "sqlite"
+    assert report["parameters"]["skipped_endpoints"] == ["list"]
+    results = report["results"]["telemetry_off"]
+    assert set(results) == {"resolve", "get_tag", "assign", "stats"}
+    assert all(summary["count"] == 5 for summary in results.values())
+
+    lines, regressions = compare(report, report, threshold=10)
+    assert len(lines) == 16
+    assert regressions == []
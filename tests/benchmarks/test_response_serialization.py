@@ -0,0 +1,28 @@
+"""
+Smoke Tests for the Response Serialization Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Runs the serialization benchmark for a few iterations and checks that
+    both paths are measured and the config flag is restored.
+"""
+
+from app.config import config
+from benchmarks import response_serialization
+
+
+def test_response_serialization_benchmark_measures_both_paths():
+    fast_responses_enabled = config.FAST_RESPONSES_ENABLED
+
+    report = response_serialization.run(iterations=5, warmup=1, page_sizes=(3,))
+
+    result = report["results"]["page_3"]
+    assert result["response_model"]["count"] == 5
+    assert result["fast_response"]["count"] == 5
+    assert "cpu_saved_per_page_ms" in result
+    assert config.FAST_RESPONSES_ENABLED is fast_responses_enabled
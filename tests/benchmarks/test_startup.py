@@ -0,0 +1,24 @@
+"""
+Smoke Tests for the Cold Start Benchmark
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Starts the service once in a subprocess and checks that the report has
+    the time-to-first-request and the service's startup report.
+"""
+
+from benchmarks import startup
+
+
+def test_startup_benchmark_reports_time_to_first_request():
+    report = startup.run(runs=1)
+
+    results = report["results"]
+    assert results["time_to_first_request"]["count"] == 1
+    assert results["time_to_ready"]["p50_ms"] >= results["time_to_first_request"]["p50_ms"]
+    assert "import.nfc" in results["last_startup_report"]["steps_ms"]
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Synthetic Data Generator and Scan Replay
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Unit tests for the tenant plans and scan workload of the synthetic data
+    generator, and a smoke test of the scan replay on the SQLite stand-in.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+import app.auth.dependencies as auth_dependencies
+import app.nfc.router as nfc_router
+from app.main import consumer, warmup
+from benchmarks.harness import SqliteDatabase
+from benchmarks.scan_replay import read_workload, replay
+from benchmarks.synthetic_data import TenantPlan, write_workload
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def make_plans(tenants=3, patients=200, tags=250, active_ratio=0.8, seed=7):
+    return [
+        TenantPlan(tenant, "synth_", patients, tags, active_ratio, seed)
+        for tenant in range(tenants)
+    ]
+
+
+def test_tenant_plan_is_deterministic():
+    first = TenantPlan(1, "synth_", 50, 60, 0.5, 3)
+    second = TenantPlan(1, "synth_", 50, 60, 0.5, 3)
+
+    assert first.rows(NOW) == second.rows(NOW)
+    assert [first.hot_tag(rank) for rank in range(30)] == [
+        second.hot_tag(rank) for rank in range(30)
+    ]
+    assert first.rows(NOW) != TenantPlan(1, "synth_", 50, 60, 0.5, 4).rows(NOW)
+
+
+def test_tenant_plan_gives_each_patient_at_most_one_active_tag():
+    plan = TenantPlan(0, "synth_", 200, 250, 0.8, 1)
+
+    patient_ids, tags = plan.rows(NOW)
+
+    active = [tag for tag in tags if tag[2] == "active"]
+    assert len(active) == 200
+    assert len({tag[1] for tag in active}) == len(active)
+    assert {tag[1] for tag in tags} <= set(patient_ids)
+    assert all(tag[4] > tag[3] for tag in tags if tag[2] == "inactive")
+    # change_seq is assigned in this order.
+    assert [tag[4] or tag[3] for tag in tags] == sorted(tag[4] or tag[3] for tag in tags)
+
+
+def test_tenant_plan_needs_a_patient_per_active_tag():
+    with pytest.raises(ValueError):
+        TenantPlan(0, "synth_", 10, 100, 0.5, 1)
+
+
+def test_tag_ids_are_unique_and_hot_ranks_cover_the_active_tags():
+    plans = make_plans()
+    issued = [tag[0] for plan in plans for tag in plan.rows(NOW)[1]]
+    assert len(issued) == len(set(issued))
+
+    plan = plans[0]
+    active = {tag[0] for tag in plan.rows(NOW)[1] if tag[2] == "active"}
+    assert {plan.hot_tag(rank) for rank in range(plan.active)} == active
+
+
+def test_workload_is_skewed_towards_hot_tags(tmp_path):
+    plans = make_plans()
+    path = tmp_path / "scans.jsonl"
+
+    stats = write_workload(str(path), plans, 5000, 1.1, 0.0, 0.05, 0.02, 1, {"seed": 1})
+
+    parameters, scans = read_workload(str(path))
+    assert parameters == {"seed": 1}
+    assert len(scans) == 5000
+    assert Counter(scan["kind"] for scan in scans) == stats["scans"]
+    assert {scan["expect"] for scan in scans if scan["kind"] == "inactive"} == {403}
+
+    issued = {
+        tag[0]: (plan.schema, tag[2]) for plan in plans for tag in plan.rows(NOW)[1]
+    }
+    for scan in scans:
+        if scan["kind"] == "unknown":
+            assert scan["tag_id"] not in issued
+        else:
+            assert issued[scan["tag_id"]] == (scan["schema"], scan["kind"])
+
+    # Under Zipf(1.1) the hottest two of 200 tags take far more than 1%.
+    assert stats["hottest_1pct_share"] > 0.2
+    active = Counter(scan["tag_id"] for scan in scans if scan["kind"] == "active")
+    assert active.most_common(1)[0][0] in {plan.hot_tag(0) for plan in plans}
+
+
+def test_workload_is_reproducible(tmp_path):
+    plans = make_plans(tenants=2)
+    for name in ("a.jsonl", "b.jsonl"):
+        write_workload(str(tmp_path / name), plans, 500, 1.1, 0.5, 0.02, 0.01, 9, {})
+
+    assert (tmp_path / "a.jsonl").read_text() == (tmp_path / "b.jsonl").read_text()
+
+
+def test_replay_reports_each_kind_and_checks_statuses(monkeypatch):
+    # The harness rewires these module globals; let monkeypatch restore them.
+    monkeypatch.setattr(nfc_router, "get_db_for_org", nfc_router.get_db_for_org)
+    monkeypatch.setattr(nfc_router, "publish_event", nfc_router.publish_event)
+    monkeypatch.setattr(auth_dependencies, "decode_jwt", auth_dependencies.decode_jwt)
+    monkeypatch.setattr(consumer, "start", consumer.start)
+    monkeypatch.setattr(consumer, "stop", consumer.stop)
+    monkeypatch.setattr(warmup, "start", warmup.start)
+
+    database = SqliteDatabase(10, 10)
+    tenant = {"organization_id": "synth-org", "schema": "synth_0000"}
+    scans = [
+        {**tenant, "tag_id": tag, "kind": "active", "expect": 200}
+        for tag in database.tag_ids * 2
+    ] + [{**tenant, "tag_id": "04FFFFFFFFFFFF", "kind": "unknown", "expect": 404}]
+
+    results = replay(database, scans, warmup=2)
+
+    assert results["all"]["count"] == 19
+    assert results["active"]["count"] == 18 and results["unknown"]["count"] == 1
+
+    wrong = [{**tenant, "tag_id": "04FFFFFFFFFFFF", "kind": "active", "expect": 200}]
+    with pytest.raises(RuntimeError, match="returned 404"):
+        replay(SqliteDatabase(10, 10), wrong)
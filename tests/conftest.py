@@ -10,12 +10,105 @@ Developers:
 Description:
     Pytest configuration file with shared test setup and fixtures.
     Ensures the app module can be imported during tests.
+
+    Tests of the PostgreSQL-only SQL paths use the postgres_tenant fixture:
+    a throwaway tenant schema built by the Alembic migrations on the scratch
+    database in TEST_DATABASE_URL. They are skipped when it is not set.
 """
 # Development Team: Muhammad Faizan, Roozbeh Kouchaki, Fatemehalsadat Sabaghjafari, Dipika Bhandari
 
+import os
 import sys
+import uuid
 from pathlib import Path
 
+import pytest
+
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class PostgresTenant:
+    """A throwaway tenant schema on TEST_DATABASE_URL, built by the migrations."""
+
+    def __init__(self, database_url: str, revision: str = "head"):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from app.db.session import TenantSession, install_search_path_hooks, quote_identifier
+
+        self.database_url = database_url
+        self.schema = f"test_{uuid.uuid4().hex[:12]}"
+        self._quoted_schema = quote_identifier(self.schema)
+        self.engine = create_engine(database_url)
+        self._session_factory = sessionmaker(
+            class_=TenantSession,
+            bind=self.engine,
+            autocommit=False,
+            autoflush=False,
+        )
+        install_search_path_hooks(self.engine, self._session_factory)
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"CREATE SCHEMA {self._quoted_schema}")
+            # patients belongs to the patient service; this service only reads it.
+            conn.exec_driver_sql(f"CREATE TABLE {self._quoted_schema}.patients (id UUID PRIMARY KEY)")
+        self.migrate(revision)
+
+    def migrate(self, revision: str = "head"):
+        from app.db.tenant_migrations import FAILED, migrate_schema
+
+        result = migrate_schema(self.database_url, self.schema, revision)
+        if result["status"] == FAILED:
+            raise RuntimeError(f"Migrating {self.schema} failed: {result['error']}")
+
+    def session(self, deadline=None):
+        """A session bound to the tenant, as get_db_for_org returns it."""
+        db = self._session_factory()
+        db.info["schema_name"] = self.schema
+        if deadline is not None:
+            db.info["deadline"] = deadline
+        return db
+
+    def execute(self, sql: str, params=None):
+        """Run SQL in the tenant schema and commit; returns the rows, if any."""
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"SET LOCAL search_path TO {self._quoted_schema}")
+            result = conn.exec_driver_sql(sql, params or {})
+            return result.fetchall() if result.returns_rows else None
+
+    def drop(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {self._quoted_schema} CASCADE")
+        self.engine.dispose()
+
+
+@pytest.fixture()
+def make_postgres_tenant():
+    """Create tenants migrated to a given revision, optionally on another driver; all are dropped afterwards."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    tenants = []
+
+    def make(revision: str = "head", driver: str = None) -> PostgresTenant:
+        database_url = TEST_DATABASE_URL
+        if driver:
+            from sqlalchemy.engine import make_url
+
+            database_url = make_url(database_url).set(drivername=f"postgresql+{driver}")
+            database_url = database_url.render_as_string(hide_password=False)
+        tenant = PostgresTenant(database_url, revision)
+        tenants.append(tenant)
+        return tenant
+
+    yield make
+    for tenant in tenants:
+        tenant.drop()
+
+
+@pytest.fixture()
+def postgres_tenant(make_postgres_tenant):
+    return make_postgres_tenant()
@@ -0,0 +1,70 @@
+"""
+Unit Tests for the Observed Connection Pool
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Unit tests for checkout timing, exhaustion logging and pool gauges.
+"""
+
+import logging
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import app.db.pool as pool_module
+from app.db.pool import ObservedQueuePool
+
+
+@pytest.fixture()
+def small_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'pool.db'}",
+        poolclass=ObservedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkout_records_wait_time(small_engine, monkeypatch):
+    histogram = Mock()
+    monkeypatch.setattr(pool_module, "pool_checkout_wait_histogram", histogram)
+
+    with small_engine.connect():
+        pass
+
+    histogram.record.assert_called_once()
+    assert histogram.record.call_args.args[0] >= 0
+
+
+def test_exhausted_pool_is_logged_and_counted(small_engine, monkeypatch, caplog):
+    counter = Mock()
+    monkeypatch.setattr(pool_module, "pool_exhausted_counter", counter)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.pool"):
+        with small_engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                small_engine.connect()
+
+    counter.add.assert_called_once_with(1)
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("pool exhausted" in message for message in messages)
+    assert any("Timed out" in message for message in messages)
+
+
+def test_recent_checkout_wait_covers_only_the_window(small_engine):
+    with small_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            small_engine.connect()
+
+    assert small_engine.pool.recent_checkout_wait_ms(60) >= 20
+    assert small_engine.pool.recent_checkout_wait_ms(0) == 0.0
@@ -0,0 +1,248 @@
+"""
+Unit Tests for Database Session Management
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Unit tests for tenant session setup: deferred search_path handling,
+    identifier quoting, idle-based liveness pings and
+    reconnect-on-first-statement behaviour. The psycopg2 and psycopg 3
+    branches of the first-statement setup run against TEST_DATABASE_URL.
+"""
+
+import sqlite3
+import time
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+
+import app.db.session as session_module
+from app.db.session import (
+    deadline_sql,
+    execute_with_reconnect,
+    get_db_for_org,
+    install_liveness_checks,
+    install_search_path_hooks,
+    search_path_sql,
+)
+
+
+def _disconnect_error():
+    return DBAPIError("SELECT 1", {}, Exception("server closed the connection"), connection_invalidated=True)
+
+
+def test_get_db_for_org_defers_search_path():
+    db = get_db_for_org("org-1", "tenant_a")
+
+    try:
+        assert db.info["schema_name"] == "tenant_a"
+        assert not db.in_transaction()
+    finally:
+        db.close()
+
+
+def test_search_path_sql_quotes_schema_name():
+    assert search_path_sql('tenant"a') == 'SET search_path TO "tenant""a"'
+
+
+def test_execute_with_reconnect_retries_first_statement():
+    db = Mock(info={})
+    db.in_transaction.return_value = False
+    execute = Mock(side_effect=[_disconnect_error(), "row"])
+
+    assert execute_with_reconnect(db, execute) == "row"
+    assert execute.call_count == 2
+    db.rollback.assert_called_once()
+
+
+def test_execute_with_reconnect_requeues_statements_for_the_retry():
+    db = Mock(info={session_module._PENDING_STATEMENTS: ["SELECT 1"]})
+    db.in_transaction.return_value = False
+    sent = []
+
+    def execute():
+        # As after_begin does, the first attempt takes the queued statements.
+        sent.append(db.info.pop(session_module._PENDING_STATEMENTS, None))
+        if len(sent) == 1:
+            raise _disconnect_error()
+        return "row"
+
+    assert execute_with_reconnect(db, execute) == "row"
+    assert sent == [["SELECT 1"], ["SELECT 1"]]
+
+
+def test_execute_with_reconnect_does_not_retry_mid_transaction():
+    db = Mock(info={})
+    db.in_transaction.return_value = True
+    execute = Mock(side_effect=_disconnect_error())
+
+    with pytest.raises(DBAPIError):
+        execute_with_reconnect(db, execute)
+
+    assert execute.call_count == 1
+    db.rollback.assert_not_called()
+
+
+def test_unsent_search_path_does_not_leak_to_the_next_checkout(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'pending.db'}", pool_size=1)
+    factory = sessionmaker(bind=engine)
+    install_search_path_hooks(engine, factory)
+    try:
+        db = factory()
+        db.info["schema_name"] = "tenant_a"
+        # Begins a transaction, and queues the search_path, without sending a statement.
+        db.connection()
+        db.close()
+
+        with engine.connect() as conn:
+            assert session_module._PENDING_SEARCH_PATH not in conn.info
+            # SQLite would reject a leftover "SET search_path" prefix.
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        engine.dispose()
+
+
+def _record_sent_statements(tenant, driver, monkeypatch) -> list:
+    """
+    Record what the driver is asked to send, with whether it was pipelined.
+
+    psycopg2 reports the final query string it sent on cursor.query;
+    psycopg 3 setup statements go through Connection.execute.
+    """
+    sent = []
+    if driver == "psycopg2":
+
+        @event.listens_for(tenant.engine, "after_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            sent.append((cursor.query.decode(), False))
+
+        return sent
+
+    import psycopg
+    from psycopg.pq import PipelineStatus
+
+    def pipelined(connection):
+        return connection.pgconn.pipeline_status != PipelineStatus.OFF
+
+    execute = psycopg.Connection.execute
+
+    def recording_execute(connection, query, *args, **kwargs):
+        sent.append((query, pipelined(connection)))
+        return execute(connection, query, *args, **kwargs)
+
+    monkeypatch.setattr(psycopg.Connection, "execute", recording_execute)
+
+    # Registered after install_search_path_hooks, so it sees the pipeline it opened.
+    @event.listens_for(tenant.engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement, pipelined(cursor.connection)))
+
+    return sent
+
+
+@pytest.mark.parametrize("driver", ["psycopg2", "psycopg"])
+def test_search_path_and_deadline_ride_with_the_first_statement(make_postgres_tenant, driver, monkeypatch):
+    tenant = make_postgres_tenant(driver=driver)
+    sent = _record_sent_statements(tenant, driver, monkeypatch)
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: 100.0)
+    query = text("SELECT tag_id FROM nfc_tags WHERE tag_id LIKE :pattern")
+
+    db = tenant.session(deadline=105.0)
+    try:
+        assert db.execute(query, {"pattern": "tag-%"}).all() == []
+        first = list(sent)
+        settings = db.execute(
+            text("SELECT current_schema(), current_setting('statement_timeout')")
+        ).one()
+    finally:
+        db.close()
+
+    setup = [search_path_sql(tenant.schema), deadline_sql(105.0)]
+    if driver == "psycopg2":
+        # One execute, so one round trip: the setup is prepended to the query.
+        assert first == [("; ".join(setup) + "; SELECT tag_id FROM nfc_tags WHERE tag_id LIKE 'tag-%'", False)]
+    else:
+        # Setup and query are queued in one pipeline and synced together.
+        statement = "SELECT tag_id FROM nfc_tags WHERE tag_id LIKE %(pattern)s"
+        assert first == [(setup[0], True), (setup[1], True), (statement, True)]
+    assert tuple(settings) == (tenant.schema, "5s")
+
+
+@pytest.mark.parametrize("driver", ["psycopg2", "psycopg"])
+def test_unsent_setup_is_cleared_on_checkin(make_postgres_tenant, driver):
+    tenant = make_postgres_tenant(driver=driver)
+    db = tenant.session(deadline=time.monotonic() + 5)
+    # Begins a transaction, and queues the setup, without sending a statement.
+    db.connection()
+    db.close()
+
+    assert tenant.engine.pool.checkedin() == 1
+    with tenant.engine.connect() as conn:
+        assert conn.exec_driver_sql("SHOW statement_timeout").scalar() == "0"
+        assert conn.exec_driver_sql("SELECT current_schema()").scalar() != tenant.schema
+
+
+@pytest.fixture()
+def pinged_engine(tmp_path, monkeypatch):
+    pings = Mock()
+    monkeypatch.setattr(session_module, "pool_pings_counter", pings)
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'liveness.db'}", pool_size=1)
+    install_liveness_checks(engine, ping_idle_seconds=60)
+    yield engine, pings
+    engine.dispose()
+
+
+def test_liveness_check_skips_recently_used_connection(pinged_engine):
+    engine, pings = pinged_engine
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    pings.add.assert_not_called()
+
+
+def test_liveness_check_replaces_idle_dead_connection(pinged_engine, monkeypatch):
+    engine, pings = pinged_engine
+    stale = Mock()
+    monkeypatch.setattr(session_module, "pool_stale_connections_counter", stale)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        first_dbapi_connection = conn.connection.dbapi_connection
+
+    now = session_module.time.monotonic()
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: now + 120)
+    monkeypatch.setattr(
+        engine.dialect,
+        "do_ping",
+        Mock(side_effect=sqlite3.OperationalError("server closed the connection")),
+    )
+    monkeypatch.setattr(engine.dialect, "is_disconnect", lambda *_: True)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert conn.connection.dbapi_connection is not first_dbapi_connection
+
+    # The replacement connection is fresh, so it is not pinged again.
+    pings.add.assert_called_once_with(1)
+    stale.add.assert_called_once_with(1, attributes={"detected_by": "ping"})
+
+
+def test_get_db_for_org_uses_cached_schema_name(monkeypatch):
+    monkeypatch.setattr(session_module, "_schema_names", {"org-1": "tenant_a"})
+
+    db = get_db_for_org("org-1")
+
+    try:
+        assert db.info["schema_name"] == "tenant_a"
+        assert not db.in_transaction()
+    finally:
+        db.close()
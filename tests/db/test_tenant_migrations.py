@@ -0,0 +1,110 @@
+"""
+Unit Tests for the Tenant Migration Runner
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Unit tests for the worker bound, failure handling and report of the
+    multi-tenant migration runner, with threads and a fake migration.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db import tenant_migrations
+from app.db.tenant_migrations import run
+
+
+class FakeMigration:
+    def __init__(self, failing=(), seconds=0.01):
+        self.failing = set(failing)
+        self.seconds = seconds
+        self.running = 0
+        self.peak = 0
+        self.started = []
+        self._lock = threading.Lock()
+
+    def __call__(self, database_url, schema, revision):
+        with self._lock:
+            self.started.append(schema)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+
+        result = tenant_migrations._result(schema, tenant_migrations.UPGRADED)
+        if schema in self.failing:
+            result.update(status=tenant_migrations.FAILED, error="LockNotAvailable")
+        else:
+            result.update(from_revision="000006", to_revision=revision)
+        result["duration_s"] = self.seconds
+        return result
+
+
+def test_runs_every_schema_with_bounded_workers():
+    migration = FakeMigration()
+    schemas = [f"tenant_{i:02d}" for i in range(12)]
+
+    report = run(
+        "postgresql://",
+        schemas,
+        "000007",
+        workers=3,
+        migrate=migration,
+        executor_factory=ThreadPoolExecutor,
+    )
+
+    assert sorted(migration.started) == schemas
+    assert migration.peak == 3
+    assert report["upgraded"] == 12 and report["failed"] == 0
+    assert [result["schema"] for result in report["results"]] == schemas
+    assert report["results"][0]["to_revision"] == "000007"
+
+
+def test_a_failing_schema_does_not_stop_the_others():
+    migration = FakeMigration(failing={"tenant_b"})
+
+    report = run(
+        "postgresql://",
+        ["tenant_a", "tenant_b", "tenant_c"],
+        workers=2,
+        migrate=migration,
+        executor_factory=ThreadPoolExecutor,
+    )
+
+    assert report["failed"] == 1 and report["upgraded"] == 2
+    assert report["results"][1]["error"] == "LockNotAvailable"
+
+
+def test_fail_fast_skips_schemas_not_yet_started():
+    migration = FakeMigration(failing={"tenant_00"})
+    schemas = [f"tenant_{i:02d}" for i in range(10)]
+
+    report = run(
+        "postgresql://",
+        schemas,
+        workers=1,
+        fail_fast=True,
+        migrate=migration,
+        executor_factory=ThreadPoolExecutor,
+    )
+
+    assert report["failed"] == 1
+    assert report["skipped"] >= 8
+    assert len(migration.started) == report["schemas"] - report["skipped"]
+
+
+def test_worker_crash_is_reported_as_a_failure():
+    def crash(database_url, schema, revision):
+        raise RuntimeError("worker died")
+
+    report = run("postgresql://", ["tenant_a"], migrate=crash, executor_factory=ThreadPoolExecutor)
+
+    assert report["failed"] == 1
+    assert report["results"][0]["error"] == "RuntimeError: worker died"
@@ -22,7 +22,7 @@ from sqlalchemy.orm import sessionmaker
 
 import app.nfc.router as nfc_router
 from app.auth.dependencies import get_current_user
-from app.main import app, consumer
+from app.main import app, consumer, warmup
 
 
 @pytest.fixture()
@@ -31,6 +31,7 @@ def e2e_client(tmp_path, monkeypatch):
     monkeypatch.setenv("RABBITMQ_CONSUMER_ENABLED", "false")
     monkeypatch.setattr(consumer, "start", lambda: None)
     monkeypatch.setattr(consumer, "stop", lambda: None)
+    monkeypatch.setattr(warmup, "start", lambda: None)
 
     db_path = tmp_path / "nfc_test.db"
     engine = create_engine(
@@ -60,7 +61,8 @@ def e2e_client(tmp_path, monkeypatch):
                     patient_id TEXT,
                     status TEXT,
                     issued_at TEXT,
-                    deactivated_at TEXT
+                    deactivated_at TEXT,
+                    updated_at TEXT
                 )
                 """
             )
@@ -198,3 +200,29 @@ def test_resolve_inactive_tag_returns_403(e2e_client):
     response = client.post("/nfc/resolve", json={"tag_id": "tag-1"})
     assert response.status_code == 403
     assert response.json()["detail"] == "NFC tag is not active"
+
+
+def test_assign_second_tag_to_patient_returns_409(e2e_client):
+    client, published_events, entity_id, _other_entity_id = e2e_client
+
+    response = client.post(
+        "/nfc/assign",
+        json={"tag_id": "tag-1", "patient_id": entity_id},
+    )
+    assert response.status_code == 201
+
+    response = client.post(
+        "/nfc/assign",
+        json={"tag_id": "tag-2", "patient_id": entity_id},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Patient already has an active NFC tag"
+
+    response = client.post(
+        "/nfc/assign",
+        json={"tag_id": "tag-3", "patient_id": "00000000-0000-0000-0000-000000000099"},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Patient not found"
+
+    assert [event["routing_key"] for event in published_events] == ["nfc.assigned"]
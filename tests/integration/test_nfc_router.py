@@ -12,15 +12,27 @@ Description:
     Tests HTTP routing, request/response handling, and endpoint behavior.
 """
 
+import base64
 from unittest.mock import Mock
 from uuid import UUID
 
 import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 
 import app.nfc.router as nfc_router
+import app.nfc.services.nfc_service as nfc_service_module
 from app.auth.dependencies import get_current_user
-from app.main import app, consumer
+from app.config import config
+from app.main import app, consumer, warmup
+from app.nfc.tag_filter import TenantTagFilters
+import app.traffic.admission as admission_module
+from app.traffic.admission import OrganizationAdmission
+import app.traffic.shedding as shedding_module
+from app.traffic.deadlines import current_deadline
+from app.traffic.shedding import LoadShedder
 
 
 class _DummyDB:
@@ -32,8 +44,10 @@ class _DummyDB:
 def client_with_service(monkeypatch):
     monkeypatch.setattr(consumer, "start", lambda: None)
     monkeypatch.setattr(consumer, "stop", lambda: None)
+    monkeypatch.setattr(warmup, "start", lambda: None)
 
     service = Mock()
+    service.get_etag.return_value = None
 
     monkeypatch.setattr(nfc_router, "get_db_for_org", lambda *_: _DummyDB())
     monkeypatch.setattr(nfc_router, "NfcRepository", lambda *_: object())
@@ -239,3 +253,295 @@ def test_get_stats_endpoint(client_with_service):
     assert response.status_code == 200
     assert response.json() == service.get_stats.return_value
     service.get_stats.assert_called_once_with()
+
+
+def test_server_timing_header_reports_request_phases(client_with_service, monkeypatch):
+    client, service = client_with_service
+    monkeypatch.setattr(config, "SERVER_TIMING_ENABLED", True)
+    service.resolve_tag.return_value = {
+        "patient_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "org-1",
+    }
+
+    response = client.post("/nfc/resolve", json={"tag_id": "tag-1"})
+
+    assert response.status_code == 200
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert phases == ["session", "serialization", "total"]
+
+
+def test_server_timing_header_disabled_by_default(client_with_service):
+    client, service = client_with_service
+    service.get_stats.return_value = {"total": 0, "active": 0, "inactive": 0}
+
+    response = client.get("/nfc/stats")
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+@pytest.mark.parametrize("fast_responses", [True, False])
+def test_assign_response_matches_with_and_without_fast_responses(
+    client_with_service,
+    monkeypatch,
+    fast_responses,
+):
+    client, service = client_with_service
+    monkeypatch.setattr(config, "FAST_RESPONSES_ENABLED", fast_responses)
+    service.assign_tag.return_value = {
+        "tag_id": "tag-1",
+        "patient_id": UUID("00000000-0000-0000-0000-000000000001"),
+        "organization_id": "org-1",
+        "status": "active",
+    }
+
+    response = client.post(
+        "/nfc/assign",
+        json={
+            "tag_id": "tag-1",
+            "patient_id": "00000000-0000-0000-0000-000000000001",
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "tag_id": "tag-1",
+        "patient_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "org-1",
+        "status": "active",
+    }
+
+
+_TAG = {
+    "tag_id": "tag-1",
+    "patient_id": "00000000-0000-0000-0000-000000000001",
+    "organization_id": "org-1",
+    "status": "inactive",
+    "issued_at": "2024-01-02T03:04:05",
+    "deactivated_at": None,
+}
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "service_method", "result"),
+    [
+        ("post", "/nfc/resolve", {"tag_id": "tag-1"}, "resolve_tag",
+         {"patient_id": _TAG["patient_id"], "organization_id": "org-1"}),
+        ("get", "/nfc/tag-1", None, "get_tag", _TAG),
+        ("get", "/nfc/", None, "get_all_tags",
+         {"items": [_TAG, {**_TAG, "tag_id": "tag-é", "status": "active"}], "next_cursor": "tag-é"}),
+        ("get", "/nfc/stats", None, "get_stats", {"total": 3, "active": 2, "inactive": 1}),
+        ("get", "/nfc/changes", None, "get_changes",
+         {"items": [{**_TAG, "updated_at": "2024-02-01T00:00:00", "change_seq": 7}],
+          "next_since": 7, "has_more": False}),
+        ("post", "/nfc/assign", {"tag_id": "tag-1", "patient_id": _TAG["patient_id"]}, "assign_tag",
+         {"tag_id": "tag-1", "patient_id": UUID(_TAG["patient_id"]),
+          "organization_id": "org-1", "status": "active"}),
+    ],
+)
+def test_fast_responses_match_the_validated_bytes(
+    client_with_service, monkeypatch, method, path, body, service_method, result
+):
+    client, service = client_with_service
+    getattr(service, service_method).return_value = result
+
+    responses = {}
+    for fast in (False, True):
+        monkeypatch.setattr(config, "FAST_RESPONSES_ENABLED", fast)
+        responses[fast] = getattr(client, method)(path, **({"json": body} if body else {}))
+
+    validated, trusted = responses[False], responses[True]
+    assert validated.status_code == trusted.status_code < 300
+    assert trusted.content == validated.content
+    assert trusted.headers["content-type"] == validated.headers["content-type"]
+
+
+def test_resolve_rejects_unknown_tag_without_a_session(client_with_service, monkeypatch):
+    client, service = client_with_service
+    monkeypatch.setattr(config, "TAG_FILTER_ENABLED", True)
+    filters = TenantTagFilters()
+    monkeypatch.setattr(nfc_service_module, "tag_filters", filters)
+    monkeypatch.setattr(nfc_router, "cached_schema_name", lambda _org_id: "tenant_a")
+    get_db_for_org = Mock()
+    monkeypatch.setattr(nfc_router, "get_db_for_org", get_db_for_org)
+    filters.load("tenant_a", Mock(count_tags=lambda: 1, iter_tag_ids=lambda: ["tag-1"]))
+
+    response = client.post("/nfc/resolve", json={"tag_id": "tag-unknown"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "NFC tag not found"}
+    get_db_for_org.assert_not_called()
+    service.resolve_tag.assert_not_called()
+
+
+def test_organization_over_its_rate_gets_429_with_retry_after(client_with_service, monkeypatch):
+    client, service = client_with_service
+    monkeypatch.setattr(admission_module, "admission", OrganizationAdmission())
+    monkeypatch.setattr(config, "ADMISSION_RATE_PER_SECOND", 0.5)
+    monkeypatch.setattr(config, "ADMISSION_BURST", 2.0)
+    service.get_stats.return_value = {"total": 0, "active": 0, "inactive": 0}
+
+    statuses = [client.get("/nfc/stats").status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    response = client.get("/nfc/stats")
+    assert response.json() == {"detail": "Too many requests for this organization"}
+    assert response.headers["Retry-After"] == "2"
+    assert admission_module.admission.in_flight("org-1") == 0
+
+
+def test_overloaded_service_sheds_list_requests_but_still_resolves(client_with_service, monkeypatch):
+    client, service = client_with_service
+    monkeypatch.setattr(shedding_module, "shedder", LoadShedder(lambda _window: 10_000.0))
+    service.resolve_tag.return_value = {
+        "patient_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "org-1",
+    }
+
+    listed = client.get("/nfc/")
+    resolved = client.post("/nfc/resolve", json={"tag_id": "tag-1"})
+
+    assert listed.status_code == 503
+    assert listed.headers["Retry-After"] == "1"
+    service.get_all_tags.assert_not_called()
+    assert resolved.status_code == 200
+    assert shedding_module.shedder.in_flight == 0
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+@pytest.mark.parametrize(
+    ("pgcode", "status_code"),
+    [("55P03", 503), ("57014", 504)],
+)
+def test_database_deadline_errors_map_to_503_and_504(client_with_service, pgcode, status_code):
+    client, service = client_with_service
+    service.get_tag.side_effect = OperationalError("SELECT", {}, _PgError(pgcode))
+
+    response = client.get("/nfc/tag-1")
+
+    assert response.status_code == status_code
+
+
+def test_other_database_errors_are_not_treated_as_deadlines(client_with_service):
+    client, service = client_with_service
+    service.get_tag.side_effect = OperationalError("SELECT", {}, _PgError("23505"))
+
+    with pytest.raises(OperationalError):
+        client.get("/nfc/tag-1")
+
+
+def test_request_deadline_is_visible_to_the_handler(client_with_service, monkeypatch):
+    client, service = client_with_service
+    seen = {}
+
+    def get_db_for_org(*_args):
+        seen["deadline"] = current_deadline()
+        return _DummyDB()
+
+    monkeypatch.setattr(nfc_router, "get_db_for_org", get_db_for_org)
+    service.get_stats.return_value = {"total": 0, "active": 0, "inactive": 0}
+
+    assert client.get("/nfc/stats").status_code == 200
+    assert seen["deadline"] is not None
+    assert current_deadline() is None
+
+
+@pytest.mark.parametrize("fast_responses", [True, False])
+def test_tag_read_carries_etag_and_revalidates_with_304(client_with_service, monkeypatch, fast_responses):
+    client, service = client_with_service
+    monkeypatch.setattr(config, "FAST_RESPONSES_ENABLED", fast_responses)
+    service.get_etag.return_value = 'W/"v1"'
+    service.get_tag.return_value = {
+        "tag_id": "tag-1",
+        "patient_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "org-1",
+        "status": "active",
+        "issued_at": None,
+        "deactivated_at": None,
+    }
+
+    response = client.get("/nfc/tag-1")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert response.json()["tag_id"] == "tag-1"
+
+    revalidated = client.get("/nfc/tag-1", headers={"If-None-Match": '"other", W/"v1"'})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == 'W/"v1"'
+    service.get_tag.assert_called_once()
+
+
+def test_list_page_with_stale_etag_is_fetched(client_with_service):
+    client, service = client_with_service
+    service.get_etag.return_value = 'W/"v2"'
+    service.get_all_tags.return_value = {"items": [], "next_cursor": None}
+
+    response = client.get("/nfc/", headers={"If-None-Match": 'W/"v1"'})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == 'W/"v2"'
+    service.get_all_tags.assert_called_once()
+
+
+def test_snapshot_route_is_not_taken_for_a_tag_id(client_with_service, monkeypatch):
+    client, service = client_with_service
+    monkeypatch.setattr(config, "SNAPSHOT_SIGNING_KEY", "")
+
+    response = client.get("/nfc/snapshot")
+
+    assert response.status_code == 503
+    service.get_tag.assert_not_called()
+    service.get_snapshot.assert_not_called()
+
+
+def test_snapshot_304_varies_on_accept_encoding_like_the_200(client_with_service, monkeypatch):
+    client, service = client_with_service
+    raw = Ed25519PrivateKey.generate().private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+    monkeypatch.setattr(config, "SNAPSHOT_SIGNING_KEY", base64.b64encode(raw).decode("ascii"))
+    service.get_etag.return_value = 'W/"v1"'
+    service.get_snapshot.return_value = {"version": 1, "tags": {}}
+
+    full = client.get("/nfc/snapshot")
+    revalidated = client.get("/nfc/snapshot", headers={"If-None-Match": 'W/"v1"'})
+
+    assert full.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Vary"] == full.headers["Vary"]
+    assert "Accept-Encoding" in revalidated.headers["Vary"]
+    assert revalidated.headers["ETag"] == 'W/"v1"'
+    service.get_snapshot.assert_called_once()
+
+
+def test_change_feed_endpoint(client_with_service):
+    client, service = client_with_service
+    service.get_changes.return_value = {
+        "items": [
+            {
+                "tag_id": "tag-1",
+                "patient_id": "00000000-0000-0000-0000-000000000001",
+                "organization_id": "org-1",
+                "status": "active",
+                "issued_at": "2026-10-19T08:30:00",
+                "deactivated_at": None,
+                "updated_at": "2026-10-19T08:30:00",
+                "change_seq": 42,
+            }
+        ],
+        "next_since": 42,
+        "has_more": False,
+    }
+
+    response = client.get("/nfc/changes", params={"since": 41, "limit": 50})
+
+    assert response.status_code == 200
+    assert response.json() == service.get_changes.return_value
+    service.get_changes.assert_called_once_with(organization_id="org-1", since=41, limit=50)
+    service.get_tag.assert_not_called()
+    assert client.get("/nfc/changes", params={"since": -1}).status_code == 422
@@ -0,0 +1,119 @@
+"""
+Integration Tests for Startup Warm-up and Readiness
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Integration tests for the /ready endpoint and the warm-up steps.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import app.main as main
+from app.config import config
+from app.warmup import StartupWarmup
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setattr(main.consumer, "start", lambda: None)
+    monkeypatch.setattr(main.consumer, "stop", lambda: None)
+    monkeypatch.setattr(main.warmup, "start", lambda: None)
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_ready_returns_503_until_warmup_finishes(client, monkeypatch):
+    warmup = StartupWarmup(engine=None)
+    monkeypatch.setattr(main, "warmup", warmup)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up"}
+
+    monkeypatch.setattr(warmup, "_init_telemetry", lambda: None)
+    monkeypatch.setattr(warmup, "_warm_pool", lambda: None)
+    monkeypatch.setattr(warmup, "_warm_jwks", lambda: None)
+    monkeypatch.setattr("app.warmup.session.load_schema_map", lambda: {})
+    warmup.run()
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+    assert warmup.steps == {
+        "telemetry": "ok",
+        "pool": "ok",
+        "jwks": "ok",
+        "schema_map": "ok",
+        "tag_filter": "skipped",
+        "hot_tags": "skipped",
+    }
+
+
+def test_failed_warmup_step_does_not_block_readiness(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'warmup.db'}", pool_size=3)
+    monkeypatch.setattr(config, "WARMUP_POOL_CONNECTIONS", 2)
+    monkeypatch.setattr("app.warmup.auth.KEYCLOAK_URL", None)
+
+    def _unreachable():
+        raise ConnectionError("database unreachable")
+
+    monkeypatch.setattr("app.warmup.session.load_schema_map", _unreachable)
+
+    warmup = StartupWarmup(engine)
+    monkeypatch.setattr(warmup, "_init_telemetry", lambda: None)
+    warmup.run()
+
+    assert warmup.ready
+    assert engine.pool.checkedin() == 2
+    assert warmup.steps == {
+        "telemetry": "ok",
+        "pool": "ok",
+        "jwks": "skipped",
+        "schema_map": "failed: ConnectionError",
+        "tag_filter": "skipped",
+        "hot_tags": "skipped",
+    }
+    engine.dispose()
+
+
+def test_disabled_warmup_still_initializes_telemetry(monkeypatch):
+    monkeypatch.setattr(config, "WARMUP_ENABLED", False)
+    monkeypatch.setattr("app.warmup.telemetry.init_telemetry", lambda: False)
+
+    warmup = StartupWarmup(engine=None)
+    warmup.run()
+
+    assert warmup.ready
+    assert warmup.steps == {"telemetry": "failed: RuntimeError"}
+
+
+def test_startup_report_is_logged_before_ready(client, monkeypatch, caplog):
+    warmup = StartupWarmup(engine=None)
+    monkeypatch.setattr(main, "warmup", warmup)
+    monkeypatch.setattr(config, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(warmup, "_init_telemetry", lambda: None)
+    ready_when_logged = []
+    emit = main.startup_report.emit
+    monkeypatch.setattr(
+        main.startup_report,
+        "emit",
+        lambda: ready_when_logged.append(warmup.ready) or emit(),
+    )
+
+    with caplog.at_level("INFO", logger="app.observability.startup"):
+        warmup.run()
+
+    assert ready_when_logged == [False]
+    startup = next(
+        record.startup for record in caplog.records if record.getMessage() == "Startup report"
+    )
+    assert {"import.nfc", "init.logging", "warmup.telemetry"} <= set(startup["steps_ms"])
+    assert startup["elapsed_ms"] >= startup["steps_ms"]["import.nfc"]
@@ -0,0 +1,134 @@
+"""
+Unit Tests for the Event Publisher Circuit Breaker
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests breaker state transitions, spilling while the broker is down and
+    replay once it recovers.
+"""
+
+import logging
+import time
+
+import pytest
+
+from app.config import config
+from app.messaging.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.messaging.rabbitmq import EventPublisher
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Broker:
+    def __init__(self):
+        self.up = True
+        self.calls = 0
+        self.received = []
+
+    def __call__(self, events):
+        self.calls += 1
+        if not self.up:
+            raise ConnectionError("broker unreachable")
+        self.received.extend(events)
+
+
+def _wait_for(condition, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_breaker_opens_after_consecutive_failures_and_half_opens_after_reset(caplog):
+    clock = _Clock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=10, clock=clock)
+
+    with caplog.at_level(logging.INFO, logger="app.messaging.breaker"):
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure(ConnectionError("down"))
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        clock.now = 10
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0].startswith("Circuit breaker test opened (was closed)")
+    assert messages[-1] == "Circuit breaker test closed (was half_open)"
+
+
+@pytest.fixture()
+def breaker_config(monkeypatch):
+    monkeypatch.setattr(config, "RABBITMQ_BREAKER_ENABLED", True)
+    monkeypatch.setattr(config, "RABBITMQ_BREAKER_FAILURES", 2)
+    monkeypatch.setattr(config, "RABBITMQ_BREAKER_RESET_SECONDS", 0)
+    monkeypatch.setattr(config, "RABBITMQ_SPILL_BUFFER_SIZE", 3)
+
+
+def test_failed_events_are_spilled_without_raising(breaker_config, monkeypatch):
+    monkeypatch.setattr(config, "RABBITMQ_BREAKER_RESET_SECONDS", 60)
+    broker = _Broker()
+    broker.up = False
+    publisher = EventPublisher(broker)
+
+    for i in range(5):
+        publisher.publish("nfc.assigned", f"event-{i}")
+
+    # Two attempts open the breaker; later events are not attempted.
+    assert broker.calls == 2
+    assert publisher.breaker.state == OPEN
+    # The buffer keeps the newest events.
+    assert list(publisher._spilled) == [
+        ("nfc.assigned", "event-2"),
+        ("nfc.assigned", "event-3"),
+        ("nfc.assigned", "event-4"),
+    ]
+
+
+def test_spilled_events_are_replayed_after_the_broker_recovers(breaker_config):
+    broker = _Broker()
+    broker.up = False
+    publisher = EventPublisher(broker)
+    publisher.publish("nfc.assigned", "event-1")
+    publisher.publish("nfc.assigned", "event-2")
+    assert publisher.breaker.state == OPEN
+
+    broker.up = True
+    publisher.publish("nfc.assigned", "event-3")
+
+    _wait_for(lambda: publisher.pending() == 0 and not publisher._replaying)
+    assert publisher.breaker.state == CLOSED
+    assert [body for _key, body in broker.received] == ["event-3", "event-1", "event-2"]
+
+
+def test_disabled_breaker_publishes_directly_and_raises(breaker_config, monkeypatch):
+    monkeypatch.setattr(config, "RABBITMQ_BREAKER_ENABLED", False)
+    broker = _Broker()
+    broker.up = False
+    publisher = EventPublisher(broker)
+
+    with pytest.raises(ConnectionError):
+        publisher.publish("nfc.assigned", "event-1")
+    assert publisher.pending() == 0
@@ -0,0 +1,323 @@
+"""
+PostgreSQL Tests for the NFC Repository
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Runs the PostgreSQL-only paths of NfcRepository (the assign and replace
+    CTEs, the active-tag index conflict mapping, the tenant write lock and
+    the ETag version) against a tenant schema built by the migrations. Skipped unless
+    TEST_DATABASE_URL points at a scratch PostgreSQL database.
+"""
+
+import threading
+import time
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, text
+
+from app.config import config
+from app.nfc.repositories import ActiveTagConflictError, NfcRepository
+from app.nfc.services.nfc_service import NfcService
+from app.nfc.tag_filter import TenantTagFilters
+
+
+def add_patient(tenant) -> str:
+    patient_id = str(uuid.uuid4())
+    tenant.execute("INSERT INTO patients (id) VALUES (%(id)s)", {"id": patient_id})
+    return patient_id
+
+
+def add_tag(tenant, tag_id: str, patient_id: str, status: str = "active"):
+    tenant.execute(
+        "INSERT INTO nfc_tags (tag_id, patient_id, status) VALUES (%(tag_id)s, %(patient_id)s, %(status)s)",
+        {"tag_id": tag_id, "patient_id": patient_id, "status": status},
+    )
+
+
+def tag_states(tenant) -> dict:
+    return {
+        row.tag_id: (str(row.patient_id), row.status)
+        for row in tenant.execute("SELECT tag_id, patient_id, status FROM nfc_tags")
+    }
+
+
+def write(tenant, action):
+    db = tenant.session()
+    try:
+        repository = NfcRepository(db)
+        result = action(repository)
+        repository.commit()
+        return result
+    finally:
+        db.close()
+
+
+def test_assign_tag_outcomes(postgres_tenant):
+    patient = add_patient(postgres_tenant)
+    missing_patient = str(uuid.uuid4())
+
+    assert write(postgres_tenant, lambda r: r.assign_tag("tag-1", missing_patient)) == "patient_not_found"
+    assert write(postgres_tenant, lambda r: r.assign_tag("tag-1", patient)) == "assigned"
+    assert write(postgres_tenant, lambda r: r.assign_tag("tag-1", patient)) == "assigned"
+    assert write(postgres_tenant, lambda r: r.assign_tag("tag-2", patient)) == "conflict"
+
+    assert tag_states(postgres_tenant) == {"tag-1": (patient, "active")}
+
+
+def test_replace_tag_moves_the_patient_to_the_new_tag(postgres_tenant):
+    patient = add_patient(postgres_tenant)
+    add_tag(postgres_tenant, "old", patient)
+    add_tag(postgres_tenant, "spare", patient, status="inactive")
+
+    result = write(postgres_tenant, lambda r: r.replace_tag("old", "new"))
+    assert str(result.patient_id) == patient and not result.conflict
+    assert tag_states(postgres_tenant) == {
+        "old": (patient, "inactive"),
+        "new": (patient, "active"),
+        "spare": (patient, "inactive"),
+    }
+
+    # Onto an existing inactive tag of the same patient.
+    write(postgres_tenant, lambda r: r.replace_tag("new", "spare"))
+    assert tag_states(postgres_tenant)["spare"] == (patient, "active")
+    assert tag_states(postgres_tenant)["new"] == (patient, "inactive")
+
+
+def test_replace_tag_refuses_a_tag_of_another_patient(postgres_tenant):
+    patient, other_patient = add_patient(postgres_tenant), add_patient(postgres_tenant)
+    add_tag(postgres_tenant, "old", patient)
+    add_tag(postgres_tenant, "taken", other_patient, status="inactive")
+
+    result = write(postgres_tenant, lambda r: r.replace_tag("old", "taken"))
+
+    assert result.conflict
+    assert tag_states(postgres_tenant) == {
+        "old": (patient, "active"),
+        "taken": (other_patient, "inactive"),
+    }
+    assert write(postgres_tenant, lambda r: r.replace_tag("missing", "new")) is None
+
+
+def test_second_active_tag_maps_to_conflict(postgres_tenant):
+    patient = add_patient(postgres_tenant)
+    add_tag(postgres_tenant, "tag-1", patient)
+    add_tag(postgres_tenant, "tag-2", patient, status="inactive")
+
+    with pytest.raises(ActiveTagConflictError):
+        write(postgres_tenant, lambda r: r.transition_tag_to_active("tag-2"))
+
+    db = postgres_tenant.session()
+    try:
+        with pytest.raises(HTTPException) as exc:
+            NfcService(NfcRepository(db), Mock()).reactivate_tag("org-1", "tag-2")
+    finally:
+        db.close()
+    assert exc.value.status_code == 409
+
+
+def test_concurrent_assigns_for_one_patient_conflict(postgres_tenant):
+    patient = add_patient(postgres_tenant)
+    first = postgres_tenant.session()
+    outcome = {}
+
+    def assign_second():
+        db = postgres_tenant.session()
+        try:
+            NfcService(NfcRepository(db), Mock()).assign_tag("org-1", "user-1", "tag-2", patient)
+            outcome["status"] = 201
+        except HTTPException as exc:
+            outcome["status"] = exc.status_code
+        finally:
+            db.close()
+
+    try:
+        assert NfcRepository(first).assign_tag("tag-1", patient) == "assigned"
+        second = threading.Thread(target=assign_second)
+        second.start()
+        # The second assign cannot see the uncommitted first one and waits on it.
+        time.sleep(0.2)
+        assert second.is_alive()
+        first.commit()
+        second.join(timeout=5)
+    finally:
+        first.close()
+
+    assert outcome["status"] == 409
+    assert tag_states(postgres_tenant) == {"tag-1": (patient, "active")}
+
+
+@pytest.mark.parametrize("driver", ["psycopg2", "psycopg"])
+def test_writes_wait_for_the_tenant_lock_before_locking_rows(make_postgres_tenant, driver):
+    postgres_tenant = make_postgres_tenant(driver=driver)
+    add_tag(postgres_tenant, "tag-1", add_patient(postgres_tenant))
+    holder = postgres_tenant.engine.connect()
+    holder.exec_driver_sql(
+        "SELECT pg_advisory_xact_lock(hashtext(%(key)s))",
+        {"key": f"{postgres_tenant.schema}.nfc_tags"},
+    )
+    writer = threading.Thread(
+        target=write,
+        args=(postgres_tenant, lambda r: r.transition_tag_to_inactive("tag-1")),
+    )
+    writer.start()
+    try:
+        for _ in range(100):
+            waiting = postgres_tenant.execute(
+                "SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND NOT granted"
+            )
+            if waiting:
+                break
+            time.sleep(0.05)
+        assert waiting
+
+        # The waiting writer holds no row lock, so this does not fail.
+        postgres_tenant.execute("SELECT 1 FROM nfc_tags WHERE tag_id = 'tag-1' FOR UPDATE NOWAIT")
+    finally:
+        holder.commit()
+        holder.close()
+        writer.join(timeout=5)
+
+    assert tag_states(postgres_tenant)["tag-1"][1] == "inactive"
+
+
+@pytest.mark.parametrize("driver", ["psycopg2", "psycopg"])
+def test_tenant_lock_is_sent_with_the_write(make_postgres_tenant, driver):
+    tenant = make_postgres_tenant(driver=driver)
+    add_tag(tenant, "tag-1", add_patient(tenant))
+    statements = []
+    event.listen(
+        tenant.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    write(tenant, lambda repository: repository.transition_tag_to_inactive("tag-1"))
+
+    # No separate execute for the lock: it shares the write's round trip.
+    assert len(statements) == 1
+    assert tag_states(tenant)["tag-1"][1] == "inactive"
+
+
+def read_with_etag(tenant, tag_id: str):
+    db = tenant.session()
+    try:
+        service = NfcService(NfcRepository(db), Mock())
+        etag = service.get_etag()
+        return etag, service.get_tag("org-1", tag_id)["status"]
+    finally:
+        db.close()
+
+
+def test_etag_ignores_uncommitted_writes(postgres_tenant):
+    add_tag(postgres_tenant, "tag-1", add_patient(postgres_tenant))
+    before = read_with_etag(postgres_tenant, "tag-1")
+
+    writer = postgres_tenant.session()
+    try:
+        NfcRepository(writer).transition_tag_to_inactive("tag-1")
+        # The write has taken a change_seq but is not visible yet: a client
+        # caching this body must not be told it is current after the commit.
+        assert read_with_etag(postgres_tenant, "tag-1") == before
+        writer.commit()
+    finally:
+        writer.close()
+
+    etag, status = read_with_etag(postgres_tenant, "tag-1")
+    assert status == "inactive" and etag != before[0]
+
+
+def test_etag_changes_when_a_tag_is_deleted(postgres_tenant):
+    patient = add_patient(postgres_tenant)
+    add_tag(postgres_tenant, "tag-1", patient)
+    add_tag(postgres_tenant, "tag-2", patient, status="inactive")
+    before, _status = read_with_etag(postgres_tenant, "tag-1")
+
+    postgres_tenant.execute("DELETE FROM nfc_tags WHERE tag_id = 'tag-2'")
+
+    assert read_with_etag(postgres_tenant, "tag-1")[0] != before
+
+
+def test_version_migration_starts_from_the_latest_change_seq(make_postgres_tenant):
+    tenant = make_postgres_tenant("20261019_000008")
+    patient = add_patient(tenant)
+    add_tag(tenant, "tag-1", patient)
+    add_tag(tenant, "tag-2", patient, status="inactive")
+
+    tenant.migrate()
+
+    db = tenant.session()
+    try:
+        version = NfcRepository(db).get_change_version()
+        assert version == db.execute(text("SELECT MAX(change_seq) FROM nfc_tags")).scalar()
+    finally:
+        db.close()
+    tenant.execute("UPDATE nfc_tags SET status = 'inactive' WHERE tag_id = 'tag-1'")
+    db = tenant.session()
+    try:
+        assert NfcRepository(db).get_change_version() > version
+    finally:
+        db.close()
+
+
+def test_tag_filter_refresh_picks_up_backdated_tags(postgres_tenant, monkeypatch):
+    monkeypatch.setattr(config, "TAG_FILTER_ENABLED", True)
+    filters = TenantTagFilters()
+    schema = postgres_tenant.schema
+    db = postgres_tenant.session()
+    try:
+        filters.load(schema, NfcRepository(db))
+    finally:
+        db.close()
+
+    postgres_tenant.execute(
+        """
+        INSERT INTO nfc_tags (tag_id, patient_id, status, issued_at)
+        VALUES ('backdated', %(patient_id)s, 'active', '2020-01-01'),
+               ('undated', %(patient_id)s, 'inactive', NULL)
+        """,
+        {"patient_id": add_patient(postgres_tenant)},
+    )
+    db = postgres_tenant.session()
+    try:
+        filters.refresh(schema, NfcRepository(db))
+    finally:
+        db.close()
+
+    assert filters.might_contain(schema, "backdated")
+    assert filters.might_contain(schema, "undated")
+
+
+def test_active_tag_index_migration_keeps_the_latest_active_tag(make_postgres_tenant):
+    tenant = make_postgres_tenant("20260108_000002")
+    patient, other_patient = str(uuid.uuid4()), str(uuid.uuid4())
+    for tag_id, patient_id, issued_at in (
+        ("older", patient, "2026-01-01"),
+        ("newest", patient, "2026-03-01"),
+        ("undated", patient, None),
+        ("single", other_patient, "2026-02-01"),
+    ):
+        tenant.execute(
+            """
+            INSERT INTO nfc_tags (id, tag_id, patient_id, status, issued_at)
+            VALUES (gen_random_uuid(), %(tag_id)s, %(patient_id)s, 'active', %(issued_at)s)
+            """,
+            {"tag_id": tag_id, "patient_id": patient_id, "issued_at": issued_at},
+        )
+
+    tenant.migrate()
+
+    states = {tag_id: status for tag_id, (_patient, status) in tag_states(tenant).items()}
+    assert states == {
+        "older": "inactive",
+        "newest": "active",
+        "undated": "inactive",
+        "single": "active",
+    }
@@ -12,11 +12,16 @@ Description:
     Tests all NFC operations: assign, deactivate, reactivate, replace, resolve, and retrieval.
 """
 
+from collections import namedtuple
+from datetime import datetime
+from uuid import UUID
+
 import pytest
 from fastapi import HTTPException
 from types import SimpleNamespace
 from unittest.mock import Mock
 
+from app.nfc.repositories import ActiveTagConflictError, TagRecord
 from app.nfc.services.nfc_service import NfcService
 
 
@@ -40,7 +45,7 @@ def test_resolve_tag_missing():
 
 def test_resolve_tag_inactive():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.get_tag.return_value = TagRecord(
         tag_id="tag-1",
         patient_id=123,
         status="inactive",
@@ -55,7 +60,7 @@ def test_resolve_tag_inactive():
 
 def test_resolve_tag_publishes_event():
     service, repository, publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.get_tag.return_value = TagRecord(
         tag_id="tag-1",
         patient_id=123,
         status="active",
@@ -80,35 +85,48 @@ def test_resolve_tag_publishes_event():
 
 def test_assign_tag_missing_patient():
     service, repository, _publisher = make_service()
-    repository.get_patient.return_value = None
+    repository.assign_tag.return_value = "patient_not_found"
 
     with pytest.raises(HTTPException) as exc:
         service.assign_tag("org-1", "user-1", "tag-1", 101)
 
     assert exc.value.status_code == 404
     assert exc.value.detail == "Patient not found"
+    repository.commit.assert_not_called()
 
 
 def test_assign_tag_conflict():
     service, repository, _publisher = make_service()
-    repository.get_patient.return_value = SimpleNamespace(id=101)
-    repository.get_active_tag_for_patient.return_value = SimpleNamespace(tag_id="tag-x")
+    repository.assign_tag.return_value = "conflict"
 
     with pytest.raises(HTTPException) as exc:
         service.assign_tag("org-1", "user-1", "tag-1", 101)
 
     assert exc.value.status_code == 409
     assert exc.value.detail == "Patient already has an active NFC tag"
+    repository.commit.assert_not_called()
+
+
+def test_assign_tag_concurrent_conflict():
+    service, repository, publisher = make_service()
+    repository.assign_tag.side_effect = ActiveTagConflictError()
+
+    with pytest.raises(HTTPException) as exc:
+        service.assign_tag("org-1", "user-1", "tag-1", 101)
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Patient already has an active NFC tag"
+    publisher.assert_not_called()
 
 
 def test_assign_tag_same_existing_tag_allows_update():
     service, repository, publisher = make_service()
-    repository.get_patient.return_value = SimpleNamespace(id=101)
-    repository.get_active_tag_for_patient.return_value = SimpleNamespace(tag_id="tag-1")
+    repository.assign_tag.return_value = "assigned"
 
     result = service.assign_tag("org-1", "user-1", "tag-1", 101)
 
-    repository.upsert_tag.assert_called_once_with("tag-1", 101)
+    repository.assign_tag.assert_called_once_with("tag-1", 101)
+    repository.get_patient.assert_not_called()
     repository.commit.assert_called_once()
     publisher.assert_called_once_with(
         routing_key="nfc.assigned",
@@ -130,7 +148,7 @@ def test_assign_tag_same_existing_tag_allows_update():
 
 def test_deactivate_tag_missing():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = None
+    repository.transition_tag_to_inactive.return_value = None
 
     with pytest.raises(HTTPException) as exc:
         service.deactivate_tag("org-1", "tag-1")
@@ -141,15 +159,17 @@ def test_deactivate_tag_missing():
 
 def test_deactivate_tag_skips_if_already_inactive():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.transition_tag_to_inactive.return_value = SimpleNamespace(
         tag_id="tag-1",
         patient_id=101,
         status="inactive",
+        changed=False,
     )
 
     result = service.deactivate_tag("org-1", "tag-1")
 
-    repository.deactivate_tag.assert_not_called()
+    repository.transition_tag_to_inactive.assert_called_once_with("tag-1")
+    repository.get_tag.assert_not_called()
     repository.commit.assert_not_called()
     assert result == {
         "tag_id": "tag-1",
@@ -160,17 +180,19 @@ def test_deactivate_tag_skips_if_already_inactive():
 
 def test_deactivate_tag_changes_status():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.transition_tag_to_inactive.return_value = SimpleNamespace(
         tag_id="tag-1",
         patient_id=101,
-        status="active",
+        status="inactive",
         issued_at=None,
         deactivated_at=None,
+        changed=True,
     )
 
     result = service.deactivate_tag("org-1", "tag-1")
 
-    repository.deactivate_tag.assert_called_once_with("tag-1")
+    repository.transition_tag_to_inactive.assert_called_once_with("tag-1")
+    repository.get_tag.assert_not_called()
     repository.commit.assert_called_once()
     assert result == {
         "tag_id": "tag-1",
@@ -181,7 +203,7 @@ def test_deactivate_tag_changes_status():
 
 def test_reactivate_tag_missing():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = None
+    repository.transition_tag_to_active.return_value = None
 
     with pytest.raises(HTTPException) as exc:
         service.reactivate_tag("org-1", "tag-1")
@@ -192,17 +214,18 @@ def test_reactivate_tag_missing():
 
 def test_reactivate_tag_skips_if_already_active():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.transition_tag_to_active.return_value = SimpleNamespace(
         tag_id="tag-1",
         patient_id=101,
         status="active",
         issued_at=None,
         deactivated_at=None,
+        changed=False,
     )
 
     result = service.reactivate_tag("org-1", "tag-1")
 
-    repository.reactivate_tag.assert_not_called()
+    repository.transition_tag_to_active.assert_called_once_with("tag-1")
     repository.commit.assert_not_called()
     assert result == {
         "tag_id": "tag-1",
@@ -213,15 +236,16 @@ def test_reactivate_tag_skips_if_already_active():
 
 def test_reactivate_tag_changes_status():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.transition_tag_to_active.return_value = SimpleNamespace(
         tag_id="tag-1",
         patient_id=101,
-        status="inactive",
+        status="active",
+        changed=True,
     )
 
     result = service.reactivate_tag("org-1", "tag-1")
 
-    repository.reactivate_tag.assert_called_once_with("tag-1")
+    repository.transition_tag_to_active.assert_called_once_with("tag-1")
     repository.commit.assert_called_once()
     assert result == {
         "tag_id": "tag-1",
@@ -230,48 +254,60 @@ def test_reactivate_tag_changes_status():
     }
 
 
+def test_reactivate_tag_conflict_with_other_active_tag():
+    service, repository, _publisher = make_service()
+    repository.transition_tag_to_active.side_effect = ActiveTagConflictError()
+
+    with pytest.raises(HTTPException) as exc:
+        service.reactivate_tag("org-1", "tag-1")
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Patient already has an active NFC tag"
+    repository.commit.assert_not_called()
+
+
 def test_replace_tag_same_id_rejected():
-    service, _repository, _publisher = make_service()
+    service, repository, _publisher = make_service()
 
     with pytest.raises(HTTPException) as exc:
         service.replace_tag("org-1", "tag-1", "tag-1")
 
     assert exc.value.status_code == 400
     assert exc.value.detail == "Old and new tag IDs must differ"
+    repository.replace_tag.assert_not_called()
 
 
 def test_replace_tag_missing_old_tag():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = None
+    repository.replace_tag.return_value = None
 
     with pytest.raises(HTTPException) as exc:
         service.replace_tag("org-1", "tag-1", "tag-2")
 
     assert exc.value.status_code == 404
     assert exc.value.detail == "NFC tag not found"
+    repository.commit.assert_not_called()
 
 
 def test_replace_tag_conflict_on_new_tag():
     service, repository, _publisher = make_service()
-    old_tag = SimpleNamespace(tag_id="tag-1", patient_id=101, status="active")
-    repository.get_tag.side_effect = [old_tag, SimpleNamespace(tag_id="tag-2", patient_id=202, status="active")]
+    repository.replace_tag.return_value = SimpleNamespace(patient_id=101, conflict=True)
 
     with pytest.raises(HTTPException) as exc:
         service.replace_tag("org-1", "tag-1", "tag-2")
 
     assert exc.value.status_code == 409
     assert exc.value.detail == "New tag is assigned to a different patient"
+    repository.commit.assert_not_called()
 
 
 def test_replace_tag_happy_path():
     service, repository, _publisher = make_service()
-    old_tag = SimpleNamespace(tag_id="tag-1", patient_id=101, status="active")
-    repository.get_tag.side_effect = [old_tag, None]
+    repository.replace_tag.return_value = SimpleNamespace(patient_id=101, conflict=False)
 
     result = service.replace_tag("org-1", "tag-1", "tag-2")
 
-    repository.upsert_tag.assert_called_once_with("tag-2", 101)
-    repository.deactivate_tag.assert_called_once_with("tag-1")
+    repository.replace_tag.assert_called_once_with("tag-1", "tag-2")
     repository.commit.assert_called_once()
     assert result == {
         "old_tag_id": "tag-1",
@@ -295,7 +331,7 @@ def test_get_tag_missing():
 
 def test_get_tag_success():
     service, repository, _publisher = make_service()
-    repository.get_tag.return_value = SimpleNamespace(
+    repository.get_tag.return_value = TagRecord(
         tag_id="tag-1",
         patient_id=101,
         status="active",
@@ -328,7 +364,7 @@ def test_get_tag_by_patient_missing():
 
 def test_get_tag_by_patient_success():
     service, repository, _publisher = make_service()
-    repository.get_tag_for_patient.return_value = SimpleNamespace(
+    repository.get_tag_for_patient.return_value = TagRecord(
         tag_id="tag-1",
         patient_id=101,
         status="active",
@@ -361,9 +397,9 @@ def test_get_all_tags_invalid_status():
 def test_get_all_tags_paginates_and_normalizes_search():
     service, repository, _publisher = make_service()
     repository.get_all_tags.return_value = [
-        SimpleNamespace(tag_id="tag-1", patient_id=101, status="active", issued_at=None, deactivated_at=None),
-        SimpleNamespace(tag_id="tag-2", patient_id=102, status="inactive", issued_at=None, deactivated_at=None),
-        SimpleNamespace(tag_id="tag-3", patient_id=103, status="active", issued_at=None, deactivated_at=None),
+        TagRecord(tag_id="tag-1", patient_id=101, status="active", issued_at=None, deactivated_at=None),
+        TagRecord(tag_id="tag-2", patient_id=102, status="inactive", issued_at=None, deactivated_at=None),
+        TagRecord(tag_id="tag-3", patient_id=103, status="active", issued_at=None, deactivated_at=None),
     ]
 
     result = service.get_all_tags("org-1", limit=2, cursor=None, status=None, search="  ")
@@ -426,3 +462,109 @@ def test_deactivate_all_tags_commits():
 
     repository.deactivate_all_tags.assert_called_once_with()
     repository.commit.assert_called_once()
+
+
+def test_tag_record_to_wire_formats_timestamps_and_ids():
+    record = TagRecord.from_row(
+        (
+            "tag-1",
+            UUID("00000000-0000-0000-0000-000000000001"),
+            "inactive",
+            datetime(2024, 1, 2, 3, 4, 5),
+            "2024-02-01 00:00:00",
+        )
+    )
+
+    assert record.to_wire("org-1") == {
+        "tag_id": "tag-1",
+        "patient_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "org-1",
+        "status": "inactive",
+        "issued_at": "2024-01-02T03:04:05",
+        "deactivated_at": "2024-02-01 00:00:00",
+    }
+    assert TagRecord.from_row(None) is None
+    assert not hasattr(record, "__dict__")
+
+
+def test_get_etag_follows_tenant_version():
+    service, repository, _publisher = make_service()
+    repository.schema_name = "tenant_a"
+    repository.get_change_version.return_value = 7
+    first = service.get_etag()
+
+    repository.get_change_version.return_value = 8
+    second = service.get_etag()
+
+    assert first.startswith('W/"') and first != second
+    repository.schema_name = "tenant_b"
+    assert service.get_etag() != second
+
+
+def test_reads_only_coalesce_with_reads_of_the_same_version(monkeypatch):
+    keys = []
+    monkeypatch.setattr(
+        "app.nfc.services.nfc_service.tag_reads.do",
+        lambda operation, key, load: keys.append(key) or load(),
+    )
+    service, repository, _publisher = make_service()
+    repository.schema_name = "tenant_a"
+    repository.get_stats.return_value = SimpleNamespace(total=1, active=1, inactive=0)
+
+    service.get_stats()
+    repository.get_change_version.return_value = 8
+    service.get_etag()
+    service.get_stats()
+
+    assert keys == [("tenant_a", None), ("tenant_a", 8)]
+
+
+def test_get_etag_is_none_without_a_version():
+    service, repository, _publisher = make_service()
+    repository.get_change_version.return_value = None
+
+    assert service.get_etag() is None
+
+
+ChangeRow = namedtuple(
+    "ChangeRow",
+    "tag_id patient_id status issued_at deactivated_at updated_at change_seq",
+)
+
+
+def test_get_changes_pages_by_change_sequence():
+    service, repository, _publisher = make_service()
+    updated_at = datetime(2026, 10, 19, 8, 30)
+    repository.get_tag_changes_since.return_value = [
+        ChangeRow("tag-1", 101, "active", None, None, updated_at, 5),
+        ChangeRow("tag-2", 102, "inactive", None, updated_at, updated_at, 6),
+        ChangeRow("tag-3", 103, "active", None, None, updated_at, 9),
+    ]
+
+    page = service.get_changes("org-1", since=4, limit=2)
+
+    repository.get_tag_changes_since.assert_called_once_with(4, 3)
+    assert [item["tag_id"] for item in page["items"]] == ["tag-1", "tag-2"]
+    assert page["items"][1] == {
+        "tag_id": "tag-2",
+        "patient_id": "102",
+        "organization_id": "org-1",
+        "status": "inactive",
+        "issued_at": None,
+        "deactivated_at": "2026-10-19T08:30:00",
+        "updated_at": "2026-10-19T08:30:00",
+        "change_seq": 6,
+    }
+    assert page["next_since"] == 6
+    assert page["has_more"] is True
+
+
+def test_get_changes_without_changes_resumes_from_since():
+    service, repository, _publisher = make_service()
+    repository.get_tag_changes_since.return_value = []
+
+    assert service.get_changes("org-1", since=12, limit=100) == {
+        "items": [],
+        "next_since": 12,
+        "has_more": False,
+    }
@@ -0,0 +1,134 @@
+"""
+Unit Tests for Single-Flight Read Coalescing
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Checks that concurrent identical reads share one load, that errors other
+    than timeouts reach every waiter, and that keys are released once the
+    load finishes.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app.nfc.services.singleflight as singleflight
+from app.config import config
+from app.nfc.services.singleflight import SingleFlight
+
+
+@pytest.fixture()
+def counter(monkeypatch):
+    counter = Mock()
+    monkeypatch.setattr(singleflight, "singleflight_reads_counter", counter)
+    return counter
+
+
+def _run_concurrently(group, load, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do("get_tag", ("tenant_a", "tag-1"), load))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _wait_for_callers(counter, callers):
+    deadline = time.monotonic() + 5
+    while counter.add.call_count < callers:
+        assert time.monotonic() < deadline, "callers did not arrive"
+        time.sleep(0.001)
+
+
+def test_concurrent_identical_reads_share_one_load(counter):
+    group = SingleFlight()
+    release = threading.Event()
+    load = Mock(side_effect=lambda: release.wait() and {"tag_id": "tag-1"})
+
+    threads, results, errors = _run_concurrently(group, load, callers=5)
+    _wait_for_callers(counter, 5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert load.call_count == 1
+    assert errors == []
+    assert results == [{"tag_id": "tag-1"}] * 5
+    coalesced = [call.kwargs["attributes"]["coalesced"] for call in counter.add.call_args_list]
+    assert sorted(coalesced) == ["false"] + ["true"] * 4
+
+
+def test_load_error_is_raised_for_every_waiter(counter):
+    group = SingleFlight()
+    release = threading.Event()
+
+    def load():
+        release.wait()
+        raise ConnectionError("database unreachable")
+
+    threads, results, errors = _run_concurrently(group, load, callers=3)
+    _wait_for_callers(counter, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == []
+    assert len(errors) == 3
+    assert all(isinstance(error, ConnectionError) for error in errors)
+
+
+def test_waiters_run_their_own_load_after_a_leader_timeout(counter):
+    group = SingleFlight()
+    release = threading.Event()
+    timed_out = OperationalError("SELECT", {}, Mock(pgcode="57014"))
+    loads = []
+
+    def load():
+        loads.append(threading.current_thread())
+        if len(loads) == 1:
+            release.wait()
+            raise timed_out
+        return {"tag_id": "tag-1"}
+
+    threads, results, errors = _run_concurrently(group, load, callers=3)
+    _wait_for_callers(counter, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [timed_out]
+    assert results == [{"tag_id": "tag-1"}] * 2
+    assert len(loads) == 3
+
+
+def test_key_is_released_after_load(counter):
+    group = SingleFlight()
+    load = Mock(return_value="stats")
+
+    assert group.do("get_stats", "tenant_a", load) == "stats"
+    assert group.do("get_stats", "tenant_a", load) == "stats"
+
+    assert load.call_count == 2
+    assert group._calls == {}
+
+
+def test_disabled_singleflight_calls_load_directly(counter, monkeypatch):
+    monkeypatch.setattr(config, "SINGLEFLIGHT_ENABLED", False)
+    group = SingleFlight()
+
+    assert group.do("get_stats", "tenant_a", lambda: "stats") == "stats"
+    counter.add.assert_not_called()
@@ -0,0 +1,107 @@
+"""
+Unit Tests for Signed Resolution Snapshots
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests snapshot signing, compression and the snapshot service methods.
+"""
+
+import base64
+import gzip
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+from fastapi import HTTPException
+
+from app.config import config
+from app.nfc.services.nfc_service import NfcService
+from app.nfc.snapshots import public_key_info, signed_response
+
+
+@pytest.fixture()
+def signing_key(monkeypatch):
+    key = Ed25519PrivateKey.generate()
+    raw = key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+    monkeypatch.setattr(config, "SNAPSHOT_SIGNING_KEY", base64.b64encode(raw).decode("ascii"))
+    return key
+
+
+def _verify(response, body: bytes):
+    public_key = Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key_info()["public_key"]))
+    public_key.verify(base64.b64decode(response.headers["X-Snapshot-Signature"]), body)
+
+
+def test_signed_response_is_compressed_when_accepted(signing_key):
+    payload = {"version": 3, "tags": {"tag-1": "patient-1"}}
+
+    response = signed_response(payload, "br, gzip;q=0.8")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["X-Snapshot-Version"] == "3"
+    assert response.headers["X-Snapshot-Key-Id"] == public_key_info()["key_id"]
+    body = gzip.decompress(response.body)
+    assert body == b'{"version":3,"tags":{"tag-1":"patient-1"}}'
+    _verify(response, body)
+
+
+def test_signed_response_is_plain_without_gzip(signing_key):
+    response = signed_response({"version": 1}, "gzip;q=0")
+
+    assert "Content-Encoding" not in response.headers
+    _verify(response, response.body)
+
+
+def test_snapshot_needs_a_signing_key(monkeypatch):
+    monkeypatch.setattr(config, "SNAPSHOT_SIGNING_KEY", "")
+
+    with pytest.raises(HTTPException) as exc_info:
+        signed_response({"version": 1}, None)
+
+    assert exc_info.value.status_code == 503
+
+
+def test_get_snapshot_maps_active_tags_to_patients():
+    repository = Mock()
+    repository.get_active_tag_snapshot.return_value = (42, [("tag-1", 7), ("tag-2", 8)])
+
+    snapshot = NfcService(repository, Mock()).get_snapshot("org-1")
+
+    assert snapshot["version"] == 42
+    assert snapshot["organization_id"] == "org-1"
+    assert snapshot["tags"] == {"tag-1": "7", "tag-2": "8"}
+
+
+def test_get_snapshot_changes_splits_upserts_and_removals():
+    repository = Mock()
+    repository.get_tag_changes_since.return_value = [
+        SimpleNamespace(tag_id="tag-1", patient_id=7, status="inactive", change_seq=11),
+        SimpleNamespace(tag_id="tag-2", patient_id=8, status="active", change_seq=12),
+        SimpleNamespace(tag_id="tag-3", patient_id=9, status="active", change_seq=13),
+    ]
+    service = NfcService(repository, Mock())
+
+    page = service.get_snapshot_changes("org-1", since=10, limit=2)
+
+    repository.get_tag_changes_since.assert_called_once_with(10, 3)
+    assert page["upserts"] == {"tag-2": "8"}
+    assert page["removals"] == ["tag-1"]
+    assert page["version"] == 12
+    assert page["has_more"] is True
+
+
+def test_get_snapshot_changes_without_changes_keeps_the_version():
+    repository = Mock()
+    repository.get_tag_changes_since.return_value = []
+
+    page = NfcService(repository, Mock()).get_snapshot_changes("org-1", since=10, limit=100)
+
+    assert page["version"] == 10
+    assert page["has_more"] is False
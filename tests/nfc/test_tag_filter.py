@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Negative Lookup Tag Filter
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests the Bloom filter and the per-tenant filters that let /nfc/resolve
+    reject unknown tag IDs without a database query.
+"""
+
+import pytest
+
+from app.config import config
+from app.nfc.tag_filter import BloomFilter, TenantTagFilters
+
+
+class _FakeRepository:
+    def __init__(self, tag_ids, changed_since=(), version=0):
+        self.tag_ids = list(tag_ids)
+        self.changed_since = list(changed_since)
+        self.version = version
+        self.since = None
+        self.on_iter = None
+
+    def get_change_version(self):
+        return self.version
+
+    def count_tags(self):
+        return len(self.tag_ids)
+
+    def iter_tag_ids(self):
+        for tag_id in self.tag_ids:
+            if self.on_iter:
+                self.on_iter()
+                self.on_iter = None
+            yield tag_id
+
+    def get_tag_ids_changed_since(self, since):
+        self.since = since
+        return [(tag_id, seq) for tag_id, seq in self.changed_since if seq > since]
+
+
+@pytest.fixture()
+def enabled(monkeypatch):
+    monkeypatch.setattr(config, "TAG_FILTER_ENABLED", True)
+
+
+def test_bloom_filter_has_no_false_negatives_and_meets_target_rate():
+    bloom = BloomFilter(capacity=5000, fpp=0.01)
+    known = [f"tag-{i}" for i in range(5000)]
+    for tag_id in known:
+        bloom.add(tag_id)
+    bloom.add("tag-0")
+
+    assert all(tag_id in bloom for tag_id in known)
+    false_positives = sum(f"unknown-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    # A new key whose bits are all set already is not counted.
+    assert 4900 <= bloom.count <= 5000
+    assert bloom.estimated_fpp() == pytest.approx(0.01, rel=0.2)
+
+
+def test_unknown_tag_is_rejected_only_for_loaded_tenants(enabled):
+    filters = TenantTagFilters()
+    filters.load("tenant_a", _FakeRepository(["tag-1", "tag-2"]))
+
+    assert filters.might_contain("tenant_a", "tag-1")
+    assert not filters.might_contain("tenant_a", "tag-unknown")
+    assert filters.might_contain("tenant_b", "tag-unknown")
+    assert filters.might_contain(None, "tag-unknown")
+
+
+def test_disabled_filter_lets_every_tag_through(monkeypatch):
+    monkeypatch.setattr(config, "TAG_FILTER_ENABLED", False)
+    filters = TenantTagFilters()
+    filters.load("tenant_a", _FakeRepository(["tag-1"]))
+
+    assert filters.might_contain("tenant_a", "tag-unknown")
+
+
+def test_tags_written_during_a_load_are_kept(enabled):
+    filters = TenantTagFilters()
+    repository = _FakeRepository(["tag-1"])
+    repository.on_iter = lambda: filters.add("tenant_a", "tag-new")
+
+    filters.load("tenant_a", repository)
+
+    assert filters.might_contain("tenant_a", "tag-new")
+
+
+def test_load_and_refresh_add_to_the_bloom_under_the_lock(enabled, monkeypatch):
+    filters = TenantTagFilters()
+    unlocked = []
+    add = BloomFilter.add
+
+    def checked_add(bloom, key):
+        if not filters._lock.locked():
+            unlocked.append(key)
+        add(bloom, key)
+
+    monkeypatch.setattr(BloomFilter, "add", checked_add)
+    filters.load("tenant_a", _FakeRepository(["tag-1"]))
+    filters.refresh("tenant_a", _FakeRepository([], changed_since=[("tag-2", 1)]))
+
+    assert unlocked == []
+    assert filters.might_contain("tenant_a", "tag-2")
+
+
+def test_refresh_resumes_after_the_last_change_seq_seen(enabled):
+    filters = TenantTagFilters()
+    filters.load("tenant_a", _FakeRepository(["tag-1"], version=5))
+    repository = _FakeRepository([], changed_since=[("tag-2", 7), ("tag-3", 6)])
+
+    filters.refresh("tenant_a", repository)
+    assert repository.since == 5
+    assert filters.might_contain("tenant_a", "tag-2")
+    assert filters.might_contain("tenant_a", "tag-3")
+
+    repository.changed_since.append(("tag-4", 8))
+    filters.refresh("tenant_a", repository)
+    assert repository.since == 7
+    assert filters.might_contain("tenant_a", "tag-4")
+
+
+def test_refresh_rebuilds_filters_loaded_without_a_version(enabled):
+    filters = TenantTagFilters()
+    filters.load("tenant_a", _FakeRepository(["tag-1"], version=None))
+    repository = _FakeRepository(["tag-1", "tag-2"], version=None)
+
+    filters.refresh("tenant_a", repository)
+
+    assert repository.since is None
+    assert filters.might_contain("tenant_a", "tag-2")
+
+
+def test_refresh_loads_tenants_without_a_filter(enabled):
+    filters = TenantTagFilters()
+
+    filters.refresh("tenant_a", _FakeRepository(["tag-1"]))
+
+    assert not filters.might_contain("tenant_a", "tag-unknown")
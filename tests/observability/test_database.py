@@ -0,0 +1,45 @@
+"""
+Tests for the Database Instrumentation
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Checks that DB spans describe the query itself and not the search_path
+    and deadline statements that app.db.session prepends to the first
+    statement of a tenant transaction. Runs against TEST_DATABASE_URL.
+"""
+
+import time
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import text
+
+import app.observability.database as database_module
+from app.observability.database import instrument_database
+
+
+def test_spans_ignore_the_prepended_search_path_and_deadline(postgres_tenant, monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(database_module.trace, "get_tracer", provider.get_tracer)
+    instrument_database(postgres_tenant.engine)
+
+    db = postgres_tenant.session(deadline=time.monotonic() + 5)
+    try:
+        # The first statement carries SET search_path and both timeouts.
+        db.execute(text("SELECT tag_id FROM nfc_tags")).all()
+        assert db.execute(text("SHOW statement_timeout")).scalar() != "0"
+    finally:
+        db.close()
+
+    first = exporter.get_finished_spans()[0]
+    assert first.attributes["db.operation"] == "SELECT"
+    assert first.attributes["db.table"] == "nfc_tags"
+    assert first.attributes["db.statement"] == "SELECT tag_id FROM nfc_tags"
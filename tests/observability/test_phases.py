@@ -0,0 +1,47 @@
+"""
+Unit Tests for Request Phase Timing
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Unit tests for phase accumulation, the Server-Timing rendering and the
+    no-op behaviour outside a request.
+"""
+
+from app.observability.phases import (
+    begin_request_phases,
+    end_request_phases,
+    request_phase,
+)
+
+
+def test_request_phase_accumulates_repeated_phases():
+    phases, token = begin_request_phases()
+    try:
+        with request_phase("repository"):
+            pass
+        with request_phase("publish"):
+            pass
+        with request_phase("repository"):
+            pass
+    finally:
+        end_request_phases(token)
+
+    assert list(phases.durations) == ["repository", "publish"]
+    header = phases.server_timing(total_ms=12.5)
+    assert header.startswith("repository;dur=")
+    assert header.endswith("total;dur=12.50")
+
+
+def test_request_phase_is_noop_outside_request():
+    phases, token = begin_request_phases()
+    end_request_phases(token)
+
+    with request_phase("repository"):
+        pass
+
+    assert phases.durations == {}
@@ -0,0 +1,67 @@
+"""
+Unit Tests for Per-Organization Admission Control
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests the token bucket and concurrency cap applied per organization.
+"""
+
+import pytest
+
+from app.config import config
+from app.traffic.admission import OrganizationAdmission
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def limits(monkeypatch):
+    monkeypatch.setattr(config, "ADMISSION_RATE_PER_SECOND", 2.0)
+    monkeypatch.setattr(config, "ADMISSION_BURST", 3.0)
+    monkeypatch.setattr(config, "ADMISSION_MAX_CONCURRENT", 10)
+
+
+def test_burst_is_admitted_then_rate_limited_until_tokens_refill(limits):
+    clock = _Clock()
+    admission = OrganizationAdmission(clock)
+
+    assert [admission.try_admit("org-1") for _ in range(3)] == [None, None, None]
+    assert admission.try_admit("org-1") == ("rate_limited", 0.5)
+
+    clock.now += 0.5
+    assert admission.try_admit("org-1") is None
+
+
+def test_organizations_have_separate_buckets(limits):
+    admission = OrganizationAdmission(_Clock())
+    for _ in range(3):
+        admission.try_admit("org-1")
+
+    assert admission.try_admit("org-1")[0] == "rate_limited"
+    assert admission.try_admit("org-2") is None
+
+
+def test_concurrency_cap_applies_until_requests_are_released(limits, monkeypatch):
+    monkeypatch.setattr(config, "ADMISSION_MAX_CONCURRENT", 2)
+    clock = _Clock()
+    admission = OrganizationAdmission(clock)
+
+    assert admission.try_admit("org-1") is None
+    assert admission.try_admit("org-1") is None
+    assert admission.try_admit("org-1") == ("concurrency_limited", 1.0)
+
+    admission.release("org-1")
+    clock.now += 1
+    assert admission.try_admit("org-1") is None
+    assert admission.in_flight("org-1") == 2
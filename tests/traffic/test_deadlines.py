@@ -0,0 +1,104 @@
+"""
+Unit Tests for Request Deadlines
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests latency budgets and the transaction timeouts derived from them.
+"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+import app.db.session as session_module
+import app.traffic.deadlines as deadlines_module
+from app.config import Config, config
+from app.db.session import deadline_sql, get_db_for_org
+from app.traffic.deadlines import budget_ms
+
+
+@pytest.fixture(autouse=True)
+def budgets(monkeypatch):
+    monkeypatch.setattr(Config, "DEADLINE_ROUTES_MS", "/nfc/resolve=2000, /nfc/=15000")
+    monkeypatch.setattr(config, "DEADLINE_DEFAULT_MS", 5000.0)
+
+
+def test_budget_uses_route_setting_or_default():
+    assert budget_ms("/nfc/resolve", None) == 2000
+    assert budget_ms("/nfc/", None) == 15000
+    assert budget_ms("/nfc/{tag_id}", None) == 5000
+
+
+def test_header_can_shorten_but_not_extend_the_budget():
+    assert budget_ms("/nfc/resolve", "500") == 500
+    assert budget_ms("/nfc/resolve", "60000") == 2000
+    assert budget_ms("/nfc/resolve", "0") == 2000
+
+
+def test_invalid_header_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        budget_ms("/nfc/resolve", "soon")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_deadline_sql_sends_time_left_with_capped_lock_timeout(monkeypatch):
+    monkeypatch.setattr(config, "DEADLINE_LOCK_TIMEOUT_MS", 1000.0)
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: 100.0)
+
+    def timeouts(statement_ms, lock_ms):
+        return (
+            f"SELECT set_config('statement_timeout', '{statement_ms}', true), "
+            f"set_config('lock_timeout', '{lock_ms}', true)"
+        )
+
+    assert deadline_sql(102.5) == timeouts(2500, 1000)
+    assert deadline_sql(100.2) == timeouts(200, 200)
+    assert deadline_sql(99.0) == timeouts(1, 1)
+
+
+def test_get_db_for_org_records_the_request_deadline():
+    token = deadlines_module._current_deadline.set(123.0)
+    try:
+        db = get_db_for_org("org-1", "tenant_a")
+    finally:
+        deadlines_module._current_deadline.reset(token)
+
+    try:
+        assert db.info["deadline"] == 123.0
+    finally:
+        db.close()
+
+    db = get_db_for_org("org-1", "tenant_a")
+    try:
+        assert "deadline" not in db.info
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("driver", ["psycopg2", "psycopg"])
+def test_timeouts_are_sent_with_the_first_statement(make_postgres_tenant, driver):
+    tenant = make_postgres_tenant(driver=driver)
+    timeouts = text("SELECT current_setting('statement_timeout'), current_setting('lock_timeout')")
+
+    db = tenant.session(deadline=time.monotonic() + 5)
+    try:
+        assert db.execute(text("SELECT COUNT(*) FROM nfc_tags")).scalar() == 0
+        statement_timeout, lock_timeout = db.execute(timeouts).one()
+    finally:
+        db.close()
+    assert statement_timeout != "0" and lock_timeout != "0"
+
+    db = tenant.session()
+    try:
+        # Transaction-local: the next transaction on the connection has none.
+        assert tuple(db.execute(timeouts).one()) == ("0", "0")
+    finally:
+        db.close()
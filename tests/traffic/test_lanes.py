@@ -0,0 +1,74 @@
+"""
+Unit Tests for Priority Lanes
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests lane slot reservation, borrowing and threadpool sizing.
+"""
+
+import anyio
+import anyio.to_thread
+import pytest
+
+from app.config import config
+from app.traffic.lanes import ADMIN, DEPENDENCY_THREADS, RESOLVE, PriorityLanes, configure_threadpool
+
+
+@pytest.fixture()
+def small_lanes(monkeypatch):
+    monkeypatch.setattr(config, "LANE_RESOLVE_CAPACITY", 1)
+    monkeypatch.setattr(config, "LANE_ADMIN_CAPACITY", 1)
+    return PriorityLanes()
+
+
+def test_resolve_borrows_an_idle_admin_slot_when_its_own_are_busy(small_lanes):
+    async def scenario():
+        first, second = object(), object()
+        assert await small_lanes.acquire(RESOLVE, first) == (RESOLVE, "immediate")
+        assert await small_lanes.acquire(RESOLVE, second) == (ADMIN, "borrowed")
+        small_lanes.release(ADMIN, second)
+        small_lanes.release(RESOLVE, first)
+        assert small_lanes.limiter(ADMIN).borrowed_tokens == 0
+        assert small_lanes.limiter(RESOLVE).borrowed_tokens == 0
+
+    anyio.run(scenario)
+
+
+def test_admin_queues_instead_of_taking_reserved_resolve_slots(small_lanes):
+    async def scenario():
+        holder = object()
+        await small_lanes.acquire(ADMIN, holder)
+        results = []
+
+        async def admin_request():
+            results.append(await small_lanes.acquire(ADMIN, object()))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(admin_request)
+            await anyio.sleep(0.01)
+            assert results == []
+            assert small_lanes.limiter(RESOLVE).borrowed_tokens == 0
+            # A resolve still gets its reserved slot while admin is full.
+            assert await small_lanes.acquire(RESOLVE, object()) == (RESOLVE, "immediate")
+            small_lanes.release(ADMIN, holder)
+
+        assert results == [(ADMIN, "queued")]
+
+    anyio.run(scenario)
+
+
+def test_configure_threadpool_fits_both_lanes(monkeypatch):
+    monkeypatch.setattr(config, "LANES_ENABLED", True)
+    monkeypatch.setattr(config, "LANE_RESOLVE_CAPACITY", 30)
+    monkeypatch.setattr(config, "LANE_ADMIN_CAPACITY", 50)
+
+    async def scenario():
+        configure_threadpool()
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    assert anyio.run(scenario) == 80 + DEPENDENCY_THREADS
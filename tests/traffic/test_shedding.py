@@ -0,0 +1,65 @@
+"""
+Unit Tests for Adaptive Load Shedding
+
+Developers:
+  - Muhammad Faizan
+  - Roozbeh Kouchaki
+  - Fatemehalsadat Sabaghjafari
+  - Dipika Bhandari
+
+Description:
+    Tests shedding pressure, priority order and recovery.
+"""
+
+import logging
+
+import pytest
+
+from app.config import config
+from app.traffic.shedding import CRITICAL, LOW, NORMAL, LoadShedder
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(config, "SHED_POOL_WAIT_MS", 100.0)
+    monkeypatch.setattr(config, "SHED_MAX_IN_FLIGHT", 10)
+
+
+def test_low_priority_is_shed_before_normal_and_critical_never():
+    wait = {"ms": 120.0}
+    shedder = LoadShedder(lambda _window: wait["ms"])
+
+    assert shedder.should_shed(LOW)
+    assert not shedder.should_shed(NORMAL)
+
+    wait["ms"] = 1000.0
+    assert shedder.should_shed(NORMAL)
+    assert not shedder.should_shed(CRITICAL)
+
+
+def test_in_flight_requests_raise_pressure():
+    shedder = LoadShedder(lambda _window: 0.0)
+    for _ in range(10):
+        shedder.enter()
+
+    assert shedder.pressure() == 1.0
+    assert shedder.should_shed(LOW)
+
+    shedder.leave()
+    assert not shedder.should_shed(LOW)
+
+
+def test_shedding_start_and_recovery_are_logged(caplog):
+    wait = {"ms": 500.0}
+    shedder = LoadShedder(lambda _window: wait["ms"])
+
+    with caplog.at_level(logging.INFO, logger="app.traffic.shedding"):
+        shedder.should_shed(LOW)
+        shedder.should_shed(LOW)
+        wait["ms"] = 0.0
+        shedder.should_shed(LOW)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert messages[0].startswith("Shedding low-priority requests")
+    assert messages[1].startswith("Load shedding stopped")